@@ -0,0 +1,68 @@
+"""Benchmark the memory of content-pass blocks, compact vs dicts.
+
+Usage:
+    python benchmarks/bench_blocks.py [EPUB_FILE] [--chapters N]
+
+Runs compact_book_content() (the processor's content pass) on the book and
+measures with tracemalloc the memory its result holds and the container
+memory of its blocks, as ContentBlock objects and as the dicts they replace
+(strings and image lists are shared by both, so they are not counted twice).
+Without EPUB_FILE the synthetic book from bench_workers.py is used.
+"""
+
+import argparse
+import gc
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_workers import build_book  # noqa: E402
+from epub_sage import EpubExtractor  # noqa: E402
+from epub_sage.extractors.blocks import ContentBlock, materialize_blocks  # noqa: E402
+from epub_sage.extractors.content_extractor import compact_book_content  # noqa: E402
+
+
+def held_bytes(build) -> tuple:
+    """Bytes still allocated by build()'s result once it returns, and the result."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return held, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('epub', nargs='?', help='EPUB file to process')
+    parser.add_argument('--chapters', type=int, default=20, help='Synthetic chapters to generate')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        epub = args.epub or str(build_book(Path(tmp) / 'bench.epub', args.chapters))
+        with EpubExtractor(base_dir=tmp).open_archive(epub) as archive:
+            total, content = held_bytes(lambda: compact_book_content(archive.root, archive))
+
+    blocks = [block for sections in content.values()
+              for section in sections for block in section['content']]
+    # Containers only: both copies reference the same strings and image lists
+    compact, _ = held_bytes(lambda: [ContentBlock(*(block[key] for key in (
+        'tag', 'text', 'html', 'images')), 'is_header' in block) for block in blocks])
+    dicts, _ = held_bytes(lambda: materialize_blocks(blocks))
+
+    saved = dicts - compact
+    print(f"blocks:                 {len(blocks)}")
+    print(f"per block, compact:     {compact / len(blocks):8.0f} bytes")
+    print(f"per block, dict:        {dicts / len(blocks):8.0f} bytes")
+    print(f"content pass, compact:  {total / 1024 / 1024:8.2f} MB")
+    print(f"content pass, dicts:    {(total + saved) / 1024 / 1024:8.2f} MB "
+          f"({saved / (total + saved):.0%} saved)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""Benchmark book identity modes: full-file SHA-256 vs ZIP central directory.
+
+Usage:
+    python benchmarks/bench_book_id.py [CORPUS_DIR] [--books N] [--size-mb MB]
+
+With CORPUS_DIR every *.epub below it is measured. Without it a synthetic
+corpus is generated in a temp dir: N books with a large stored image each,
+plus near-duplicates that differ in a single byte of one member.
+"""
+
+import argparse
+import hashlib
+import random
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from epub_sage.services.fingerprint_service import (  # noqa: E402
+    BOOK_ID_LENGTH, hash_central_directory, hash_file
+)
+
+
+def build_corpus(target: Path, books: int, size_mb: float) -> List[Path]:
+    """Write synthetic EPUBs and a one-byte-modified twin of each."""
+    rng = random.Random(42)
+    paths = []
+    for n in range(books):
+        payload = bytearray(rng.randbytes(int(size_mb * 1024 * 1024)))
+        for variant in range(2):
+            if variant:
+                payload[len(payload) // 2] ^= 0xFF
+            path = target / f"book{n:03d}_{variant}.epub"
+            with zipfile.ZipFile(path, 'w') as zf:
+                zf.writestr('mimetype', 'application/epub+zip')
+                zf.writestr('META-INF/container.xml', '<container/>')
+                zf.writestr('OEBPS/content.opf', f'<package><title>Book {n}</title></package>')
+                zf.writestr('OEBPS/images/plate.jpg', bytes(payload))
+            paths.append(path)
+    return paths
+
+
+def measure(paths: List[Path], fn: Callable[[str], str]) -> Tuple[float, int, int]:
+    """Time fn over the corpus and count IDs shared by different files."""
+    ids: Dict[str, List[Path]] = {}
+    start = time.perf_counter()
+    for path in paths:
+        ids.setdefault(fn(str(path))[:BOOK_ID_LENGTH], []).append(path)
+    elapsed = time.perf_counter() - start
+    collisions = sum(len(group) - 1 for group in ids.values() if len(group) > 1)
+    return elapsed, len(ids), collisions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('corpus', nargs='?', help='Directory of EPUB files')
+    parser.add_argument('--books', type=int, default=10, help='Synthetic books to generate')
+    parser.add_argument('--size-mb', type=float, default=20.0, help='Synthetic image size')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.corpus:
+            paths = sorted(Path(args.corpus).rglob('*.epub'))
+        else:
+            paths = build_corpus(Path(tmp), args.books, args.size_mb)
+        if not paths:
+            sys.exit('No EPUB files found')
+
+        total_mb = sum(p.stat().st_size for p in paths) / (1024 * 1024)
+        unique_files = len({hashlib.sha256(p.read_bytes()).digest() for p in paths})
+        print(f"{len(paths)} files, {total_mb:.1f} MB, {unique_files} distinct contents")
+
+        content = measure(paths, hash_file)
+        directory = measure(paths, hash_central_directory)
+        print(f"{'mode':<20}{'seconds':>10}{'ms/book':>10}{'distinct':>10}{'collisions':>12}")
+        for name, (seconds, distinct, collisions) in (
+                ('content', content), ('central-directory', directory)):
+            print(f"{name:<20}{seconds:>10.3f}{seconds * 1000 / len(paths):>10.2f}"
+                  f"{distinct:>10}{collisions:>12}")
+        speedup = content[0] / max(directory[0], 1e-9)
+        print(f"speedup: {speedup:.0f}x")
+
+
+if __name__ == '__main__':
+    main()
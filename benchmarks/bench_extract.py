@@ -0,0 +1,99 @@
+"""Benchmark threaded ZIP extraction against zipfile.extractall.
+
+Usage:
+    python benchmarks/bench_extract.py [EPUB_FILE ...] [--workers 1,2,4] [--books N] [--size-mb N]
+
+Without EPUB_FILEs a corpus of N synthetic image-heavy books (default 4 of
+64 MB each) is generated: DEFLATE-compressed low-entropy images, so
+extraction is dominated by decompression. Workers 1 is extractall; each
+threaded run is checked to write the same files.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_workers import CONTAINER  # noqa: E402
+from epub_sage import EpubExtractor  # noqa: E402
+
+IMAGE_BYTES = 4 * 1024 * 1024
+
+# Keep six bits of each random byte: compresses a little, costs real inflate work
+_LOW_ENTROPY = bytes(range(64)) * 4
+
+
+def build_book(path: Path, size_mb: int) -> Path:
+    """Write an image-heavy EPUB of about size_mb megabytes (uncompressed)."""
+    images = max(1, size_mb * 1024 * 1024 // IMAGE_BYTES)
+    manifest, spine = [], []
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        zf.writestr('mimetype', 'application/epub+zip', compress_type=zipfile.ZIP_STORED)
+        zf.writestr('META-INF/container.xml', CONTAINER)
+        for n in range(images):
+            zf.writestr(f'OEBPS/images/p{n}.png',
+                        os.urandom(IMAGE_BYTES).translate(_LOW_ENTROPY))
+            zf.writestr(f'OEBPS/p{n}.xhtml',
+                        '<?xml version="1.0"?><html xmlns="http://www.w3.org/1999/xhtml"><body>'
+                        f'<img src="images/p{n}.png" alt="Plate {n}"/></body></html>')
+            manifest.append(f'<item id="p{n}" href="p{n}.xhtml" media-type="application/xhtml+xml"/>'
+                            f'<item id="i{n}" href="images/p{n}.png" media-type="image/png"/>')
+            spine.append(f'<itemref idref="p{n}"/>')
+        zf.writestr('OEBPS/content.opf',
+                    '<?xml version="1.0"?><package xmlns="http://www.idpf.org/2007/opf" version="3.0">'
+                    '<metadata xmlns:dc="http://purl.org/dc/elements/1.1/"><dc:title>Plates</dc:title>'
+                    '</metadata>'
+                    f'<manifest>{"".join(manifest)}</manifest><spine>{"".join(spine)}</spine></package>')
+    return path
+
+
+def listing(root: str) -> Dict[str, int]:
+    """Relative path and size of every extracted file."""
+    return {os.path.relpath(os.path.join(dirpath, name), root): os.path.getsize(os.path.join(dirpath, name))
+            for dirpath, _, names in os.walk(root) for name in names}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('epubs', nargs='*', help='EPUB files to extract')
+    parser.add_argument('--workers', default='1,2,4', help='Comma-separated thread counts')
+    parser.add_argument('--books', type=int, default=4, help='Synthetic books to generate')
+    parser.add_argument('--size-mb', type=int, default=64, help='Uncompressed size of each synthetic book')
+    args = parser.parse_args()
+    counts: List[int] = [int(n) for n in args.workers.split(',')]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        epubs = args.epubs or [str(build_book(Path(tmp) / f'book{n}.epub', args.size_mb))
+                               for n in range(args.books)]
+        total = 0
+        for epub in epubs:
+            with zipfile.ZipFile(epub) as zf:
+                total += sum(info.file_size for info in zf.infolist())
+        print(f"{len(epubs)} books, {total / (1024 * 1024):.0f} MB uncompressed, {os.cpu_count()} CPUs")
+
+        extractor = EpubExtractor(base_dir=tmp)
+        baseline = None
+        print(f"{'workers':>8}{'seconds':>10}{'MB/s':>10}{'speedup':>10}{'same':>6}")
+        for workers in counts:
+            out = os.path.join(tmp, 'out')
+            start = time.perf_counter()
+            for n, epub in enumerate(epubs):
+                extractor.extract_epub(epub, os.path.join(out, str(n)), workers=workers)
+            elapsed = time.perf_counter() - start
+            files = listing(out)
+            shutil.rmtree(out)
+            if baseline is None:
+                baseline = (elapsed, files)
+            print(f"{workers:>8}{elapsed:>10.2f}{total / (1024 * 1024) / elapsed:>10.0f}"
+                  f"{baseline[0] / elapsed:>10.2f}{'yes' if files == baseline[1] else 'NO':>6}")
+
+
+if __name__ == '__main__':
+    main()
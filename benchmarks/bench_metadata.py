@@ -0,0 +1,92 @@
+"""Benchmark the metadata-only fast path against extract-then-parse.
+
+Usage:
+    python benchmarks/bench_metadata.py [EPUB_FILE] [--size-mb N] [--runs N]
+
+Times read_metadata() (container.xml and the OPF read from the ZIP) against
+the previous path of DublinCoreService and quick_info: extract the whole
+book, find the OPF, parse it. Without EPUB_FILE a synthetic comic book of
+about N MB (default 1024) is generated: one XHTML page per image,
+incompressible images stored as-is.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_workers import CONTAINER  # noqa: E402
+from epub_sage import DublinCoreParser, EpubExtractor, read_metadata  # noqa: E402
+
+IMAGE_BYTES = 2 * 1024 * 1024
+
+
+def build_comic(path: Path, size_mb: int) -> Path:
+    """Write a synthetic comic EPUB of about size_mb megabytes."""
+    pages = max(1, size_mb * 1024 * 1024 // IMAGE_BYTES)
+    manifest, spine = [], []
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('mimetype', 'application/epub+zip', compress_type=zipfile.ZIP_STORED)
+        zf.writestr('META-INF/container.xml', CONTAINER)
+        for n in range(pages):
+            zf.writestr(f'OEBPS/images/p{n}.jpg', os.urandom(IMAGE_BYTES),
+                        compress_type=zipfile.ZIP_STORED)
+            zf.writestr(f'OEBPS/p{n}.xhtml',
+                        '<?xml version="1.0"?><html xmlns="http://www.w3.org/1999/xhtml"><body>'
+                        f'<img src="images/p{n}.jpg" alt="Page {n}"/></body></html>')
+            manifest.append(f'<item id="p{n}" href="p{n}.xhtml" media-type="application/xhtml+xml"/>'
+                            f'<item id="i{n}" href="images/p{n}.jpg" media-type="image/jpeg"/>')
+            spine.append(f'<itemref idref="p{n}"/>')
+        zf.writestr('OEBPS/content.opf',
+                    '<?xml version="1.0"?><package xmlns="http://www.idpf.org/2007/opf" version="3.0">'
+                    '<metadata xmlns:dc="http://purl.org/dc/elements/1.1/"><dc:title>Comic</dc:title>'
+                    '<dc:creator>Bench</dc:creator></metadata>'
+                    f'<manifest>{"".join(manifest)}</manifest><spine>{"".join(spine)}</spine></package>')
+    return path
+
+
+def extract_then_parse(epub: str, tmp: str):
+    """The previous metadata path: extract everything, then parse the OPF."""
+    extractor = EpubExtractor(base_dir=tmp)
+    extracted = extractor.extract_epub(epub, os.path.join(tmp, 'extracted'))
+    try:
+        return DublinCoreParser().parse_file(extractor.find_content_opf(extracted)).metadata
+    finally:
+        extractor.cleanup_extraction(extracted)
+
+
+def best_of(runs: int, call) -> tuple:
+    """Fastest of several timed calls, and the last result."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = call()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('epub', nargs='?', help='EPUB file to read')
+    parser.add_argument('--size-mb', type=int, default=1024, help='Synthetic book size')
+    parser.add_argument('--runs', type=int, default=3, help='Runs per path (best is shown)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        epub = args.epub or str(build_comic(Path(tmp) / 'comic.epub', args.size_mb))
+        print(f"{Path(epub).name}: {os.path.getsize(epub) / (1024 * 1024):.0f} MB")
+
+        slow, old = best_of(args.runs, lambda: extract_then_parse(epub, tmp))
+        fast, new = best_of(args.runs, lambda: read_metadata(epub))
+        print(f"extract + parse:  {slow * 1000:10.1f} ms")
+        print(f"read_metadata:    {fast * 1000:10.1f} ms  ({slow / fast:.0f}x faster)")
+        print(f"same metadata:    {old == new}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""Benchmark peak memory with and without spilled chapter storage.
+
+Usage:
+    python benchmarks/bench_spill.py [--chapters N [N ...]]
+
+Processes synthetic books of growing length (see bench_workers.py) with
+process_epub(), once keeping chapters in memory and once with
+spill_chapters=True, each in a fresh interpreter. Reports seconds and peak
+RSS (ru_maxrss) of the run, and the size of the spill file.
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_workers import build_book  # noqa: E402
+
+
+def child(epub: str, spill: bool) -> None:
+    """Process one book and print seconds, peak RSS and spilled bytes as JSON."""
+    from epub_sage import SimpleEpubProcessor
+
+    start = time.perf_counter()
+    result = SimpleEpubProcessor(spill_chapters=spill).process_epub(epub)
+    seconds = time.perf_counter() - start
+    if not result.success:
+        sys.exit(f"Processing failed: {result.errors}")
+    spilled = 0
+    for chapter in result.chapters:
+        for value in (chapter.get('content'), chapter.get('sections')):
+            store = getattr(value, '_store', None)
+            if store is not None:
+                spilled = store.bytes_written
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({'seconds': seconds, 'peak_mb': peak_kb / 1024,
+                      'spilled_mb': spilled / (1024 * 1024),
+                      'chapters': len(result.chapters)}))
+
+
+def run(epub: str, spill: bool) -> dict:
+    output = subprocess.run(
+        [sys.executable, __file__, '--child', epub] + (['--spill'] if spill else []),
+        check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--chapters', type=int, nargs='+', default=[10, 40, 160],
+                        help='Synthetic book lengths to generate')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--spill', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.spill)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'chapters':>8}{'mode':>10}{'seconds':>10}{'peak MB':>10}{'spilled MB':>12}")
+        for chapters in args.chapters:
+            epub = str(build_book(Path(tmp) / f'bench{chapters}.epub', chapters))
+            for spill in (False, True):
+                row = run(epub, spill)
+                mode = 'spill' if spill else 'memory'
+                print(f"{chapters:>8}{mode:>10}{row['seconds']:>10.2f}"
+                      f"{row['peak_mb']:>10.1f}{row['spilled_mb']:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
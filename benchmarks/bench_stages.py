@@ -0,0 +1,80 @@
+"""Benchmark the cost of each processing stage.
+
+Usage:
+    python benchmarks/bench_stages.py [EPUB_FILE] [--chapters N] [--repeat N]
+
+Runs process_epub() with a growing stage set, so each row adds one stage
+to the previous one, plus a flat-text row (metadata and content only).
+Reports time, the cost added by the stage and the ZIP members opened.
+Without EPUB_FILE the synthetic book from bench_workers.py is used.
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_workers import build_book  # noqa: E402
+from epub_sage import SimpleEpubProcessor  # noqa: E402
+from epub_sage.extractors.epub_archive import EpubArchive  # noqa: E402
+
+ROWS: List[Tuple[str, Tuple[str, ...]]] = [
+    ('metadata', ('metadata',)),
+    ('+ structure', ('metadata', 'structure')),
+    ('+ content', ('metadata', 'structure', 'content')),
+    ('+ images', ('metadata', 'structure', 'content', 'images')),
+    ('+ sections (all)', ('metadata', 'structure', 'content', 'images', 'sections')),
+    ('flat text', ('metadata', 'content')),
+]
+
+
+def measure(epub: str, stages: Tuple[str, ...], repeat: int, tmp: str) -> Tuple[float, int]:
+    """Best-of-N seconds and member opens for one stage set."""
+    opens = [0]
+    real_open = EpubArchive.open
+
+    def counting(self, path):
+        opens[0] += 1
+        return real_open(self, path)
+
+    processor = SimpleEpubProcessor(temp_dir=tmp, stages=stages)
+    best = float('inf')
+    EpubArchive.open = counting  # type: ignore[method-assign]
+    try:
+        for _ in range(repeat):
+            opens[0] = 0
+            start = time.perf_counter()
+            result = processor.process_epub(epub)
+            best = min(best, time.perf_counter() - start)
+            if not result.success:
+                sys.exit(f"Processing failed: {result.errors}")
+    finally:
+        EpubArchive.open = real_open  # type: ignore[method-assign]
+    return best, opens[0]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('epub', nargs='?', help='EPUB file to process')
+    parser.add_argument('--chapters', type=int, default=12, help='Synthetic chapters to generate')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per stage set (best is kept)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        epub = args.epub or str(build_book(Path(tmp) / 'bench.epub', args.chapters))
+        print(f"{'stages':<20}{'seconds':>10}{'added':>10}{'opens':>8}")
+        previous = 0.0
+        for label, stages in ROWS:
+            seconds, opens = measure(epub, stages, args.repeat, tmp)
+            added = seconds - previous if label.startswith('+') else seconds
+            print(f"{label:<20}{seconds:>10.3f}{added:>10.3f}{opens:>8}")
+            if label != 'flat text':
+                previous = seconds
+
+
+if __name__ == '__main__':
+    main()
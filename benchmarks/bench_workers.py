@@ -0,0 +1,89 @@
+"""Benchmark per-file extraction with different worker counts.
+
+Usage:
+    python benchmarks/bench_workers.py [EPUB_FILE] [--workers 1,2,4] [--chapters N]
+
+Without EPUB_FILE a synthetic book is generated in a temp dir: N chapters
+of a few hundred paragraphs each, with a TOC entry per section. Each run's
+result is compared against the serial one.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from epub_sage import SimpleEpubProcessor  # noqa: E402
+
+CONTAINER = ('<?xml version="1.0"?><container version="1.0" '
+             'xmlns="urn:oasis:names:tc:opendocument:xmlns:container"><rootfiles>'
+             '<rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/>'
+             '</rootfiles></container>')
+
+
+def build_book(path: Path, chapters: int, sections: int = 20, paragraphs: int = 30) -> Path:
+    """Write a synthetic EPUB whose chapters grow in size."""
+    manifest, spine, nav = [], [], []
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('mimetype', 'application/epub+zip')
+        zf.writestr('META-INF/container.xml', CONTAINER)
+        for n in range(chapters):
+            body = [f'<h1 id="c{n}">Chapter {n}</h1>']
+            for s in range(sections * (1 + n % 3)):
+                body.append(f'<h2 id="c{n}s{s}">Section {n}.{s}</h2>')
+                nav.append(f'<navPoint id="n{n}_{s}"><navLabel><text>Section {n}.{s}</text>'
+                           f'</navLabel><content src="ch{n}.xhtml#c{n}s{s}"/></navPoint>')
+                body.extend(f'<p>Paragraph {p} of section {s} with <em>some</em> text.</p>'
+                            for p in range(paragraphs))
+            zf.writestr(f'OEBPS/ch{n}.xhtml',
+                        '<?xml version="1.0"?><html xmlns="http://www.w3.org/1999/xhtml">'
+                        f'<head><title>Chapter {n}</title></head><body>{"".join(body)}</body></html>')
+            manifest.append(f'<item id="ch{n}" href="ch{n}.xhtml" media-type="application/xhtml+xml"/>')
+            spine.append(f'<itemref idref="ch{n}"/>')
+        zf.writestr('OEBPS/toc.ncx', '<?xml version="1.0"?><ncx xmlns="http://www.daisy.org/z3986/2005/ncx/">'
+                    f'<navMap>{"".join(nav)}</navMap></ncx>')
+        zf.writestr('OEBPS/content.opf',
+                    '<?xml version="1.0"?><package xmlns="http://www.idpf.org/2007/opf" version="2.0">'
+                    '<metadata xmlns:dc="http://purl.org/dc/elements/1.1/"><dc:title>Bench</dc:title>'
+                    '</metadata><manifest><item id="ncx" href="toc.ncx" media-type="application/x-dtbncx+xml"/>'
+                    f'{"".join(manifest)}</manifest><spine toc="ncx">{"".join(spine)}</spine></package>')
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('epub', nargs='?', help='EPUB file to process')
+    parser.add_argument('--workers', default='1,2,4', help='Comma-separated worker counts')
+    parser.add_argument('--chapters', type=int, default=24, help='Synthetic chapters to generate')
+    parser.add_argument('--backend', default='bs4', help='Extraction backend')
+    args = parser.parse_args()
+    counts: List[int] = [int(n) for n in args.workers.split(',')]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        epub = Path(args.epub) if args.epub else build_book(Path(tmp) / 'bench.epub', args.chapters)
+        print(f"{epub.name}: {epub.stat().st_size / (1024 * 1024):.1f} MB, {os.cpu_count()} CPUs")
+
+        baseline = None
+        print(f"{'workers':>8}{'seconds':>10}{'speedup':>10}{'same':>6}")
+        for workers in counts:
+            processor = SimpleEpubProcessor(temp_dir=tmp, backend=args.backend, workers=workers)
+            start = time.perf_counter()
+            result = processor.process_epub(str(epub))
+            elapsed = time.perf_counter() - start
+            if not result.success:
+                sys.exit(f"Processing failed: {result.errors}")
+            dump = result.model_dump(exclude={'processing_time'})
+            if baseline is None:
+                baseline = (elapsed, dump)
+            print(f"{workers:>8}{elapsed:>10.2f}{baseline[0] / elapsed:>10.2f}"
+                  f"{'yes' if dump == baseline[1] else 'NO':>6}")
+
+
+if __name__ == '__main__':
+    main()
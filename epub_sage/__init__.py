@@ -21,12 +21,16 @@ from .core import (
     DublinCoreParser,
     EpubStructureParser,
     TocParser,
-    ContentClassifier
+    ContentClassifier,
+    read_content_opf,
+    read_metadata
 )
 
 # Extraction functionality
 from .extractors import (
+    EpubArchive,
     EpubExtractor,
+    ImageExporter,
     quick_extract,
     get_epub_info,
     extract_content_sections,
@@ -37,13 +41,21 @@ from .extractors import (
 from .processors import (
     SimpleEpubProcessor,
     SimpleEpubResult,
-    process_epub  # Main convenience function
+    process_epub,  # Main convenience function
+    process_many,
+    BatchStats,
+    aprocess_epub,
+    aprocess_many,
+    asave_to_json,
+    ResultCache,
+    EpubServer
 )
 
 # Services
 from .services import (
     SearchService,
-    SearchResult
+    SearchResult,
+    FingerprintService
 )
 
 from .services.export_service import save_to_json
@@ -77,6 +89,11 @@ from .utils.statistics import (
     get_text_statistics
 )
 
+from .utils.limits import (
+    ResourceLimits,
+    ResourceLimitExceeded
+)
+
 # Dublin Core Service (extracted to separate module)
 from .dublin_core_service import (
     DublinCoreService,
@@ -97,9 +114,13 @@ __all__ = [
     'EpubStructureParser',
     'TocParser',
     'ContentClassifier',
+    'read_content_opf',
+    'read_metadata',
 
     # Extractors
+    'EpubArchive',
     'EpubExtractor',
+    'ImageExporter',
     'quick_extract',
     'get_epub_info',
     'extract_content_sections',
@@ -108,10 +129,18 @@ __all__ = [
     # Processors
     'SimpleEpubProcessor',
     'SimpleEpubResult',
+    'process_many',
+    'BatchStats',
+    'aprocess_epub',
+    'aprocess_many',
+    'asave_to_json',
+    'ResultCache',
+    'EpubServer',
 
     # Services
     'SearchService',
     'SearchResult',
+    'FingerprintService',
     'save_to_json',
 
     # Models - Dublin Core
@@ -137,6 +166,8 @@ __all__ = [
     'EpubStatistics',
     'calculate_reading_time',
     'get_text_statistics',
+    'ResourceLimits',
+    'ResourceLimitExceeded',
 
     # Legacy compatibility
     'DublinCoreService',
@@ -2,11 +2,11 @@
 
 from typing import Any
 import typer
-from .utils import console
+from .utils import console, cache_state
 from .commands import (
     info, stats, chapters, toc, search,
     metadata, validate, is_calibre,
-    extract, list_contents, images, cover, spine, manifest,
+    extract, list_contents, images, cover, spine, manifest, serve,
 )
 from .commands.metadata import state as metadata_state
 from .commands.export import state as export_state
@@ -40,6 +40,8 @@ def main(
         False, "--quiet", "-q", help="Suppress non-error output"),
     no_color: bool = typer.Option(
         False, "--no-color", help="Disable colored output"),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Do not read or store cached processing results"),
 ) -> None:
     """EpubSage: Professional EPUB content extraction and analysis."""
     state: Any
@@ -48,6 +50,7 @@ def main(
         state.quiet = quiet
     if no_color:
         console.no_color = True
+    cache_state.enabled = not no_cache
 
 
 # Register commands
@@ -65,6 +68,7 @@ app.command()(images)
 app.command()(cover)
 app.command()(spine)
 app.command()(manifest)
+app.command()(serve)
 
 
 def cli_entry() -> None:
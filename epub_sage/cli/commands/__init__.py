@@ -6,6 +6,7 @@ from .metadata import metadata, validate, is_calibre
 from .export import extract, list_contents
 from .images import images
 from .media import cover, spine, manifest
+from .serve import serve
 
 __all__ = [
     'info', 'stats',
@@ -13,4 +14,5 @@ __all__ = [
     'metadata', 'validate', 'is_calibre',
     'extract', 'list_contents',
     'images', 'cover', 'spine', 'manifest',
+    'serve',
 ]
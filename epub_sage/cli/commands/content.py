@@ -6,9 +6,8 @@ from enum import Enum
 
 from ..utils import (
     console, OutputFormatter, ExitCode, handle_error, validate_epub_path,
-    flatten_nav_tree,
+    flatten_nav_tree, process_book,
 )
-from ...processors import process_epub
 from ...services.search_service import SearchService
 from ... import DublinCoreService
 
@@ -31,7 +30,7 @@ def chapters(
     formatter = OutputFormatter(format.value)
 
     try:
-        result = process_epub(str(path))
+        result = process_book(path)
 
         if not result.success:
             handle_error(f"Failed to process EPUB: {', '.join(result.errors)}")
@@ -129,7 +128,7 @@ def search(
     formatter = OutputFormatter(format.value)
 
     try:
-        result = process_epub(str(path))
+        result = process_book(path)
 
         if not result.success:
             handle_error(f"Failed to process EPUB: {', '.join(result.errors)}")
@@ -4,11 +4,12 @@ import typer
 import sys
 import json
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 from enum import Enum
 
 from ..utils import (
     console, OutputFormatter, DateTimeEncoder, handle_error, validate_epub_path,
+    result_cache,
 )
 from ...processors import SimpleEpubProcessor
 from ...services.export_service import save_to_json
@@ -62,17 +63,33 @@ def extract(
         False, "--compact", help="Compact JSON output"),
     include_html: bool = typer.Option(
         False, "--include-html", help="Include raw HTML in content blocks"),
+    jobs: int = typer.Option(
+        1, "-j", "--jobs", min=1, help="Worker processes for per-file extraction"),
+    profile: bool = typer.Option(
+        False, "--profile", help="Add per-stage timings and counters to the JSON"),
+    block_table: bool = typer.Option(
+        False, "--block-table",
+        help="Store content blocks once in a top-level 'blocks' list"),
+    media_types: Optional[List[str]] = typer.Option(
+        None, "--media-type",
+        help="With --raw, extract manifest items of this media type (e.g. 'image/*'); repeatable"),
+    spine: bool = typer.Option(
+        False, "--spine", help="With --raw, extract the spine documents"),
+    include: Optional[List[str]] = typer.Option(
+        None, "--include", help="With --raw, extract members matching this glob; repeatable"),
 ) -> None:
     """Extract book content to JSON or raw files."""
     path = validate_epub_path(path)
 
     try:
         if raw:
-            _extract_raw(path, output)
+            _extract_raw(path, output, media_types, spine, include)
             return
 
         verbose_log(f"Processing: {path}")
-        processor = SimpleEpubProcessor()
+        processor = SimpleEpubProcessor(workers=jobs, profile=profile,
+                                        result_cache=result_cache(),
+                                        block_table=block_table)
 
         if path.is_dir():
             result = processor.process_directory(
@@ -85,6 +102,10 @@ def extract(
             handle_error(f"Processing failed: {', '.join(result.errors)}")
 
         output_data = _build_output_data(result, metadata_only)
+        if result.blocks is not None and not metadata_only:
+            output_data["blocks"] = result.blocks
+        if result.timings is not None:
+            output_data["timings"] = result.timings
         indent = None if compact else 2
 
         if stdout:
@@ -100,12 +121,15 @@ def extract(
         handle_error(str(e))
 
 
-def _extract_raw(path: Path, output: Optional[Path]) -> None:
+def _extract_raw(path: Path, output: Optional[Path], media_types: Optional[List[str]],
+                 spine: bool, include: Optional[List[str]]) -> None:
     extractor = EpubExtractor()
     output_dir = str(output) if output else "./extracted"
     verbose_log(f"Extracting raw files to: {output_dir}")
 
-    extracted_path = extractor.extract_epub(str(path), output_dir)
+    extracted_path = extractor.extract_epub(
+        str(path), output_dir, media_types=media_types or None, spine=spine,
+        patterns=include or None)
     info_print(f"[green]Extracted to:[/green] {extracted_path}")
 
     if state.verbose:
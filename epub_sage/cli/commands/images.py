@@ -5,8 +5,9 @@ from pathlib import Path
 from typing import Optional
 from enum import Enum
 
-from ..utils import console, OutputFormatter, handle_error, validate_epub_path
-from ...processors import process_epub
+from ..utils import (
+    console, OutputFormatter, handle_error, validate_epub_path, process_book,
+)
 from ... import EpubExtractor
 from ...extractors.content_extractor import IMAGE_EXTENSIONS
 
@@ -45,6 +46,10 @@ def images(
         False, "-s", "--by-section", help="Show per-section image distribution"),
     format: Format = typer.Option(
         Format.table, "-f", "--format", help="Output format"),
+    jobs: int = typer.Option(
+        1, "-j", "--jobs", min=1, help="Threads writing extracted images"),
+    keep_duplicates: bool = typer.Option(
+        False, "--keep-duplicates", help="Also extract byte-identical copies of images"),
 ) -> None:
     """List or extract images from EPUB."""
     path = validate_epub_path(path)
@@ -57,7 +62,7 @@ def images(
             f for f in all_files if f.lower().endswith(IMAGE_EXTENSIONS)]
 
         if extract_to:
-            _extract_images(path, extract_to, image_files, extractor)
+            _extract_images(path, extract_to, image_files, extractor, jobs, keep_duplicates)
         elif list_files:
             _list_image_files(image_files, format, formatter)
         elif by_section:
@@ -69,27 +74,22 @@ def images(
         handle_error(str(e))
 
 
-def _extract_images(path: Path, extract_to: Path, image_files: list, extractor) -> None:
-    extract_to.mkdir(parents=True, exist_ok=True)
-    extracted_count = 0
-
-    for img_path in image_files:
-        img_name = Path(img_path).name
-        output_path = extract_to / img_name
-
-        counter = 1
-        while output_path.exists():
-            stem = Path(img_name).stem
-            suffix = Path(img_name).suffix
-            output_path = extract_to / f"{stem}_{counter}{suffix}"
-            counter += 1
-
-        if extractor.extract_single_file(str(path), img_path, str(output_path)):
-            extracted_count += 1
-            verbose_log(f"Extracted: {img_name}")
+def _extract_images(path: Path, extract_to: Path, image_files: list, extractor,
+                    jobs: int, keep_duplicates: bool) -> None:
+    report = extractor.export_files(str(path), image_files, str(extract_to),
+                                    workers=jobs, dedupe=not keep_duplicates)
+    for output_path in report.exported.values():
+        verbose_log(f"Extracted: {Path(output_path).name}")
+    for img_path, output_path in report.duplicates.items():
+        verbose_log(f"Duplicate: {img_path} (same as {Path(output_path).name})")
 
     info_print(
-        f"[green]Extracted {extracted_count} images to:[/green] {extract_to}")
+        f"[green]Extracted {len(report.exported)} images to:[/green] {extract_to}")
+    info_print(
+        f"[dim]{report.bytes_written / (1024 * 1024):.1f} MB in {report.seconds:.2f}s "
+        f"({report.bytes_per_second / (1024 * 1024):.1f} MB/s)"
+        + (f", {len(report.duplicates)} duplicates skipped" if report.duplicates else "")
+        + "[/dim]")
 
 
 def _list_image_files(image_files: list, format: Format, formatter) -> None:
@@ -106,7 +106,7 @@ def _list_image_files(image_files: list, format: Format, formatter) -> None:
 
 
 def _show_images_by_section(path: Path) -> None:
-    result = process_epub(str(path))
+    result = process_book(path)
     if not result.success:
         handle_error(f"Failed to process EPUB: {', '.join(result.errors)}")
 
@@ -6,9 +6,8 @@ from enum import Enum
 
 from ..utils import (
     console, OutputFormatter, handle_error, validate_epub_path,
-    format_reading_time, count_sections,
+    format_reading_time, count_sections, process_book,
 )
-from ...processors import process_epub
 
 
 class Format(str, Enum):
@@ -27,7 +26,7 @@ def info(
     formatter = OutputFormatter(format.value)
 
     try:
-        result = process_epub(str(path))
+        result = process_book(path)
 
         if not result.success:
             handle_error(f"Failed to process EPUB: {', '.join(result.errors)}")
@@ -85,7 +84,7 @@ def stats(
     formatter = OutputFormatter(format.value)
 
     try:
-        result = process_epub(str(path))
+        result = process_book(path)
 
         if not result.success:
             handle_error(f"Failed to process EPUB: {', '.join(result.errors)}")
@@ -1,6 +1,7 @@
 """Media commands: cover, spine, manifest."""
 
 import typer
+import zipfile
 from pathlib import Path
 from typing import Optional
 from enum import Enum
@@ -8,6 +9,7 @@ from enum import Enum
 from ..utils import console, OutputFormatter, handle_error, validate_epub_path
 from ... import DublinCoreService, EpubExtractor
 from ...extractors.content_extractor import IMAGE_EXTENSIONS
+from ...extractors.image_export import ImageExporter
 
 
 class Format(str, Enum):
@@ -58,10 +60,12 @@ def cover(
         ext = Path(cover_file).suffix
         output_path = output or Path(f"cover{ext}")
 
-        if extractor.extract_single_file(str(path), cover_file, str(output_path)):
-            info_print(f"[green]Cover saved to:[/green] {output_path}")
-        else:
+        try:
+            with ImageExporter(str(path)) as exporter:
+                exporter.export(cover_file, str(output_path))
+        except (OSError, KeyError, zipfile.BadZipFile):
             handle_error("Failed to extract cover image")
+        info_print(f"[green]Cover saved to:[/green] {output_path}")
 
     except Exception as e:
         handle_error(str(e))
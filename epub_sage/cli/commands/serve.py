@@ -0,0 +1,44 @@
+"""Serve command: warm processing daemon."""
+
+import signal
+import typer
+from pathlib import Path
+from typing import Optional
+
+from ..utils import console, handle_error, result_cache
+from ...processors.server import DEFAULT_PORT, EpubServer
+
+
+def serve(
+    host: str = typer.Option(
+        "127.0.0.1", "--host", help="Loopback address to listen on"),
+    port: int = typer.Option(
+        DEFAULT_PORT, "-p", "--port", help="Port to listen on (0 picks a free port)"),
+    socket: Optional[Path] = typer.Option(
+        None, "--socket", help="Listen on this Unix socket instead of HTTP"),
+    jobs: Optional[int] = typer.Option(
+        None, "-j", "--jobs", min=1, help="Worker processes (default: CPU count)"),
+) -> None:
+    """Run a daemon that answers process, info, toc and search jobs."""
+    try:
+        server = EpubServer(host=host, port=port,
+                            socket_path=str(socket) if socket else None,
+                            workers=jobs, result_cache=result_cache())
+        server.start()
+    except Exception as e:
+        handle_error(str(e))
+
+    console.print(f"[green]Serving on[/green] {server.address} "
+                  f"({server.workers} workers, Ctrl+C to stop)")
+    signal.signal(signal.SIGTERM, _stop)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+
+
+def _stop(signum, frame) -> None:
+    # Let SIGTERM shut the server down like Ctrl+C
+    raise KeyboardInterrupt
@@ -4,6 +4,7 @@ from enum import IntEnum
 from pathlib import Path
 from typing import Any, Dict, List, NoReturn, Optional
 import json
+from collections.abc import Sequence
 from datetime import datetime
 
 from rich.console import Console
@@ -12,6 +13,9 @@ from rich.panel import Panel
 from rich.tree import Tree
 from rich.syntax import Syntax
 
+from ..processors import SimpleEpubProcessor, SimpleEpubResult
+from ..processors.result_cache import ResultCache, get_result_cache
+
 console = Console()
 err_console = Console(stderr=True)
 
@@ -31,6 +35,9 @@ class DateTimeEncoder(json.JSONEncoder):
     def default(self, obj: Any) -> Any:
         if isinstance(obj, datetime):
             return obj.isoformat()
+        if isinstance(obj, Sequence) and not isinstance(obj, (str, bytes)):
+            # Lazily loaded lists, such as spilled chapter bodies
+            return list(obj)
         return super().default(obj)
 
 
@@ -137,6 +144,23 @@ def handle_error(msg: str, code: ExitCode = ExitCode.ERROR) -> NoReturn:
     raise SystemExit(code)
 
 
+class CacheState:
+    enabled: bool = True
+
+
+cache_state = CacheState()
+
+
+def result_cache() -> Optional[ResultCache]:
+    """Persistent result cache shared by commands, unless --no-cache was given."""
+    return get_result_cache() if cache_state.enabled else None
+
+
+def process_book(path: Path) -> SimpleEpubResult:
+    """Process an EPUB, reusing a cached result when the book was seen before."""
+    return SimpleEpubProcessor(result_cache=result_cache()).process_epub(str(path))
+
+
 def validate_epub_path(path: Path) -> Path:
     if not path.exists():
         handle_error(f"File not found: {path}", ExitCode.FILE_NOT_FOUND)
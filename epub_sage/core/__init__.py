@@ -5,10 +5,13 @@ from .dublin_core_parser import DublinCoreParser
 from .structure_parser import EpubStructureParser
 from .toc_parser import TocParser
 from .content_classifier import ContentClassifier
+from .metadata_reader import read_content_opf, read_metadata
 
 __all__ = [
     'DublinCoreParser',
     'EpubStructureParser',
     'TocParser',
-    'ContentClassifier'
+    'ContentClassifier',
+    'read_content_opf',
+    'read_metadata'
 ]
@@ -1,10 +1,12 @@
 """Dublin Core metadata parser for EPUB content.opf files."""
 
 import logging
-from pathlib import Path
 from typing import Optional, List, Dict
 from xml.etree import ElementTree as ET
 
+from ..extractors.epub_archive import (
+    EpubArchive, path_exists, open_file, read_file_text,
+)
 from ..models.dublin_core import (
     DublinCoreMetadata,
     ParsedContentOpf
@@ -35,20 +37,23 @@ class DublinCoreParser:
         self.namespaces = {}
         self.parsing_errors = []
 
-    def parse_file(self, file_path: str) -> ParsedContentOpf:
-        """Parse Dublin Core metadata from a content.opf file."""
-        path = Path(file_path)
-        if not path.exists():
+    def parse_file(self, file_path: str,
+                   archive: Optional[EpubArchive] = None) -> ParsedContentOpf:
+        """Parse Dublin Core metadata from a content.opf file.
+
+        When an archive is given, the path is resolved inside it instead of on disk.
+        """
+        if not path_exists(file_path, archive):
             raise FileNotFoundError(f"Content.opf file not found: {file_path}")
 
         try:
-            tree = ET.parse(file_path)
+            with open_file(file_path, archive) as f:
+                tree = ET.parse(f)
             root = tree.getroot()
             return self.parse_xml(root, file_path)
         except ET.ParseError as e:
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                content = read_file_text(file_path, archive)
 
                 if not content.strip().startswith('<?xml'):
                     content = '<?xml version="1.0" encoding="utf-8"?>\n' + content
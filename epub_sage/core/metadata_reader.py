@@ -0,0 +1,33 @@
+"""Metadata-only fast path.
+
+Reads the OPF of an EPUB straight from the ZIP: the rootfile named by
+``META-INF/container.xml`` is the only other member read, nothing is
+extracted or written to disk, and the cost does not grow with the size of
+the book's content (images, fonts, chapters).
+"""
+
+from typing import Optional
+
+from ..extractors.container import find_rootfile
+from ..extractors.epub_archive import ArchiveSource, EpubArchive
+from ..models.dublin_core import DublinCoreMetadata, ParsedContentOpf
+from .dublin_core_parser import DublinCoreParser
+
+
+def read_content_opf(source: ArchiveSource,
+                     parser: Optional[DublinCoreParser] = None) -> ParsedContentOpf:
+    """Parse the OPF of an EPUB (path, bytes, file object or ZipFile) in place.
+
+    ``file_path`` of the result is the OPF's virtual path under the book.
+    """
+    parser = parser or DublinCoreParser()
+    with EpubArchive(source) as archive:
+        opf_path = find_rootfile(archive)
+        if opf_path is None:
+            raise FileNotFoundError(f"No content.opf found in {archive.path or 'EPUB'}")
+        return parser.parse_file(opf_path, archive)
+
+
+def read_metadata(source: ArchiveSource) -> DublinCoreMetadata:
+    """Dublin Core metadata of an EPUB, read without extracting it."""
+    return read_content_opf(source).metadata
@@ -10,15 +10,17 @@ logger = logging.getLogger(__name__)
 
 
 def associate_images_with_content(structure: EpubStructure, epub_dir: Optional[str],
-                                  classifier, find_item_by_href):
+                                  classifier, find_item_by_href, archive=None,
+                                  content_data=None):
     """Associate images with chapters based on content discovery and patterns."""
     logger.debug(f"Associating {len(structure.images)} images with content")
 
     discovery_map = {}
     if epub_dir:
         try:
-            from ..extractors.content_extractor import extract_book_content
-            content_data = extract_book_content(epub_dir)
+            from ..extractors.content_extractor import compact_book_content
+            if content_data is None:
+                content_data = compact_book_content(epub_dir, archive)
             for file_href, sections in content_data.items():
                 for section in sections:
                     for img_href in section.get('images', []):
@@ -3,9 +3,13 @@
 import logging
 import os
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
+from ..extractors.document_cache import DocumentCache
+from ..extractors.epub_archive import EpubArchive, path_exists
+from ..extractors.parallel import ExtractionPool
 from ..models.dublin_core import ParsedContentOpf
+from ..utils.profiling import operation
 from ..models.structure import EpubStructure, NavigationPoint
 from ..extractors.toc_content_extractor import extract_book_by_toc, ExtractedSection
 
@@ -30,21 +34,32 @@ class EpubStructureParser:
         self.parsing_errors = []
         self._opf_result = None
         self._epub_dir = None
+        self._archive: Optional[EpubArchive] = None
 
     def parse_complete_structure(self, opf_result: ParsedContentOpf,
-                                 epub_dir: Optional[str] = None) -> EpubStructure:
+                                 epub_dir: Optional[str] = None,
+                                 archive: Optional[EpubArchive] = None,
+                                 content_data: Optional[Dict[str, Any]] = None) -> EpubStructure:
         """Parse complete EPUB structure from content.opf result."""
-        return self.parse_structure(opf_result, epub_dir)
+        return self.parse_structure(opf_result, epub_dir, archive, content_data)
 
     def parse_structure(self, opf_result: ParsedContentOpf,
-                        epub_dir: Optional[str] = None) -> EpubStructure:
-        """Parse EPUB structure."""
+                        epub_dir: Optional[str] = None,
+                        archive: Optional[EpubArchive] = None,
+                        content_data: Optional[Dict[str, Any]] = None) -> EpubStructure:
+        """Parse EPUB structure.
+
+        When an archive is given, epub_dir is its virtual root and all files
+        are read from the archive instead of disk. Passing the output of
+        extract_book_content() as content_data avoids extracting it again.
+        """
         logger.info("Starting EPUB structure analysis")
         self.parsing_errors = []
         structure = EpubStructure()
 
         self._opf_result = opf_result
         self._epub_dir = epub_dir
+        self._archive = archive
 
         classify_manifest_items(opf_result, structure,
                                 self.classifier, epub_dir)
@@ -54,7 +69,7 @@ class EpubStructureParser:
 
         associate_images_with_content(
             structure, epub_dir, self.classifier,
-            lambda s, h: find_item_by_href(s, h)
+            lambda s, h: find_item_by_href(s, h), archive, content_data
         )
         build_reading_order(opf_result, structure)
         generate_organization_summary(structure, self.toc_parser)
@@ -75,7 +90,9 @@ class EpubStructureParser:
         logger.debug(f"Parsing TOC file: {toc_file}")
 
         try:
-            nav_points = self.toc_parser.parse_toc_file(str(toc_file))
+            with operation('toc_parse'):
+                nav_points = self.toc_parser.parse_toc_file(
+                    str(toc_file), self._archive)
             self._normalize_navigation_points(
                 nav_points, str(toc_file), epub_dir)
 
@@ -97,7 +114,7 @@ class EpubStructureParser:
                     href = item.get('href', '')
                     if href:
                         candidate = epub_path / href
-                        if candidate.exists():
+                        if path_exists(str(candidate), self._archive):
                             return candidate
 
         candidates = [
@@ -107,7 +124,7 @@ class EpubStructureParser:
             epub_path / "OEBPS" / "toc.xhtml",
         ]
         for candidate in candidates:
-            if candidate.exists():
+            if path_exists(str(candidate), self._archive):
                 return candidate
         return None
 
@@ -163,7 +180,11 @@ class EpubStructureParser:
         associate_chapters_with_parts(structure)
 
     def extract_content_by_toc(self, epub_dir: str, structure: EpubStructure,
-                               include_html: bool = False) -> Dict[str, List[ExtractedSection]]:
+                               include_html: bool = False,
+                               archive: Optional[EpubArchive] = None,
+                               documents: Optional[DocumentCache] = None,
+                               pool: Optional[ExtractionPool] = None
+                               ) -> Dict[str, List[ExtractedSection]]:
         """Extract content using TOC-defined boundaries."""
         if not structure.navigation_tree:
             logger.warning(
@@ -174,7 +195,8 @@ class EpubStructureParser:
             structure.navigation_tree)
         logger.info(f"Extracting content for {len(nav_points)} TOC entries")
 
-        extracted = extract_book_by_toc(epub_dir, nav_points, include_html)
+        extracted = extract_book_by_toc(
+            epub_dir, nav_points, include_html, archive, documents, pool)
         total_sections = sum(len(sections) for sections in extracted.values())
         logger.info(
             f"Extracted {total_sections} sections from {len(extracted)} files")
@@ -1,10 +1,10 @@
 """Table of Contents parser for EPUB navigation structure."""
 
 import logging
-from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from xml.etree import ElementTree as ET
 
+from ..extractors.epub_archive import EpubArchive, path_exists, open_file
 from ..models.structure import NavigationPoint
 from .content_classifier import ContentClassifier
 from .ncx_parser import parse_ncx
@@ -23,17 +23,20 @@ class TocParser:
         self.classifier = ContentClassifier()
         self.parsing_errors = []
 
-    def parse_toc_file(self, file_path: str) -> List[NavigationPoint]:
+    def parse_toc_file(self, file_path: str,
+                       archive: Optional[EpubArchive] = None) -> List[NavigationPoint]:
         """Parse TOC file and return navigation structure.
 
-        Auto-detects file type (NCX or nav document).
+        Auto-detects file type (NCX or nav document). When an archive is
+        given, the path is resolved inside it instead of on disk.
         """
-        if not Path(file_path).exists():
+        if not path_exists(file_path, archive):
             logger.warning(f"TOC file not found: {file_path}")
             return []
 
         try:
-            tree = ET.parse(file_path)
+            with open_file(file_path, archive) as f:
+                tree = ET.parse(f)
             root = tree.getroot()
 
             if root.tag.endswith('}ncx') or root.tag == 'ncx':
@@ -1,8 +1,19 @@
 """
 Extraction modules for EPUB content and media.
 """
+from .epub_archive import EpubArchive
+from .container import find_rootfile, find_rootfiles, parse_container
+from .document_cache import DocumentCache
+from .backends import ExtractionBackend, Bs4Backend, LxmlBackend, get_backend
 from .epub_extractor import EpubExtractor, quick_extract, get_epub_info
+from .image_export import ExportReport, ImageExporter
 from .content_extractor import extract_content_sections, extract_book_content
+from .parallel import ExtractionPool
+from .streaming_extractor import (
+    stream_content_sections,
+    stream_section_between_anchors,
+    stream_sections_by_anchors,
+)
 from .toc_content_extractor import (
     SectionBoundary,
     ExtractedSection,
@@ -13,11 +24,27 @@ from .toc_content_extractor import (
 )
 
 __all__ = [
+    'EpubArchive',
+    'find_rootfile',
+    'find_rootfiles',
+    'parse_container',
+    'DocumentCache',
+    'ExtractionBackend',
+    'Bs4Backend',
+    'LxmlBackend',
+    'get_backend',
     'EpubExtractor',
     'quick_extract',
     'get_epub_info',
+    'ExportReport',
+    'ImageExporter',
     'extract_content_sections',
     'extract_book_content',
+    'ExtractionPool',
+    # Streaming extraction for very large documents
+    'stream_content_sections',
+    'stream_section_between_anchors',
+    'stream_sections_by_anchors',
     # TOC-based extraction
     'SectionBoundary',
     'ExtractedSection',
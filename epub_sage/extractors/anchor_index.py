@@ -0,0 +1,73 @@
+"""Per-document anchor index for TOC boundary lookups.
+
+TOC extraction looks elements up by ``id`` (falling back to ``name``) and
+asks whether an element contains a given anchor, once per boundary and once
+per sibling. Answering these with subtree searches is quadratic in the
+number of anchors per file. An AnchorIndex answers them in constant time
+after one pass over the document.
+
+The index is tree-agnostic: ``build_anchor_index`` in section_builder (bs4)
+and lxml_extractors (lxml.etree) fill it from their own element types.
+"""
+
+from typing import AbstractSet, Any, Dict, FrozenSet, Iterable, Optional, Set
+
+
+class AnchorIndex:
+    """id/name → element lookup plus "contains anchor" flags per node.
+
+    Containment is recorded only for the ``anchors`` given at construction
+    (every id when None); ask only about those.
+    """
+
+    def __init__(self, anchors: Optional[Set[str]] = None):
+        self.anchors = anchors
+        self._by_id: Dict[str, Any] = {}
+        self._by_name: Dict[str, Any] = {}
+        # anchor -> {id(ancestor): ancestor} for every element with that id;
+        # holding the ancestors keeps their ids stable
+        self._containers: Dict[str, Dict[int, Any]] = {}
+        self._any_cache: Dict[FrozenSet[str], Set[int]] = {}
+
+    def add(self, element: Any, element_id: Optional[str], name: Optional[str],
+            ancestors: Iterable[Any]) -> None:
+        """Record an element (in document order) with its id, name and ancestors."""
+        if name and name not in self._by_name:
+            self._by_name[name] = element
+        if not element_id:
+            return
+        if element_id not in self._by_id:
+            self._by_id[element_id] = element
+        if self.anchors is None or element_id in self.anchors:
+            containers = self._containers.setdefault(element_id, {})
+            for ancestor in ancestors:
+                containers[id(ancestor)] = ancestor
+
+    def by_id(self, anchor: str) -> Optional[Any]:
+        """First element with the given id."""
+        return self._by_id.get(anchor)
+
+    def find(self, anchor: str) -> Optional[Any]:
+        """First element with the given id, else the first with that name."""
+        element = self._by_id.get(anchor)
+        if element is not None:
+            return element
+        return self._by_name.get(anchor)
+
+    def contains(self, element: Any, anchor: str) -> bool:
+        """Whether a descendant of element has the given id."""
+        return id(element) in self._containers.get(anchor, ())
+
+    def contains_any(self, element: Any, anchors: AbstractSet[str]) -> bool:
+        """Whether a descendant of element has any of the given ids.
+
+        Pass a frozenset when calling in a loop; its hash is computed once.
+        """
+        key = anchors if isinstance(anchors, frozenset) else frozenset(anchors)
+        containing = self._any_cache.get(key)
+        if containing is None:
+            containing = set()
+            for anchor in key:
+                containing.update(self._containers.get(anchor, ()))
+            self._any_cache[key] = containing
+        return id(element) in containing
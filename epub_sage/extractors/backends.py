@@ -0,0 +1,124 @@
+"""Pluggable extraction backends.
+
+A backend parses XHTML documents and turns them into the section and block
+dicts used by the processors. ``bs4`` (BeautifulSoup over lxml-xml) is the
+reference implementation; ``lxml`` works on plain lxml.etree elements and
+produces the same dicts with less time and memory.
+"""
+
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+from . import lxml_extractors
+from .anchor_index import AnchorIndex
+from .content_extractor import sections_from_soup
+from .document_cache import TREE_OVERHEAD_FACTOR
+from .epub_archive import EpubArchive
+from .html_parser import parse_html_file
+from .section_builder import (
+    build_anchor_index, collect_anchor_terms, extract_section_between_anchors,
+)
+
+AnchorTerms = Tuple[List[Dict[str, str]], List[Dict[str, str]]]
+
+
+class ExtractionBackend:
+    """Interface shared by all extraction backends."""
+
+    name = ''
+    # Rough in-memory size of a parsed tree relative to its source markup
+    tree_overhead = TREE_OVERHEAD_FACTOR
+
+    def parse_file(self, path: str, archive: Optional[EpubArchive] = None) -> Any:
+        """Parse a document, returning None if it is missing or unreadable."""
+        raise NotImplementedError
+
+    def content_sections(self, document: Any) -> List[Dict[str, Any]]:
+        """Header-grouped sections (ContentBlock blocks); the document is left unmodified."""
+        raise NotImplementedError
+
+    def anchor_index(self, document: Any, anchors: Optional[Set[str]] = None) -> AnchorIndex:
+        """One-pass id/name index of a document, tracking containment of anchors."""
+        raise NotImplementedError
+
+    def section_blocks(self, document: Any, start_anchor: Optional[str],
+                       end_anchor: Optional[str], all_anchors: Optional[Set[str]] = None,
+                       include_html: bool = False,
+                       index: Optional[AnchorIndex] = None) -> List[Dict]:
+        """Content blocks between two TOC anchors."""
+        raise NotImplementedError
+
+    def anchor_terms(self, document: Any, anchor: str,
+                     index: Optional[AnchorIndex] = None) -> AnchorTerms:
+        """Index terms and cross-references under an anchor element."""
+        raise NotImplementedError
+
+
+class Bs4Backend(ExtractionBackend):
+    """BeautifulSoup backend (default)."""
+
+    name = 'bs4'
+
+    def parse_file(self, path: str, archive: Optional[EpubArchive] = None) -> Any:
+        return parse_html_file(path, archive)
+
+    def content_sections(self, document: Any) -> List[Dict[str, Any]]:
+        return sections_from_soup(document, restore=True)
+
+    def anchor_index(self, document: Any, anchors: Optional[Set[str]] = None) -> AnchorIndex:
+        return build_anchor_index(document, anchors)
+
+    def section_blocks(self, document: Any, start_anchor: Optional[str],
+                       end_anchor: Optional[str], all_anchors: Optional[Set[str]] = None,
+                       include_html: bool = False,
+                       index: Optional[AnchorIndex] = None) -> List[Dict]:
+        return extract_section_between_anchors(
+            document, start_anchor, end_anchor, all_anchors, include_html, index)
+
+    def anchor_terms(self, document: Any, anchor: str,
+                     index: Optional[AnchorIndex] = None) -> AnchorTerms:
+        return collect_anchor_terms(document, anchor, index)
+
+
+class LxmlBackend(ExtractionBackend):
+    """Native lxml.etree backend."""
+
+    name = 'lxml'
+    tree_overhead = 4
+
+    def parse_file(self, path: str, archive: Optional[EpubArchive] = None) -> Any:
+        return lxml_extractors.parse_html_file(path, archive)
+
+    def content_sections(self, document: Any) -> List[Dict[str, Any]]:
+        return lxml_extractors.compact_content_sections(document)
+
+    def anchor_index(self, document: Any, anchors: Optional[Set[str]] = None) -> AnchorIndex:
+        return lxml_extractors.build_anchor_index(document, anchors)
+
+    def section_blocks(self, document: Any, start_anchor: Optional[str],
+                       end_anchor: Optional[str], all_anchors: Optional[Set[str]] = None,
+                       include_html: bool = False,
+                       index: Optional[AnchorIndex] = None) -> List[Dict]:
+        return lxml_extractors.extract_section_between_anchors(
+            document, start_anchor, end_anchor, all_anchors, include_html, index)
+
+    def anchor_terms(self, document: Any, anchor: str,
+                     index: Optional[AnchorIndex] = None) -> AnchorTerms:
+        return lxml_extractors.collect_anchor_terms(document, anchor, index)
+
+
+BACKENDS: Dict[str, ExtractionBackend] = {
+    'bs4': Bs4Backend(),
+    'lxml': LxmlBackend(),
+}
+
+DEFAULT_BACKEND = 'bs4'
+
+
+def get_backend(backend: Union[str, ExtractionBackend, None] = None) -> ExtractionBackend:
+    """Resolve a backend name (or instance) to a backend instance."""
+    if isinstance(backend, ExtractionBackend):
+        return backend
+    name = backend or DEFAULT_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown extraction backend: {name} (expected one of {', '.join(BACKENDS)})")
+    return BACKENDS[name]
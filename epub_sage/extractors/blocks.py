@@ -0,0 +1,85 @@
+"""Compact content-pass blocks.
+
+The content pass (``extract_content_sections``) yields one block per content
+child of a document, and a whole book of them is held until chapters are
+built. ContentBlock stores a block in fixed slots instead of a dict with
+repeated keys, so it takes about a third of the memory. It reads like the
+dict it replaces (``block['text']``, ``block.get('images', [])``,
+``dict(block)``) and compares equal to it. The processor uses the
+``compact_*`` content functions and turns blocks into plain dicts only when
+it finalizes chapters (``materialize_blocks``); the public content functions
+return plain dicts.
+"""
+
+import sys
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional
+
+_FIELDS = ('tag', 'text', 'html', 'images')
+
+
+class ContentBlock(Mapping):
+    """One content-pass block: ``tag``, ``text``, ``html``, ``images`` and ``is_header``.
+
+    ``is_header`` is only a key when true, as in the dicts it replaces.
+    ``images`` may be shared with the enclosing section, as before.
+    """
+
+    __slots__ = ('tag', 'text', 'html', 'images', 'is_header')
+
+    def __init__(self, tag: Optional[str], text: str, html: str, images: List[str],
+                 is_header: bool = False):
+        # Tag names repeat for every block; share one string per name
+        self.tag = sys.intern(tag) if tag else tag
+        self.text = text
+        self.html = html
+        self.images = images
+        self.is_header = is_header
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _FIELDS:
+            return getattr(self, key)
+        if key == 'is_header' and self.is_header:
+            return True
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in _FIELDS and key != 'is_header':
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from _FIELDS
+        if self.is_header:
+            yield 'is_header'
+
+    def __len__(self) -> int:
+        return len(_FIELDS) + (1 if self.is_header else 0)
+
+    def __getstate__(self) -> tuple:
+        return self.tag, self.text, self.html, self.images, self.is_header
+
+    def __setstate__(self, state: tuple) -> None:
+        self.tag, self.text, self.html, self.images, self.is_header = state
+
+    def __repr__(self) -> str:
+        return f"ContentBlock({self.to_dict()!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The block as the plain dict the public result uses."""
+        block: Dict[str, Any] = {
+            'tag': self.tag, 'text': self.text, 'html': self.html, 'images': self.images}
+        if self.is_header:
+            block['is_header'] = True
+        return block
+
+
+def materialize_blocks(blocks: List[Any]) -> List[Any]:
+    """Plain dicts for a list of blocks (other items are kept as they are)."""
+    return [block.to_dict() if isinstance(block, ContentBlock) else block for block in blocks]
+
+
+def materialize_section(section: Dict[str, Any]) -> Dict[str, Any]:
+    """A content section with its blocks as plain dicts, converted in place."""
+    section['content'] = materialize_blocks(section.get('content', []))
+    return section
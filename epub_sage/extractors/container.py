@@ -0,0 +1,153 @@
+"""META-INF/container.xml parsing.
+
+The OCF container file names the package documents (OPF rootfiles) of an
+EPUB, so the OPF is found with one lookup in the ZIP index instead of by
+probing paths or walking the tree. A book may list several renditions; they
+are kept in container order and the first is the default rendition.
+
+Resolved rootfiles are remembered per book file (keyed by path, size and
+mtime), so the info, validation and processing passes over the same book
+read container.xml once.
+"""
+
+import os
+import threading
+import zipfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional, Tuple
+from xml.etree import ElementTree as ET
+
+if TYPE_CHECKING:
+    from .epub_archive import EpubArchive
+
+CONTAINER_PATH = 'META-INF/container.xml'
+OPF_MEDIA_TYPE = 'application/oebps-package+xml'
+
+# Books whose resolved rootfiles are remembered
+CACHE_SIZE = 256
+
+_BookKey = Tuple[str, int, int]
+_cache: 'OrderedDict[_BookKey, Tuple[str, ...]]' = OrderedDict()
+_lock = threading.Lock()
+
+
+def parse_container(data: bytes) -> List[str]:
+    """Rootfile paths of OPF package documents listed in container.xml, in order."""
+    try:
+        root = ET.fromstring(data)
+    except ET.ParseError:
+        return []
+    paths = []
+    for element in root.iter():
+        if element.tag.rsplit('}', 1)[-1] != 'rootfile':
+            continue
+        path = (element.get('full-path') or '').strip().lstrip('/')
+        media_type = element.get('media-type')
+        if path and (media_type is None or media_type == OPF_MEDIA_TYPE) and path not in paths:
+            paths.append(path)
+    return paths
+
+
+def zip_rootfiles(zip_file: zipfile.ZipFile, path: Optional[str] = None) -> Tuple[str, ...]:
+    """Member names of a book's OPF rootfiles, default rendition first.
+
+    Rootfiles come from container.xml and are checked against the ZIP index;
+    books without a usable container.xml fall back to the ``.opf`` members in
+    archive order. ``path``, the book file, enables the per-book cache.
+    """
+    key = _book_key(path) if path else None
+    cached = _cached(key)
+    if cached is not None:
+        return cached
+    rootfiles = _read_rootfiles(zip_file)
+    _remember(key, rootfiles)
+    return rootfiles
+
+
+def find_rootfiles(archive: 'EpubArchive') -> List[str]:
+    """Virtual paths of the book's OPF rootfiles, default rendition first."""
+    return [archive.full_path(member) for member in archive.rootfiles()]
+
+
+def find_rootfile(archive: 'EpubArchive') -> Optional[str]:
+    """Virtual path of the book's default OPF, or None."""
+    rootfiles = archive.rootfiles()
+    return archive.full_path(rootfiles[0]) if rootfiles else None
+
+
+def directory_rootfiles(base_dir: str) -> List[str]:
+    """Paths of the OPF rootfiles of an extracted book, default rendition first.
+
+    Extracted trees without a usable container.xml fall back to the usual
+    OPF locations and then to a search of the tree.
+    """
+    base_path = Path(base_dir)
+    container = base_path / CONTAINER_PATH
+    key = _book_key(str(container)) if container.is_file() else None
+    if key is not None:
+        found = _cached(key)
+        if found is None:
+            found = tuple(member for member in parse_container(container.read_bytes())
+                          if (base_path / member).is_file())
+            _remember(key, found)
+        if found:
+            return [str(base_path / member) for member in found]
+
+    for opf_path in (base_path / "content.opf", base_path / "OEBPS" / "content.opf",
+                     base_path / "OPS" / "content.opf"):
+        if opf_path.is_file():
+            return [str(opf_path)]
+    return [str(opf_file) for opf_file in base_path.rglob("*.opf")][:1]
+
+
+def clear_cache() -> None:
+    """Forget all remembered rootfiles."""
+    with _lock:
+        _cache.clear()
+
+
+def _cached(key: Optional[_BookKey]) -> Optional[Tuple[str, ...]]:
+    if key is None:
+        return None
+    with _lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+        return cached
+
+
+def _remember(key: Optional[_BookKey], rootfiles: Tuple[str, ...]) -> None:
+    if key is None:
+        return
+    with _lock:
+        _cache[key] = rootfiles
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def _read_rootfiles(zip_file: zipfile.ZipFile) -> Tuple[str, ...]:
+    try:
+        data = zip_file.read(CONTAINER_PATH)
+    except KeyError:
+        data = b''
+    found = tuple(member for member in parse_container(data) if _is_member(zip_file, member))
+    if found:
+        return found
+    return tuple(name for name in zip_file.namelist()
+                 if name.lower().endswith('.opf') and not name.endswith('/'))
+
+
+def _is_member(zip_file: zipfile.ZipFile, name: str) -> bool:
+    try:
+        return not zip_file.getinfo(name).is_dir()
+    except KeyError:
+        return False
+
+
+def _book_key(path: str) -> Optional[_BookKey]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return os.path.abspath(path), stat.st_size, stat.st_mtime_ns
@@ -5,16 +5,22 @@ wrapper levels and groups content by headers.
 """
 
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Set
 
-from bs4 import Tag
+from bs4 import BeautifulSoup, Tag
 
+from ..utils.profiling import count, operation
+from .blocks import ContentBlock, materialize_section
+from .document_cache import DocumentCache
+from .epub_archive import EpubArchive, walk_files
+from .parallel import ExtractionPool
 from .image_resolver import (
     discover_epub_images, resolve_and_validate_images, IMAGE_EXTENSIONS,
 )
+from .streaming_extractor import stream_compact_sections
 from .html_parser import (
     is_generic_header, parse_html_file, clean_body_content,
-    find_content_container, get_content_children,
+    restore_body_content, find_content_container, get_content_children,
 )
 
 # Re-export for backwards compatibility
@@ -23,6 +29,9 @@ __all__ = [
     'is_generic_header', 'extract_content_sections', 'extract_book_content',
 ]
 
+# Folders inside a book whose files are not content
+SKIPPED_FOLDERS = frozenset({'META-INF', '__MACOSX', '.git'})
+
 
 def _extract_images_from_element(element: Tag) -> List[str]:
     """Extract all image sources from an element."""
@@ -61,24 +70,63 @@ def _is_boilerplate(element: Tag) -> bool:
     return False
 
 
-def extract_content_sections(html_file_path: str) -> List[Dict[str, Any]]:
-    """Extract content sections grouped by headers from HTML file."""
-    soup = parse_html_file(html_file_path)
+def extract_content_sections(html_file_path: str,
+                             archive: Optional[EpubArchive] = None,
+                             documents: Optional[DocumentCache] = None) -> List[Dict[str, Any]]:
+    """Extract content sections grouped by headers from HTML file.
+
+    With a document cache the shared tree is parsed by, and handed to, the
+    cache's extraction backend and left unmodified. Documents the cache
+    marks for streaming are read with ``stream_content_sections`` instead.
+    """
+    return [materialize_section(section) for section in
+            compact_content_sections(html_file_path, archive, documents)]
+
+
+def compact_content_sections(html_file_path: str,
+                             archive: Optional[EpubArchive] = None,
+                             documents: Optional[DocumentCache] = None) -> List[Dict[str, Any]]:
+    """``extract_content_sections`` with ContentBlock blocks (the processor's content pass)."""
+    if documents is not None and documents.streams(html_file_path):
+        return list(stream_compact_sections(html_file_path, documents.archive))
+    if documents is not None:
+        document = documents.get(html_file_path)
+        if document is None:
+            return []
+        return documents.backend.content_sections(document)
+
+    soup = parse_html_file(html_file_path, archive)
     if not soup:
         return []
+    return sections_from_soup(soup)
+
+
+def sections_from_soup(soup: BeautifulSoup, restore: bool = False) -> List[Dict[str, Any]]:
+    """Content sections of a parsed document with ContentBlock blocks.
 
+    With restore, boilerplate detached for grouping is put back afterwards.
+    """
     body = soup.find('body')
     if not body:
         return []
 
-    clean_body_content(body)
+    detached = clean_body_content(body)
+    try:
+        return _group_sections(body)
+    finally:
+        if restore:
+            restore_body_content(detached)
+
+
+def _group_sections(body: Tag) -> List[Dict[str, Any]]:
+    """Group the content children of a cleaned body by headers."""
     content_container = find_content_container(body)
     content_children = get_content_children(
         content_container) if content_container else []
 
     sections: List[Dict[str, Any]] = []
     current_header = None
-    current_content: List[Dict[str, Any]] = []
+    current_content: List[ContentBlock] = []
     current_images: List[str] = []
 
     for child in content_children:
@@ -101,21 +149,12 @@ def extract_content_sections(html_file_path: str) -> List[Dict[str, Any]]:
                 })
 
             current_header = child.get_text().strip()
-            current_content = [{
-                'tag': child.name,
-                'text': current_header,
-                'html': str(child),
-                'images': child_images,
-                'is_header': True
-            }]
+            current_content = [ContentBlock(
+                child.name, current_header, str(child), child_images, is_header=True)]
             current_images = child_images
         else:
-            current_content.append({
-                'tag': child.name,
-                'text': child.get_text().strip(),
-                'html': str(child),
-                'images': child_images
-            })
+            current_content.append(ContentBlock(
+                child.name, child.get_text().strip(), str(child), child_images))
             current_images.extend(child_images)
 
     if current_header or current_content:
@@ -128,36 +167,79 @@ def extract_content_sections(html_file_path: str) -> List[Dict[str, Any]]:
     return sections
 
 
-def extract_book_content(epub_directory_path: str) -> Dict[str, Any]:
-    """Extract content from all HTML files in an EPUB directory."""
-    content_data = {}
-    valid_images = discover_epub_images(epub_directory_path)
-
-    for root, dirs, files in os.walk(epub_directory_path):
-        if any(skip in root for skip in ['META-INF', '__MACOSX', '.git']):
+def list_html_files(epub_directory_path: str,
+                    archive: Optional[EpubArchive] = None) -> List[str]:
+    """Full paths of the book's HTML files, skipping META-INF and VCS folders."""
+    html_files = []
+    for file_path in walk_files(epub_directory_path, archive):
+        # Only folders inside the book count; the book's own location may be anywhere
+        folder = os.path.relpath(os.path.dirname(file_path), epub_directory_path)
+        if SKIPPED_FOLDERS.intersection(folder.replace('\\', '/').split('/')):
             continue
+        if file_path.endswith(('.html', '.xhtml', '.htm')):
+            html_files.append(file_path)
+    return html_files
+
+
+def resolve_section_images(sections: List[Dict[str, Any]], relative_path: str,
+                           valid_images: Set[str]) -> None:
+    """Resolve section and block image sources against the file's directory, in place."""
+    html_rel_dir = os.path.dirname(relative_path)
+
+    with operation('image_resolution'):
+        for section in sections:
+            section['images'] = resolve_and_validate_images(
+                section.get(
+                    'images', []), html_rel_dir, valid_images
+            )
+            for block in section.get('content', []):
+                block['images'] = resolve_and_validate_images(
+                    block.get(
+                        'images', []), html_rel_dir, valid_images
+                )
+    count('blocks_emitted', sum(len(section.get('content', [])) for section in sections))
+
+
+def extract_book_content(epub_directory_path: str,
+                         archive: Optional[EpubArchive] = None,
+                         documents: Optional[DocumentCache] = None,
+                         pool: Optional[ExtractionPool] = None) -> Dict[str, Any]:
+    """Extract content from all HTML files in an EPUB directory or archive.
+
+    Each document is released from the cache once its sections are built.
+    With a pool the files are extracted in worker processes instead.
+    """
+    content_data = compact_book_content(epub_directory_path, archive, documents, pool)
+    for sections in content_data.values():
+        for section in sections:
+            materialize_section(section)
+    return content_data
 
-        for file in files:
-            if file.endswith(('.html', '.xhtml', '.htm')):
-                file_path = os.path.join(root, file)
-                relative_path = os.path.relpath(file_path, epub_directory_path)
-                relative_path = relative_path.replace('\\', '/')
-
-                sections = extract_content_sections(file_path)
-                if sections:
-                    html_rel_dir = os.path.dirname(relative_path)
-
-                    for section in sections:
-                        section['images'] = resolve_and_validate_images(
-                            section.get(
-                                'images', []), html_rel_dir, valid_images
-                        )
-                        for block in section.get('content', []):
-                            block['images'] = resolve_and_validate_images(
-                                block.get(
-                                    'images', []), html_rel_dir, valid_images
-                            )
-
-                    content_data[relative_path] = sections
+
+def compact_book_content(epub_directory_path: str,
+                         archive: Optional[EpubArchive] = None,
+                         documents: Optional[DocumentCache] = None,
+                         pool: Optional[ExtractionPool] = None) -> Dict[str, Any]:
+    """``extract_book_content`` with ContentBlock blocks (the processor's content pass)."""
+    content_data = {}
+    valid_images = discover_epub_images(epub_directory_path, archive)
+    html_files = list_html_files(epub_directory_path, archive)
+
+    if pool is not None:
+        all_sections = pool.content_sections(html_files)
+    else:
+        all_sections = []
+        for file_path in html_files:
+            all_sections.append(compact_content_sections(file_path, archive, documents))
+            if documents is not None:
+                documents.release(file_path)
+
+    for file_path, sections in zip(html_files, all_sections):
+        relative_path = os.path.relpath(file_path, epub_directory_path)
+        relative_path = relative_path.replace('\\', '/')
+
+        if sections:
+            resolve_section_images(sections, relative_path, valid_images)
+            content_data[relative_path] = sections
 
     return content_data
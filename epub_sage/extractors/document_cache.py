@@ -0,0 +1,122 @@
+"""Per-book cache of parsed XHTML documents.
+
+Content extraction, image association and TOC section extraction all walk
+the same documents. A DocumentCache owned by the processor parses each
+document once with its extraction backend and hands the same tree to every
+stage, then drops it after the last expected consumer releases it.
+Documents at or above ``stream_threshold`` bytes are never parsed into a
+tree; consumers check ``streams()`` and use the streaming extractors.
+"""
+
+import os
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from .epub_archive import EpubArchive
+
+# Rough in-memory size of a bs4 tree relative to its source markup
+# (backends override this with their own estimate)
+TREE_OVERHEAD_FACTOR = 8
+
+# Default cap on the estimated size of cached trees
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class DocumentCache:
+    """Parsed documents keyed by EPUB-relative href, with a memory cap.
+
+    Each document is dropped once it has been released by ``consumers``
+    stages, or earlier (least recently used first) when the estimated size
+    of all cached trees exceeds ``max_bytes``. An evicted document is simply
+    parsed again on the next request.
+    """
+
+    def __init__(self, root: str, archive: Optional[EpubArchive] = None,
+                 max_bytes: int = DEFAULT_MAX_BYTES, consumers: int = 1,
+                 backend: Any = None, stream_threshold: Optional[int] = None):
+        from .backends import get_backend
+
+        self.root = root
+        self.archive = archive
+        self.max_bytes = max_bytes
+        self.consumers = max(1, consumers)
+        self.backend = get_backend(backend)
+        self.stream_threshold = stream_threshold
+        self._docs: 'OrderedDict[str, Tuple[Any, int]]' = OrderedDict()
+        self._releases: Dict[str, int] = {}
+        self.total_bytes = 0
+        self.parses = 0
+        self.hits = 0
+        self.evictions = 0
+
+    def href(self, path: str) -> str:
+        """EPUB-relative href for a full (or virtual) document path."""
+        return os.path.relpath(os.path.normpath(path), self.root).replace('\\', '/')
+
+    def streams(self, path: str) -> bool:
+        """Whether a document is large enough to be streamed instead of parsed."""
+        return (self.stream_threshold is not None
+                and self._source_size(path) >= self.stream_threshold)
+
+    def get(self, path: str) -> Any:
+        """Parsed tree for a document, parsing it on first use (None if unreadable)."""
+        key = self.href(path)
+        cached = self._docs.get(key)
+        if cached is not None:
+            self._docs.move_to_end(key)
+            self.hits += 1
+            return cached[0]
+
+        document = self.backend.parse_file(path, self.archive)
+        self.parses += 1
+        if document is None:
+            return None
+
+        size = self._source_size(path) * self.backend.tree_overhead
+        if size <= self.max_bytes:
+            self._docs[key] = (document, size)
+            self.total_bytes += size
+            self._evict()
+        return document
+
+    def release(self, path: str) -> None:
+        """Mark one consumer as done with a document."""
+        key = self.href(path)
+        count = self._releases.get(key, 0) + 1
+        if count >= self.consumers:
+            self._releases.pop(key, None)
+            self.discard(path)
+        else:
+            self._releases[key] = count
+
+    def discard(self, path: str) -> None:
+        """Drop a document from the cache immediately."""
+        entry = self._docs.pop(self.href(path), None)
+        if entry is not None:
+            self.total_bytes -= entry[1]
+
+    def clear(self) -> None:
+        """Drop all cached documents."""
+        self._docs.clear()
+        self._releases.clear()
+        self.total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, path: str) -> bool:
+        return self.href(path) in self._docs
+
+    def _source_size(self, path: str) -> int:
+        try:
+            if self.archive is not None:
+                return self.archive.file_size(path)
+            return os.path.getsize(path)
+        except OSError:
+            return 0
+
+    def _evict(self) -> None:
+        while self.total_bytes > self.max_bytes and self._docs:
+            _, (_, size) = self._docs.popitem(last=False)
+            self.total_bytes -= size
+            self.evictions += 1
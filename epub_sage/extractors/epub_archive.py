@@ -0,0 +1,198 @@
+"""Archive-backed virtual filesystem for reading EPUB members in place.
+
+Members are addressed by virtual paths rooted at ``EpubArchive.root`` so the
+path arithmetic used for extracted directories keeps working unchanged:
+``<root>/OEBPS/content.opf`` maps to the ``OEBPS/content.opf`` member.
+"""
+
+import io
+import os
+import zipfile
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import IO, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from .container import zip_rootfiles
+from ..utils.limits import check_time
+from ..utils.profiling import active_profiler, record_read
+
+ArchiveSource = Union[str, Path, bytes, bytearray, BinaryIO, zipfile.ZipFile]
+
+Checkpoint = Callable[[], None]
+
+# Checkpoint given to archives opened in the current context
+_checkpoint: ContextVar[Optional[Checkpoint]] = ContextVar('epub_sage_checkpoint', default=None)
+
+
+@contextmanager
+def archive_checkpoint(checkpoint: Checkpoint) -> Iterator[None]:
+    """Install ``checkpoint`` on the archives opened in this context.
+
+    It is also called before files of an extracted book are opened, so code
+    that opens its own archives (``process_epub``) can still be aborted.
+    """
+    token = _checkpoint.set(checkpoint)
+    try:
+        yield
+    finally:
+        _checkpoint.reset(token)
+
+
+class EpubArchive:
+    """Read-only view over the members of an EPUB ZIP archive.
+
+    ``checkpoint``, when set, is called before every member is opened; it
+    may raise to abort whatever is reading the archive. It defaults to the
+    one installed by archive_checkpoint() in the current context.
+    """
+
+    def __init__(self, source: ArchiveSource, root: Optional[str] = None):
+        self.path: Optional[str] = None
+        self.checkpoint: Optional[Checkpoint] = _checkpoint.get()
+        self._owns_zip = True
+
+        try:
+            if isinstance(source, zipfile.ZipFile):
+                self._zip = source
+                self._owns_zip = False
+                if isinstance(source.filename, str):
+                    self.path = os.path.abspath(source.filename)
+            elif isinstance(source, (bytes, bytearray)):
+                self._zip = zipfile.ZipFile(io.BytesIO(source), 'r')
+            elif isinstance(source, (str, Path)):
+                if not Path(source).exists():
+                    raise FileNotFoundError(f"EPUB file not found: {source}")
+                self.path = os.path.abspath(source)
+                self._zip = zipfile.ZipFile(self.path, 'r')
+            else:
+                self._zip = zipfile.ZipFile(source, 'r')
+        except zipfile.BadZipFile:
+            raise ValueError(f"Invalid ZIP/EPUB file: {self.path or source!r:.80}")
+
+        self.root = os.path.abspath(root or self.path or 'memory.epub')
+        self._members: Dict[str, zipfile.ZipInfo] = {
+            info.filename: info for info in self._zip.infolist()
+            if not info.is_dir()
+        }
+        self._rootfiles: Optional[Tuple[str, ...]] = None
+
+    def __enter__(self) -> 'EpubArchive':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying ZIP file if this archive opened it."""
+        if self._owns_zip:
+            self._zip.close()
+
+    @property
+    def zip_file(self) -> zipfile.ZipFile:
+        """Underlying ZipFile handle."""
+        return self._zip
+
+    def namelist(self) -> List[str]:
+        """Member names of all files in the archive."""
+        return list(self._members)
+
+    def infolist(self) -> List[zipfile.ZipInfo]:
+        """ZipInfo records of all files in the archive."""
+        return list(self._members.values())
+
+    def member_name(self, path: str) -> Optional[str]:
+        """Map a virtual path (or a bare member name) to a member name."""
+        path = str(path)
+        if os.path.isabs(path):
+            rel = os.path.relpath(os.path.normpath(path), self.root)
+            if rel == '.' or rel == os.pardir or rel.startswith(os.pardir + os.sep):
+                return None
+        else:
+            rel = os.path.normpath(path)
+        return rel.replace('\\', '/')
+
+    def full_path(self, member: str) -> str:
+        """Virtual path of a member under the archive root."""
+        return os.path.join(self.root, *member.split('/'))
+
+    def getinfo(self, path: str) -> Optional[zipfile.ZipInfo]:
+        """ZipInfo for a virtual path, or None if it is not a member."""
+        member = self.member_name(path)
+        return self._members.get(member) if member else None
+
+    def exists(self, path: str) -> bool:
+        """Check whether a virtual path is a file member."""
+        return self.getinfo(path) is not None
+
+    def file_size(self, path: str) -> int:
+        """Uncompressed size of a member in bytes."""
+        info = self.getinfo(path)
+        if info is None:
+            raise FileNotFoundError(f"Not found in archive: {path}")
+        return info.file_size
+
+    def open(self, path: str) -> IO[bytes]:
+        """Open a member for streaming binary reads."""
+        if self.checkpoint is not None:
+            self.checkpoint()
+        check_time()
+        info = self.getinfo(path)
+        if info is None:
+            raise FileNotFoundError(f"Not found in archive: {path}")
+        record_read(info.file_size)
+        return self._zip.open(info, 'r')
+
+    def read_bytes(self, path: str) -> bytes:
+        """Read a member fully into memory."""
+        with self.open(path) as member:
+            return member.read()
+
+    def rootfiles(self) -> Tuple[str, ...]:
+        """Member names of the book's OPF rootfiles, default rendition first."""
+        if self._rootfiles is None:
+            self._rootfiles = zip_rootfiles(self._zip, self.path)
+        return self._rootfiles
+
+    def iter_files(self) -> Iterator[str]:
+        """Yield the virtual path of every file member in archive order."""
+        for member in self._members:
+            yield self.full_path(member)
+
+
+def path_exists(path: str, archive: Optional[EpubArchive] = None) -> bool:
+    """Check that a file exists on disk or inside an archive."""
+    if archive is not None:
+        return archive.exists(path)
+    return os.path.exists(path)
+
+
+def open_file(path: str, archive: Optional[EpubArchive] = None) -> IO[bytes]:
+    """Open a file for binary reading from disk or from an archive."""
+    if archive is not None:
+        return archive.open(path)
+    checkpoint = _checkpoint.get()
+    if checkpoint is not None:
+        checkpoint()
+    check_time()
+    f = open(path, 'rb')
+    if active_profiler() is not None:
+        record_read(os.fstat(f.fileno()).st_size)
+    return f
+
+
+def read_file_text(path: str, archive: Optional[EpubArchive] = None,
+                   encoding: str = 'utf-8') -> str:
+    """Read and decode a whole file from disk or from an archive."""
+    with io.TextIOWrapper(open_file(path, archive), encoding=encoding) as f:
+        return f.read()
+
+
+def walk_files(root: str, archive: Optional[EpubArchive] = None) -> Iterator[str]:
+    """Yield the full path of every file below root."""
+    if archive is not None:
+        yield from archive.iter_files()
+        return
+    for dirpath, _, files in os.walk(root):
+        for file in files:
+            yield os.path.join(dirpath, file)
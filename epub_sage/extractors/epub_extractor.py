@@ -1,54 +1,106 @@
 """EPUB File Extractor - ZIP file extraction and management."""
 
+import os
+import threading
 import zipfile
-import hashlib
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional, List, Any
+from typing import Dict, Iterable, Optional, List, Any
 
+from .container import directory_rootfiles, find_rootfiles, zip_rootfiles
+from .epub_archive import EpubArchive
+from .image_export import ExportReport, ImageExporter, COPY_CHUNK_SIZE
+from .member_filter import select_members
 from .epub_validator import validate_epub_structure
+from ..services.fingerprint_service import (
+    FingerprintService, get_fingerprint_service, hash_central_directory, BOOK_ID_LENGTH
+)
+from ..utils.limits import ResourceLimits
+
+# Book identity modes: hash of the whole file, or of the ZIP central directory only
+ID_MODE_CONTENT = "content"
+ID_MODE_CENTRAL_DIRECTORY = "central-directory"
+ID_MODES = (ID_MODE_CONTENT, ID_MODE_CENTRAL_DIRECTORY)
 
 
 class EpubExtractor:
-    """Handles EPUB file extraction and management."""
+    """Handles EPUB file extraction and management.
+
+    With ``limits``, extract_epub() and open_archive() check the ZIP central
+    directory against them first and raise ResourceLimitExceeded.
+    """
 
-    def __init__(self, base_dir: str = "uploads"):
+    def __init__(self, base_dir: str = "uploads",
+                 fingerprints: Optional[FingerprintService] = None,
+                 id_mode: str = ID_MODE_CONTENT,
+                 limits: Optional[ResourceLimits] = None):
+        if id_mode not in ID_MODES:
+            raise ValueError(f"Unknown id_mode: {id_mode} (expected one of {', '.join(ID_MODES)})")
         self.base_dir = Path(base_dir)
         self.base_dir.mkdir(exist_ok=True)
+        self.fingerprints = fingerprints or get_fingerprint_service()
+        self.id_mode = id_mode
+        self.limits = limits
 
     def extract_epub(
             self,
             epub_path: str,
-            output_dir: Optional[str] = None) -> str:
-        """Extract EPUB file to organized directory structure."""
+            output_dir: Optional[str] = None,
+            book_id: Optional[str] = None,
+            media_types: Optional[Iterable[str]] = None,
+            spine: bool = False,
+            patterns: Optional[Iterable[str]] = None,
+            workers: int = 1) -> str:
+        """Extract EPUB file to organized directory structure.
+
+        The book is only hashed when the directory name is needed and no
+        precomputed book_id is passed. ``media_types`` (manifest media
+        types, globs allowed), ``spine`` and ``patterns`` (member name globs)
+        extract only the matching members plus the package files; see
+        ``member_filter.select_members``. With ``workers`` above 1, members
+        are extracted by that many threads (see ``extract_members``).
+        """
         epub_file = Path(epub_path)
         if not epub_file.exists():
             raise FileNotFoundError(f"EPUB file not found: {epub_path}")
 
-        book_id = self.generate_book_id(epub_path)
-
         if output_dir:
             extract_dir = Path(output_dir)
         else:
-            extract_dir = self.base_dir / book_id / "raw"
+            extract_dir = self.base_dir / (book_id or self.generate_book_id(epub_path)) / "raw"
 
         extract_dir.mkdir(parents=True, exist_ok=True)
 
         try:
             with zipfile.ZipFile(epub_file, 'r') as zip_ref:
-                zip_ref.extractall(extract_dir)
+                if self.limits is not None:
+                    self.limits.check_archive(zip_ref.infolist())
+                members = None
+                if media_types is not None or spine or patterns is not None:
+                    members = select_members(
+                        zip_ref, zip_rootfiles(zip_ref, str(epub_file)),
+                        media_types, spine, patterns)
+                if workers > 1:
+                    extract_members(str(epub_file),
+                                    members if members is not None else zip_ref.infolist(),
+                                    extract_dir, workers)
+                else:
+                    zip_ref.extractall(extract_dir, members)
         except zipfile.BadZipFile:
             raise ValueError(f"Invalid ZIP/EPUB file: {epub_file}")
 
         return str(extract_dir)
 
     def generate_book_id(self, file_path: str) -> str:
-        """Generate unique book ID from file hash."""
-        hash_sha256 = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_sha256.update(chunk)
-        return hash_sha256.hexdigest()[:16]
+        """Generate unique book ID from file hash (cached by path, size and mtime).
+
+        In central-directory mode the ID comes from the ZIP index instead,
+        which only reads the end of the file. The two modes give different IDs.
+        """
+        if self.id_mode == ID_MODE_CENTRAL_DIRECTORY:
+            return hash_central_directory(file_path)[:BOOK_ID_LENGTH]
+        return self.fingerprints.book_id(file_path)
 
     def get_epub_info(self, epub_path: str) -> Dict[str, Any]:
         """Get EPUB information without extracting."""
@@ -62,11 +114,8 @@ class EpubExtractor:
                 total_size = sum(
                     zip_ref.getinfo(name).file_size for name in file_list)
 
-                content_opf_path = None
-                for name in file_list:
-                    if name.endswith('content.opf'):
-                        content_opf_path = name
-                        break
+                rootfiles = zip_rootfiles(zip_ref, str(epub_file))
+                content_opf_path = rootfiles[0] if rootfiles else None
 
                 html_files = [
                     f for f in file_list if f.endswith(('.html', '.xhtml', '.htm'))]
@@ -82,6 +131,7 @@ class EpubExtractor:
                     "total_size_bytes": total_size,
                     "total_size_mb": round(total_size / (1024 * 1024), 2),
                     "content_opf": content_opf_path,
+                    "rootfiles": list(rootfiles),
                     "html_files_count": len(html_files),
                     "image_files_count": len(image_files),
                     "css_files_count": len(css_files),
@@ -116,40 +166,103 @@ class EpubExtractor:
             epub_path: str,
             file_path: str,
             output_path: str) -> bool:
-        """Extract a single file from EPUB."""
+        """Extract a single file from EPUB, streamed in chunks."""
         try:
             with zipfile.ZipFile(epub_path, 'r') as zip_ref:
                 with zip_ref.open(file_path) as source:
                     with open(output_path, 'wb') as target:
-                        target.write(source.read())
+                        shutil.copyfileobj(source, target, COPY_CHUNK_SIZE)
                 return True
         except BaseException:
             return False
 
-    def find_content_opf(self, extracted_dir: str) -> Optional[str]:
-        """Find content.opf file in extracted EPUB directory."""
-        base_path = Path(extracted_dir)
+    def export_files(self, epub_path: str, file_paths: List[str], output_dir: str,
+                     workers: int = 1, dedupe: bool = True) -> ExportReport:
+        """Export many members (e.g. images) into one directory in a single pass.
 
-        common_paths = [
-            base_path / "content.opf",
-            base_path / "OEBPS" / "content.opf",
-            base_path / "OPS" / "content.opf",
-        ]
+        The book is opened once and members are streamed to disk; see
+        ImageExporter for naming, deduplication and ``workers``.
+        """
+        with ImageExporter(epub_path, workers=workers, dedupe=dedupe) as exporter:
+            return exporter.export_all(file_paths, output_dir)
 
-        for opf_path in common_paths:
-            if opf_path.exists():
-                return str(opf_path)
+    def open_archive(self, epub_path: str) -> EpubArchive:
+        """Open an EPUB for in-place member reads without extraction."""
+        archive = EpubArchive(epub_path)
+        if self.limits is not None:
+            try:
+                self.limits.check_archive(archive.zip_file.infolist())
+            except Exception:
+                archive.close()
+                raise
+        return archive
 
-        for opf_file in base_path.rglob("*.opf"):
-            return str(opf_file)
+    def find_content_opf(self, extracted_dir: str,
+                         archive: Optional[EpubArchive] = None) -> Optional[str]:
+        """Find the default OPF named by container.xml in an extracted EPUB or archive."""
+        rootfiles = self.find_rootfiles(extracted_dir, archive)
+        return rootfiles[0] if rootfiles else None
 
-        return None
+    def find_rootfiles(self, extracted_dir: str,
+                       archive: Optional[EpubArchive] = None) -> List[str]:
+        """Find every OPF rendition named by container.xml, default first."""
+        if archive is not None:
+            return find_rootfiles(archive)
+        return directory_rootfiles(extracted_dir)
 
     def validate_epub_structure(self, epub_path: str) -> Dict[str, Any]:
         """Validate EPUB file structure and requirements."""
         return validate_epub_structure(epub_path)
 
 
+def extract_members(epub_path: str, members: List[zipfile.ZipInfo],
+                    target_dir: Path, workers: int) -> None:
+    """Extract ZIP members with a pool of threads, largest first.
+
+    Each thread reads through its own ZipFile handle and streams members
+    straight to their target files, so large DEFLATE members decompress on
+    several cores (zlib releases the GIL). Directories are created up front.
+    """
+    files = [info for info in members if not info.is_dir()]
+    for info in members:
+        target = _target_path(target_dir, info)
+        (target if info.is_dir() else target.parent).mkdir(parents=True, exist_ok=True)
+
+    local = threading.local()
+    handles: List[zipfile.ZipFile] = []
+    lock = threading.Lock()
+
+    def extract(info: zipfile.ZipInfo) -> None:
+        zip_ref = getattr(local, 'zip_ref', None)
+        if zip_ref is None:
+            zip_ref = local.zip_ref = zipfile.ZipFile(epub_path, 'r')
+            with lock:
+                handles.append(zip_ref)
+        zip_ref.extract(info, target_dir)
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            ordered = sorted(files, key=lambda info: info.file_size, reverse=True)
+            futures = [pool.submit(extract, info) for info in ordered]
+            try:
+                for future in futures:
+                    future.result()
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+    finally:
+        for zip_ref in handles:
+            zip_ref.close()
+
+
+def _target_path(target_dir: Path, info: zipfile.ZipInfo) -> Path:
+    """Where ZipFile.extract writes a member (unsafe path parts dropped)."""
+    parts = [part for part in info.filename.split('/')
+             if part not in ('', os.curdir, os.pardir)]
+    return target_dir.joinpath(*parts)
+
+
 def quick_extract(epub_path: str, output_dir: Optional[str] = None) -> str:
     """Convenience function for quick EPUB extraction."""
     extractor = EpubExtractor()
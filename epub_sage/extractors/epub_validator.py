@@ -3,6 +3,8 @@
 import zipfile
 from typing import Dict, List, Any
 
+from .container import zip_rootfiles
+
 
 def validate_epub_structure(epub_path: str) -> Dict[str, Any]:
     """
@@ -44,11 +46,8 @@ def validate_epub_structure(epub_path: str) -> Dict[str, Any]:
             else:
                 errors.append("Missing META-INF/container.xml")
 
-            # Check for content.opf
-            for name in file_list:
-                if name.endswith('content.opf'):
-                    results["has_content_opf"] = True
-                    break
+            # Check for the OPF package document named by container.xml
+            results["has_content_opf"] = bool(zip_rootfiles(zip_ref, epub_path))
 
             if not results["has_content_opf"]:
                 errors.append("Missing content.opf file")
@@ -1,9 +1,25 @@
 """HTML parsing utilities for content extraction."""
 
-import os
-from typing import List, Optional
+from typing import Any, List, Optional, Tuple, Union
 
 from bs4 import BeautifulSoup, Tag
+from lxml import etree
+
+from ..utils.limits import ResourceLimitExceeded, check_elements, element_limit
+from ..utils.profiling import active_profiler, count, operation
+from .epub_archive import EpubArchive, path_exists, read_file_text
+
+HEADER_TAGS = ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']
+
+# Class/id fragments that mark an element as a header
+HEADER_KEYWORDS = [
+    'title', 'heading', 'chapter-head', 'ch-title', 'section-title',
+    'chapter-label', 'ch-label', 'title-prefix', 'chapter-number',
+    'label', 'title-text'
+]
+
+# Boilerplate elements removed before grouping content
+JUNK_TAGS = ['nav', 'aside', 'script', 'style', 'footer', 'header']
 
 
 def is_generic_header(element: Optional[Tag]) -> bool:
@@ -11,18 +27,12 @@ def is_generic_header(element: Optional[Tag]) -> bool:
     if not element or not hasattr(element, 'name') or not element.name:
         return False
 
-    if element.name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
+    if element.name in HEADER_TAGS:
         return True
 
     if element.get('role') == 'heading':
         return True
 
-    keywords = [
-        'title', 'heading', 'chapter-head', 'ch-title', 'section-title',
-        'chapter-label', 'ch-label', 'title-prefix', 'chapter-number',
-        'label', 'title-text'
-    ]
-
     class_attr = element.get('class')
     cls = " ".join(class_attr) if isinstance(
         class_attr, list) else (class_attr or "")
@@ -30,7 +40,7 @@ def is_generic_header(element: Optional[Tag]) -> bool:
     id_str = id_val if isinstance(id_val, str) else ""
     combined = (cls + " " + id_str).lower()
 
-    if any(kw in combined for kw in keywords):
+    if any(kw in combined for kw in HEADER_KEYWORDS):
         text = element.get_text(strip=True)
         if 0 < len(text) < 200:
             return True
@@ -38,31 +48,100 @@ def is_generic_header(element: Optional[Tag]) -> bool:
     return False
 
 
-def parse_html_file(html_file_path: str) -> Optional[BeautifulSoup]:
-    """Parse HTML file with fallback parsers."""
-    if not os.path.exists(html_file_path):
+class _ElementCounter:
+    """lxml parser target that counts start tags, failing past the element limit."""
+
+    def __init__(self, limit: int, document: str):
+        self.limit = limit
+        self.document = document
+        self.elements = 0
+
+    def start(self, tag: str, attrib: Any) -> None:
+        self.elements += 1
+        if self.elements > self.limit:
+            check_elements(self.elements, self.document)
+
+    def close(self) -> int:
+        return self.elements
+
+
+def check_element_limit(markup: Union[str, bytes], document: str) -> None:
+    """Count the elements of a document against the active limit before it is parsed.
+
+    The counting parser builds no tree, so an oversized document fails after
+    ``max_elements`` start tags instead of after being parsed in full.
+    No-op without an active element limit.
+    """
+    limit = element_limit()
+    if limit is None:
+        return
+    parser = etree.XMLParser(target=_ElementCounter(limit, document),
+                             recover=True, huge_tree=True)
+    try:
+        parser.feed(markup)
+        parser.close()
+    except etree.LxmlError:
+        # Unparsable markup is left to the real parser (and its fallbacks)
+        pass
+
+
+def parse_html_file(html_file_path: str,
+                    archive: Optional[EpubArchive] = None) -> Optional[BeautifulSoup]:
+    """Parse HTML file with fallback parsers.
+
+    When an archive is given, the path is resolved inside it instead of on disk.
+    """
+    if not path_exists(html_file_path, archive):
         return None
 
     try:
-        with open(html_file_path, 'r', encoding='utf-8') as file:
+        with operation('document_parse'):
+            markup = read_file_text(html_file_path, archive)
+            check_element_limit(markup, html_file_path)
             try:
-                return BeautifulSoup(file, 'lxml-xml')
+                soup = BeautifulSoup(markup, 'lxml-xml')
             except Exception:
-                file.seek(0)
-                return BeautifulSoup(file, 'html.parser')
+                soup = BeautifulSoup(markup, 'html.parser')
+    except ResourceLimitExceeded:
+        raise
     except Exception:
         return None
+    if active_profiler() is not None or element_limit() is not None:
+        elements = len(soup.find_all(True))
+        count('documents_parsed')
+        count('elements_visited', elements)
+        check_elements(elements, html_file_path)
+    return soup
+
+
+DetachedElement = Tuple[Tag, int, Tag]
+
 
+def clean_body_content(body: Tag) -> List[DetachedElement]:
+    """Detach boilerplate elements from body.
 
-def clean_body_content(body: Tag) -> None:
-    """Remove boilerplate elements from body."""
-    for junk_tag in ['nav', 'aside', 'script', 'style', 'footer', 'header']:
+    Returns (parent, index, element) records so a shared tree can be put
+    back together with restore_body_content().
+    """
+    detached: List[DetachedElement] = []
+    for junk_tag in JUNK_TAGS:
         for junk in body.find_all(junk_tag):
             if not is_generic_header(junk) and not any(
                 is_generic_header(c if isinstance(c, Tag) else None)
                 for c in junk.descendants if getattr(c, 'name', None)
             ):
-                junk.decompose()
+                parent = junk.parent
+                if parent is None:
+                    continue
+                detached.append((parent, parent.index(junk), junk))
+                junk.extract()
+    return detached
+
+
+def restore_body_content(detached: List[DetachedElement]) -> None:
+    """Re-insert elements detached by clean_body_content()."""
+    for parent, index, element in reversed(detached):
+        parent.insert(index, element)
 
 
 def find_content_container(body: Tag) -> Tag:
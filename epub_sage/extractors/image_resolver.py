@@ -3,6 +3,8 @@
 import os
 from typing import List, Optional, Set
 
+from .epub_archive import EpubArchive, walk_files
+
 # Common EPUB image extensions
 IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp')
 
@@ -23,16 +25,15 @@ def normalize_path(path: str) -> str:
     return normalized
 
 
-def discover_epub_images(epub_directory_path: str) -> Set[str]:
-    """Discover all image files in an EPUB directory."""
+def discover_epub_images(epub_directory_path: str,
+                         archive: Optional[EpubArchive] = None) -> Set[str]:
+    """Discover all image files in an EPUB directory or archive."""
     image_paths: Set[str] = set()
 
-    for root, _, files in os.walk(epub_directory_path):
-        for file in files:
-            if file.lower().endswith(IMAGE_EXTENSIONS):
-                file_path = os.path.join(root, file)
-                relative_path = os.path.relpath(file_path, epub_directory_path)
-                image_paths.add(normalize_path(relative_path))
+    for file_path in walk_files(epub_directory_path, archive):
+        if file_path.lower().endswith(IMAGE_EXTENSIONS):
+            relative_path = os.path.relpath(file_path, epub_directory_path)
+            image_paths.add(normalize_path(relative_path))
 
     return image_paths
 
@@ -0,0 +1,800 @@
+"""lxml.etree implementations of the content and TOC extractors.
+
+Mirrors html_parser, content_extractor, section_builder, element_extractors
+and specialized_extractors, producing the same dicts straight from lxml
+elements. Element and attribute names follow BeautifulSoup's lxml-xml
+convention: ``prefix:local`` for prefixed names, the bare local name
+otherwise. Boilerplate is skipped rather than removed, so parsed trees are
+never modified and can be shared between stages.
+"""
+
+from typing import Any, Collection, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from lxml import etree
+from lxml.etree import _Element as Element
+
+from ..utils.limits import check_elements, element_limit
+from ..utils.profiling import active_profiler, count, operation
+from .anchor_index import AnchorIndex
+from .blocks import ContentBlock, materialize_section
+from .epub_archive import EpubArchive, open_file, path_exists
+from .element_extractors import ADMONITION_TYPES, CONTAINER_TAGS, TYPE_MAP
+from .html_parser import HEADER_KEYWORDS, HEADER_TAGS, JUNK_TAGS, check_element_limit
+from .specialized_extractors import normalize_text
+
+XML_NAMESPACE = 'http://www.w3.org/XML/1998/namespace'
+
+_NO_SKIP: Set[Element] = set()
+
+_ASCII_SPACES = '\x20\x0a\x09\x0c\x0d'
+
+
+def parse_html_file(html_file_path: str,
+                    archive: Optional[EpubArchive] = None) -> Optional[Element]:
+    """Parse an XHTML file into an lxml element tree (root element)."""
+    if not path_exists(html_file_path, archive):
+        return None
+
+    try:
+        with operation('document_parse'):
+            with open_file(html_file_path, archive) as f:
+                data = f.read()
+            check_element_limit(data, html_file_path)
+            root = etree.fromstring(data, etree.XMLParser(recover=True, huge_tree=True))
+            if root is None:
+                root = etree.fromstring(data, etree.HTMLParser())
+    except (etree.LxmlError, ValueError, OSError):
+        return None
+    if root is not None and (active_profiler() is not None or element_limit() is not None):
+        elements = sum(1 for _ in root.iter())
+        count('documents_parsed')
+        count('elements_visited', elements)
+        check_elements(elements, html_file_path)
+    return root
+
+
+# --- Element access ---------------------------------------------------------
+
+def tag_name(element: Any) -> Optional[str]:
+    """Element name as BeautifulSoup reports it (None for comments and PIs)."""
+    tag = element.tag
+    if not isinstance(tag, str):
+        return None
+    local = tag.rpartition('}')[2]
+    prefix = element.prefix
+    return f'{prefix}:{local}' if prefix else local
+
+
+def get_attr(element: Element, name: str, default: Any = None) -> Any:
+    """Attribute value by bs4-style name, resolving ``prefix:local`` names."""
+    if ':' in name:
+        prefix, local = name.split(':', 1)
+        namespace = XML_NAMESPACE if prefix == 'xml' else element.nsmap.get(prefix)
+        if namespace:
+            return element.get(f'{{{namespace}}}{local}', default)
+    return element.get(name, default)
+
+
+def child_elements(element: Element, skip: Collection[Element] = _NO_SKIP) -> List[Element]:
+    """Direct child elements, ignoring comments, PIs and skipped elements."""
+    return [child for child in element
+            if isinstance(child.tag, str) and child not in skip]
+
+
+def iter_descendants(element: Element,
+                     skip: Collection[Element] = _NO_SKIP) -> Iterator[Element]:
+    """Descendant elements in document order, pruning skipped subtrees."""
+    if not skip:
+        for child in element.iterdescendants():
+            if isinstance(child.tag, str):
+                yield child
+        return
+    stack = list(reversed(child_elements(element, skip)))
+    while stack:
+        current = stack.pop()
+        yield current
+        stack.extend(reversed(child_elements(current, skip)))
+
+
+def find_all(element: Element, names: Collection[str],
+             skip: Collection[Element] = _NO_SKIP) -> List[Element]:
+    """Descendants with any of the given names."""
+    return [d for d in iter_descendants(element, skip) if tag_name(d) in names]
+
+
+def find(element: Element, names: Collection[str],
+         skip: Collection[Element] = _NO_SKIP) -> Optional[Element]:
+    """First descendant with any of the given names."""
+    for d in iter_descendants(element, skip):
+        if tag_name(d) in names:
+            return d
+    return None
+
+
+def find_by_attr(element: Element, attr: str, value: str) -> Optional[Element]:
+    """First element (including element itself) whose attribute equals value."""
+    for d in element.iter():
+        if isinstance(d.tag, str) and d.get(attr) == value:
+            return d
+    return None
+
+
+def _bs4_string(text: str) -> str:
+    """Collapse whitespace-only text the way BeautifulSoup does when parsing."""
+    if text.strip(_ASCII_SPACES):
+        return text
+    return '\n' if '\n' in text else ' '
+
+
+def iter_strings(element: Element, skip: Collection[Element] = _NO_SKIP) -> Iterator[str]:
+    """Text nodes of a subtree, split and collapsed as BeautifulSoup does."""
+    if not skip:
+        for text in element.itertext():
+            yield _bs4_string(text)
+        return
+    if element.text and isinstance(element.tag, str):
+        yield _bs4_string(element.text)
+    for child in element:
+        if child not in skip and isinstance(child.tag, str):
+            yield from iter_strings(child, skip)
+        if child.tail:
+            yield _bs4_string(child.tail)
+
+
+def _special_string(node: Element) -> str:
+    """Content of a comment or PI as BeautifulSoup stores it."""
+    if node.tag is etree.ProcessingInstruction:
+        return f'{node.target} {node.text}' if node.text else str(node.target)
+    return node.text or ''
+
+
+def iter_all_strings(element: Element) -> Iterator[str]:
+    """Like iter_strings but also yields comments and PIs.
+
+    Matches iterating bs4 ``descendants`` for ``str`` instances.
+    """
+    if element.text:
+        yield _bs4_string(element.text)
+    for child in element:
+        if isinstance(child.tag, str):
+            yield from iter_all_strings(child)
+        else:
+            yield _special_string(child)
+        if child.tail:
+            yield _bs4_string(child.tail)
+
+
+def get_text(element: Element, separator: str = '', strip: bool = False,
+             skip: Collection[Element] = _NO_SKIP) -> str:
+    """Equivalent of bs4 ``Tag.get_text``."""
+    strings: Iterator[str] = iter_strings(element, skip)
+    if strip:
+        strings = (s.strip() for s in strings if s.strip())
+    return separator.join(strings)
+
+
+def to_html(element: Element, skip: Collection[Element] = _NO_SKIP) -> str:
+    """Serialize an element exactly like bs4's ``str(tag)`` for lxml-xml trees.
+
+    Attributes are sorted by name, namespace declarations appear only where
+    they were declared, and skipped elements are left out.
+    """
+    parts: List[str] = []
+    _serialize(element, skip, parts)
+    return ''.join(parts)
+
+
+def _escape(text: str) -> str:
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def _quote(value: str) -> str:
+    value = _escape(value)
+    if '"' in value:
+        if "'" in value:
+            return '"' + value.replace('"', '&quot;') + '"'
+        return "'" + value + "'"
+    return '"' + value + '"'
+
+
+def _attribute_name(element: Element, key: str) -> str:
+    if not key.startswith('{'):
+        return key
+    namespace, _, local = key[1:].partition('}')
+    if namespace == XML_NAMESPACE:
+        return f'xml:{local}'
+    for prefix, uri in element.nsmap.items():
+        if uri == namespace and prefix:
+            return f'{prefix}:{local}'
+    return local
+
+
+def _serialize(element: Element, skip: Collection[Element], parts: List[str]) -> None:
+    tag = element.tag
+    if tag is etree.Comment:
+        parts.append(f'<!--{element.text or ""}-->')
+        return
+    if tag is etree.ProcessingInstruction:
+        parts.append(f'<?{element.target} {element.text or ""}?>'
+                     if element.text else f'<?{element.target}?>')
+        return
+
+    attrs = [(_attribute_name(element, k), v) for k, v in element.attrib.items()]
+    parent = element.getparent()
+    inherited = parent.nsmap if parent is not None else {}
+    for prefix, uri in element.nsmap.items():
+        if inherited.get(prefix) != uri:
+            attrs.append((f'xmlns:{prefix}' if prefix else 'xmlns', uri))
+    attrs.sort()
+
+    name = tag_name(element) or ''
+    parts.append('<' + name + ''.join(f' {k}={_quote(v)}' for k, v in attrs))
+    children = [c for c in element if c not in skip]
+    if not element.text and not children and not any(c.tail for c in element):
+        parts.append('/>')
+        return
+    parts.append('>')
+    if element.text:
+        parts.append(_escape(_bs4_string(element.text)))
+    for child in element:
+        if child not in skip:
+            _serialize(child, skip, parts)
+        if child.tail:
+            parts.append(_escape(_bs4_string(child.tail)))
+    parts.append(f'</{name}>')
+
+
+# --- html_parser ------------------------------------------------------------
+
+def is_generic_header(element: Optional[Element],
+                      skip: Collection[Element] = _NO_SKIP) -> bool:
+    """Identifies if an element is a header using tags, classes, and roles."""
+    if element is None:
+        return False
+    name = tag_name(element)
+    if not name:
+        return False
+
+    if name in HEADER_TAGS:
+        return True
+
+    if element.get('role') == 'heading':
+        return True
+
+    cls = element.get('class') or ''
+    id_str = element.get('id') or ''
+    combined = (cls + " " + id_str).lower()
+
+    if any(kw in combined for kw in HEADER_KEYWORDS):
+        text = get_text(element, strip=True, skip=skip)
+        if 0 < len(text) < 200:
+            return True
+
+    return False
+
+
+def find_boilerplate(body: Element) -> Set[Element]:
+    """Boilerplate elements that clean_body_content() would remove."""
+    skip: Set[Element] = set()
+    for junk_tag in JUNK_TAGS:
+        for junk in find_all(body, (junk_tag,), skip):
+            if not is_generic_header(junk, skip) and not any(
+                is_generic_header(c, skip) for c in iter_descendants(junk, skip)
+            ):
+                skip.add(junk)
+    return skip
+
+
+def find_content_container(body: Element, skip: Collection[Element] = _NO_SKIP) -> Element:
+    """Navigate to content level using child count logic."""
+    current_container = body
+    while True:
+        children = child_elements(current_container, skip)
+        if len(children) == 1:
+            current_container = children[0]
+        else:
+            break
+    return current_container
+
+
+def get_content_children(container: Element,
+                         skip: Collection[Element] = _NO_SKIP) -> List[Element]:
+    """Get content children from container."""
+    all_direct_children = child_elements(container, skip)
+
+    if any(is_generic_header(child, skip) for child in all_direct_children):
+        return all_direct_children
+
+    content_children: List[Element] = []
+    for child in all_direct_children:
+        if tag_name(child) in ('div', 'section', 'article'):
+            child_elements_ = child_elements(child, skip)
+            if child_elements_:
+                content_children.extend(child_elements_)
+            elif get_text(child, skip=skip).strip():
+                content_children.append(child)
+        else:
+            content_children.append(child)
+
+    return content_children
+
+
+# --- content_extractor ------------------------------------------------------
+
+def _svg_href(element: Element) -> Optional[str]:
+    return element.get('href') or get_attr(element, 'xlink:href')
+
+
+def _extract_images_from_element(element: Element,
+                                 skip: Collection[Element] = _NO_SKIP) -> List[str]:
+    """Extract all image sources from an element."""
+    images: List[str] = []
+
+    for img in find_all(element, ('img',), skip):
+        src = img.get('src')
+        if src:
+            images.append(src)
+
+    for svg_img in find_all(element, ('image',), skip):
+        href = _svg_href(svg_img)
+        if href:
+            images.append(href)
+
+    name = tag_name(element)
+    if name == 'img':
+        src = element.get('src')
+        if src and src not in images:
+            images.append(src)
+    elif name == 'image':
+        href = _svg_href(element)
+        if href and href not in images:
+            images.append(href)
+
+    return images
+
+
+def _is_boilerplate(element: Element, skip: Collection[Element] = _NO_SKIP) -> bool:
+    """Check if element is boilerplate (link-heavy)."""
+    text = get_text(element, strip=True, skip=skip)
+    if len(text) > 40:
+        links_text = "".join(get_text(a, strip=True, skip=skip)
+                             for a in find_all(element, ('a',), skip))
+        if (len(links_text) / len(text)) > 0.70:
+            return True
+    return False
+
+
+def extract_content_sections(root: Element) -> List[Dict[str, Any]]:
+    """Header-grouped content sections of a parsed document, as plain dicts."""
+    return [materialize_section(section) for section in compact_content_sections(root)]
+
+
+def compact_content_sections(root: Element) -> List[Dict[str, Any]]:
+    """Content sections of a parsed document with ContentBlock blocks."""
+    body = root if tag_name(root) == 'body' else find(root, ('body',))
+    if body is None:
+        return []
+
+    skip = find_boilerplate(body)
+    content_container = find_content_container(body, skip)
+    content_children = get_content_children(content_container, skip)
+    return list(group_sections(content_children, skip))
+
+
+def group_sections(content_children: Iterable[Element],
+                   skip: Collection[Element] = _NO_SKIP) -> Iterator[Dict[str, Any]]:
+    """Group content-level elements into sections, starting one at each header.
+
+    Each section is yielded as soon as the next header is seen, and each
+    element is finished with before the next one is requested. Blocks are
+    ContentBlocks.
+    """
+    current_header = None
+    current_content: List[ContentBlock] = []
+    current_images: List[str] = []
+
+    for child in content_children:
+        child_images = _extract_images_from_element(child, skip)
+        generic_header = is_generic_header(child, skip)
+
+        if not generic_header:
+            if _is_boilerplate(child, skip):
+                continue
+            text = get_text(child, strip=True, skip=skip)
+            if not text and not child_images:
+                continue
+
+        if generic_header:
+            if current_header or current_content:
+                yield {
+                    'header': current_header or 'Intro',
+                    'content': current_content,
+                    'images': current_images
+                }
+
+            current_header = get_text(child, skip=skip).strip()
+            current_content = [ContentBlock(
+                tag_name(child), current_header, to_html(child, skip), child_images,
+                is_header=True)]
+            current_images = child_images
+        else:
+            current_content.append(ContentBlock(
+                tag_name(child), get_text(child, skip=skip).strip(), to_html(child, skip),
+                child_images))
+            current_images.extend(child_images)
+
+    if current_header or current_content:
+        yield {
+            'header': current_header or 'Intro',
+            'content': current_content,
+            'images': current_images
+        }
+
+
+# --- specialized_extractors -------------------------------------------------
+
+def _text(element: Element, strip: bool = False) -> str:
+    return normalize_text(get_text(element, separator=' ', strip=strip))
+
+
+def extract_table(element: Element) -> Dict[str, Any]:
+    """Extract table with caption, headers and rows."""
+    result: Dict[str, Any] = {'type': 'table'}
+
+    caption = find(element, ('caption',))
+    if caption is not None:
+        result['caption'] = _text(caption, strip=True)
+
+    result['headers'] = [_text(th, strip=True) for th in find_all(element, ('th',))]
+
+    rows = []
+    for tr in find_all(element, ('tr',)):
+        cells = [_text(td, strip=True) for td in find_all(tr, ('td',))]
+        if cells:
+            rows.append(cells)
+    result['rows'] = rows
+    result['text'] = _text(element)
+    return result
+
+
+def extract_definition_list(element: Element) -> Dict[str, Any]:
+    """Extract definition list with term-definition pairs."""
+    items = []
+    current_term = None
+
+    for child in child_elements(element):
+        name = tag_name(child)
+        if name == 'dt':
+            current_term = _text(child, strip=True)
+        elif name == 'dd' and current_term:
+            items.append({'term': current_term, 'definition': _text(child, strip=True)})
+
+    return {'type': 'definition_list', 'items': items, 'text': _text(element)}
+
+
+def extract_list(element: Element) -> Dict[str, Any]:
+    """Extract list with structured items supporting nested lists."""
+    list_type = 'ordered' if tag_name(element) == 'ol' else 'unordered'
+
+    def extract_item(li: Element) -> Any:
+        nested = next((c for c in child_elements(li) if tag_name(c) in ('ul', 'ol')), None)
+        if nested is None:
+            return _text(li, strip=True)
+
+        text_parts = []
+        if li.text and li.text.strip():
+            text_parts.append(li.text.strip())
+        for child in li:
+            if isinstance(child.tag, str):
+                if tag_name(child) in ('ul', 'ol'):
+                    break
+                text_parts.append(get_text(child, separator=' ', strip=True))
+            elif _special_string(child).strip():
+                text_parts.append(_special_string(child).strip())
+            if child.tail and child.tail.strip():
+                text_parts.append(child.tail.strip())
+
+        nested_content = extract_list(nested)
+        return {
+            'text': normalize_text(' '.join(text_parts)),
+            'items': nested_content['items'],
+            'list_type': nested_content['list_type']
+        }
+
+    items = [extract_item(li) for li in child_elements(element) if tag_name(li) == 'li']
+    return {'type': 'list', 'list_type': list_type, 'items': items, 'text': _text(element)}
+
+
+def extract_admonition(element: Element) -> Dict[str, Any]:
+    """Extract admonition (note/tip/warning) with type and text."""
+    return {
+        'type': 'admonition',
+        'admonition_type': element.get('data-type', 'note'),
+        'text': normalize_text(' '.join(
+            s.strip() for s in iter_all_strings(element) if s.strip()))
+    }
+
+
+def extract_sidebar(element: Element) -> Dict[str, Any]:
+    """Extract sidebar with title and text."""
+    heading = find(element, ('h1', 'h2', 'h3'))
+    return {
+        'type': 'sidebar',
+        'title': _text(heading, strip=True) if heading is not None else '',
+        'text': _text(element)
+    }
+
+
+def extract_epigraph(element: Element) -> Dict[str, Any]:
+    """Extract epigraph (quote) with attribution."""
+    quote_parts = []
+    attribution = ''
+
+    for child in child_elements(element):
+        if child.get('data-type') == 'attribution':
+            attribution = _text(child, strip=True)
+        elif tag_name(child) == 'p':
+            quote_parts.append(get_text(child, separator=' ', strip=True))
+
+    return {
+        'type': 'epigraph',
+        'text': normalize_text(' '.join(quote_parts)),
+        'attribution': attribution
+    }
+
+
+def extract_figure(element: Element) -> Dict[str, Any]:
+    """Extract figure with image src, alt, and caption."""
+    result: Dict[str, Any] = {'type': 'figure'}
+
+    img = find(element, ('img',))
+    if img is not None:
+        src = img.get('src')
+        if src:
+            result['src'] = src
+        alt = img.get('alt')
+        if alt:
+            result['alt'] = normalize_text(alt)
+
+    caption_elem = find(element, ('h6',))
+    if caption_elem is not None:
+        result['caption'] = _text(caption_elem, strip=True)
+
+    result['text'] = _text(element)
+    return result
+
+
+def collect_keywords(elements: List[Element]) -> List[Dict[str, str]]:
+    """Collect keywords from indexterm elements."""
+    keywords: List[Dict[str, str]] = []
+    for elem in elements:
+        if elem.get('data-type') != 'indexterm':
+            continue
+        keyword: Dict[str, str] = {}
+        for key in ['data-primary', 'data-secondary', 'data-tertiary', 'data-seealso']:
+            val = elem.get(key)
+            if val:
+                keyword[key.replace('data-', '')] = val
+        if keyword:
+            keywords.append(keyword)
+    return keywords
+
+
+def collect_references(elements: List[Element]) -> List[Dict[str, str]]:
+    """Collect cross-references from xref elements."""
+    references: List[Dict[str, str]] = []
+    for elem in elements:
+        if elem.get('data-type') != 'xref':
+            continue
+        href = elem.get('href', '')
+        text = _text(elem, strip=True)
+        if href and text:
+            references.append({'text': text, 'href': href})
+    return references
+
+
+# --- element_extractors -----------------------------------------------------
+
+def is_content_container(element: Element) -> bool:
+    """Check if element is a container that holds content children."""
+    return tag_name(element) in CONTAINER_TAGS
+
+
+def extract_element(element: Element, include_html: bool = False) -> Optional[Dict[str, Any]]:
+    """Extract content from a single element."""
+    name = tag_name(element)
+    data_type = element.get('data-type', '')
+    result: Optional[Dict[str, Any]] = None
+
+    if name == 'table':
+        result = extract_table(element)
+    elif name == 'dl':
+        result = extract_definition_list(element)
+        if 'calloutlist' in (element.get('class') or ''):
+            result['type'] = 'callout_list'
+    elif name in ('ul', 'ol'):
+        result = extract_list(element)
+    elif data_type == 'indexterm':
+        return None
+    elif data_type in ADMONITION_TYPES:
+        result = extract_admonition(element)
+    elif data_type == 'sidebar' or name == 'aside':
+        result = extract_sidebar(element)
+    elif data_type == 'epigraph':
+        result = extract_epigraph(element)
+    elif data_type == 'equation':
+        result = {'type': 'equation', 'text': _text(element)}
+    elif name == 'figure':
+        result = extract_figure(element)
+
+    if result is not None:
+        if include_html:
+            result['html'] = to_html(element)
+        return result
+
+    block_type = TYPE_MAP.get(name or '', 'paragraph')
+    block_result: Dict[str, Any] = {'type': block_type, 'text': _text(element)}
+
+    if name == 'pre':
+        lang = element.get('data-code-language')
+        if lang:
+            block_result['language'] = lang
+
+    if include_html:
+        block_result['html'] = to_html(element)
+
+    if block_type == 'image':
+        img = element if name == 'img' else find(element, ('img',))
+        if img is not None:
+            if img.get('src'):
+                block_result['src'] = img.get('src')
+            if img.get('alt'):
+                block_result['alt'] = img.get('alt')
+        svg_img = find(element, ('image',))
+        if svg_img is not None:
+            href = _svg_href(svg_img)
+            if href:
+                block_result['src'] = href
+    else:
+        images: List[str] = [img.get('src') for img in find_all(element, ('img',))
+                             if img.get('src')]
+        images.extend(href for href in (_svg_href(s) for s in find_all(element, ('image',)))
+                      if href)
+        if images:
+            block_result['images'] = images
+
+    return block_result
+
+
+# --- section_builder --------------------------------------------------------
+
+def build_anchor_index(root: Element, anchors: Optional[Set[str]] = None) -> AnchorIndex:
+    """Index ids and names of a document (or subtree) in one pass."""
+    index = AnchorIndex(anchors)
+    for element in root.iter():
+        if isinstance(element.tag, str):
+            index.add(element, element.get('id'), element.get('name'),
+                      element.iterancestors())
+    return index
+
+
+def find_element_by_id(root: Element, anchor_id: str,
+                       index: Optional[AnchorIndex] = None) -> Optional[Element]:
+    """Find element by ID, checking both id and name attributes."""
+    if index is not None:
+        return index.find(anchor_id)
+    element = find_by_attr(root, 'id', anchor_id)
+    if element is not None:
+        return element
+    return find_by_attr(root, 'name', anchor_id)
+
+
+def _next_element(element: Element) -> Optional[Element]:
+    sibling = element.getnext()
+    while sibling is not None and not isinstance(sibling.tag, str):
+        sibling = sibling.getnext()
+    return sibling
+
+
+def extract_container_children(container: Element, all_anchors: Set[str],
+                               include_html: bool = False,
+                               index: Optional[AnchorIndex] = None) -> List[Dict]:
+    """Extract direct children from a container element.
+
+    Stops at child with any TOC anchor ID (subsection boundary).
+    """
+    content_blocks = []
+    if index is None:
+        index = build_anchor_index(container, all_anchors)
+    anchors = frozenset(all_anchors)
+
+    for child in child_elements(container):
+        child_id = child.get('id')
+        if child_id and child_id in all_anchors:
+            break
+
+        if index.contains_any(child, anchors):
+            break
+
+        block = extract_element(child, include_html)
+        if block is not None:
+            content_blocks.append(block)
+
+    return content_blocks
+
+
+def extract_section_between_anchors(
+    root: Element,
+    start_anchor: Optional[str],
+    end_anchor: Optional[str],
+    all_anchors: Optional[Set[str]] = None,
+    include_html: bool = False,
+    index: Optional[AnchorIndex] = None
+) -> List[Dict]:
+    """Extract all content between two anchor IDs in a parsed document."""
+    content_blocks: List[Dict] = []
+    all_anchors = all_anchors or set()
+
+    body = root if tag_name(root) == 'body' else find(root, ('body',))
+    if body is None:
+        return content_blocks
+
+    if index is None:
+        index = build_anchor_index(root, all_anchors | {end_anchor} if end_anchor else all_anchors)
+
+    start_element = None
+    if start_anchor:
+        start_element = find_element_by_id(root, start_anchor, index)
+        if start_element is None:
+            return content_blocks
+
+    end_element = find_element_by_id(root, end_anchor, index) if end_anchor else None
+
+    def reached_end(element: Element) -> bool:
+        if end_element is not None and element is end_element:
+            return True
+        element_id = element.get('id')
+        if end_anchor and element_id == end_anchor:
+            return True
+        return bool(element_id and element_id in all_anchors)
+
+    if start_element is not None:
+        if is_content_container(start_element):
+            return extract_container_children(start_element, all_anchors, include_html, index)
+
+        block = extract_element(start_element, include_html)
+        if block is not None:
+            content_blocks.append(block)
+
+        current = _next_element(start_element)
+        while current is not None:
+            if end_anchor and index.contains(current, end_anchor):
+                break
+            if reached_end(current):
+                break
+            block = extract_element(current, include_html)
+            if block is not None:
+                content_blocks.append(block)
+            current = _next_element(current)
+    else:
+        for child in child_elements(body):
+            if reached_end(child):
+                break
+            block = extract_element(child, include_html)
+            if block is not None:
+                content_blocks.append(block)
+
+    return content_blocks
+
+
+def collect_anchor_terms(
+    root: Element,
+    anchor: str,
+    index: Optional[AnchorIndex] = None
+) -> Tuple[List[Dict[str, str]], List[Dict[str, str]]]:
+    """Index terms and cross-references inside the element with the given id."""
+    start_elem = index.by_id(anchor) if index is not None else find_by_attr(root, 'id', anchor)
+    if start_elem is None:
+        return [], []
+    links = find_all(start_elem, ('a',))
+    return collect_keywords(links), collect_references(links)
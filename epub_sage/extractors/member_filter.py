@@ -0,0 +1,71 @@
+"""Member selection for partial extraction.
+
+``EpubExtractor.extract_epub`` can write a subset of a book: members whose
+manifest media type matches, spine documents, or members whose name matches
+a glob. The package itself (``mimetype``, ``META-INF``, the OPF rootfiles
+and the NCX / nav documents) is always written, so the directory can still
+be read as a book.
+"""
+
+import posixpath
+import zipfile
+from fnmatch import fnmatchcase
+from typing import Iterable, List, Optional, Set
+from urllib.parse import unquote
+from xml.etree import ElementTree as ET
+
+NCX_MEDIA_TYPE = 'application/x-dtbncx+xml'
+
+
+def select_members(zip_file: zipfile.ZipFile, rootfiles: Iterable[str],
+                   media_types: Optional[Iterable[str]] = None,
+                   spine: bool = False,
+                   patterns: Optional[Iterable[str]] = None) -> List[zipfile.ZipInfo]:
+    """ZipInfo records of the members to extract, in archive order.
+
+    A member is kept if it matches any filter: ``media_types`` are matched
+    against the manifest (``image/*`` style globs allowed), ``spine`` keeps
+    the documents in the spine and ``patterns`` are globs matched against
+    member names (``*`` also matches ``/``). Matching is case-insensitive.
+    """
+    media_globs = [media_type.lower() for media_type in media_types or ()]
+    name_globs = [pattern.lower() for pattern in patterns or ()]
+
+    keep: Set[str] = {'mimetype'}
+    for rootfile in rootfiles:
+        keep.add(rootfile)
+        keep.update(_manifest_members(zip_file, rootfile, media_globs, spine))
+
+    return [info for info in zip_file.infolist()
+            if not info.is_dir() and (
+                info.filename in keep or info.filename.startswith('META-INF/')
+                or any(fnmatchcase(info.filename.lower(), glob) for glob in name_globs))]
+
+
+def _manifest_members(zip_file: zipfile.ZipFile, rootfile: str,
+                      media_globs: List[str], spine: bool) -> Set[str]:
+    """Members of one OPF's manifest selected by media type, spine or navigation role."""
+    try:
+        root = ET.fromstring(zip_file.read(rootfile))
+    except (KeyError, ET.ParseError):
+        return set()
+
+    opf_dir = posixpath.dirname(rootfile)
+    spine_ids = {element.get('idref') for element in root.iter()
+                 if _local(element.tag) == 'itemref'} if spine else set()
+    members = set()
+    for item in root.iter():
+        if _local(item.tag) != 'item' or not item.get('href'):
+            continue
+        media_type = (item.get('media-type') or '').lower()
+        if (media_type == NCX_MEDIA_TYPE
+                or 'nav' in (item.get('properties') or '').split()
+                or item.get('id') in spine_ids
+                or any(fnmatchcase(media_type, glob) for glob in media_globs)):
+            href = unquote(item.get('href', '').split('#', 1)[0])
+            members.add(posixpath.normpath(posixpath.join(opf_dir, href)))
+    return members
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1] if isinstance(tag, str) else ''
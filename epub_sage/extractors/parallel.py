@@ -0,0 +1,215 @@
+"""Process-pool fan-out for per-file content extraction.
+
+Content sections and TOC sections are built one XHTML file at a time, and
+the files are independent of each other. An ExtractionPool runs that
+per-file work in worker processes. Each worker opens the book itself (the
+EPUB by path, or the extracted directory), parses the file with the same
+backend and returns plain dicts. Image resolution and merging stay in the
+calling process. Jobs are submitted largest file first, but results come
+back in the caller's order, so output matches a serial run exactly.
+
+With ``max_elements``, workers enforce the element limit of a ResourceLimits
+budget; the caller's budget timeout bounds the wait for their results. While
+a profiler is active, each job runs under a profiler of its own and its
+counters (documents parsed, elements visited, files and bytes read...) are
+added to the caller's.
+
+Worker processes of this pool, ``process_many`` and ``EpubServer`` are
+started with ``process_context()`` (forkserver where available, else spawn)
+rather than forked, so they never inherit locks held by other threads or
+open SQLite connections (FingerprintService, ResultCache) of the parent.
+"""
+
+import functools
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeout
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from ..utils.limits import ResourceLimitExceeded, ResourceLimits, active_budget
+from ..utils.profiling import Profiler, active_profiler, count
+from .document_cache import DocumentCache
+from .epub_archive import EpubArchive
+
+# Start methods that do not copy the parent's threads and connections, in preference order
+_START_METHODS = ('forkserver', 'spawn')
+
+# Book opened by this worker process: (source key, archive)
+_worker_book: Dict[str, Any] = {}
+
+
+def process_context() -> multiprocessing.context.BaseContext:
+    """Multiprocessing context used to start worker processes."""
+    available = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context(next(method for method in _START_METHODS
+                                            if method in available))
+
+
+def _worker_archive(source: Optional[Tuple[str, int, int]], root: str) -> Optional[EpubArchive]:
+    """Archive for a book in a worker, reopened only when the book changes."""
+    if source is None:
+        return None
+    key = (source, root)
+    if _worker_book.get('key') != key:
+        previous = _worker_book.pop('archive', None)
+        if previous is not None:
+            previous.close()
+        _worker_book['archive'] = EpubArchive(source[0], root=root)
+        _worker_book['key'] = key
+    return _worker_book['archive']
+
+
+@contextmanager
+def _element_budget(max_elements: Optional[int]) -> Iterator[None]:
+    """Enforce an element limit in a worker (no-op without one)."""
+    if max_elements is None:
+        yield
+        return
+    limits = ResourceLimits(max_uncompressed_bytes=None, max_compression_ratio=None,
+                            max_members=None, max_elements=max_elements)
+    with limits.activate():
+        yield
+
+
+def _content_job(source: Optional[Tuple[str, int, int]], root: str, backend: str,
+                 stream_threshold: Optional[int], max_elements: Optional[int],
+                 path: str) -> List[Dict[str, Any]]:
+    from .content_extractor import compact_content_sections
+
+    archive = _worker_archive(source, root)
+    documents = DocumentCache(root, archive, backend=backend, stream_threshold=stream_threshold)
+    with _element_budget(max_elements):
+        return compact_content_sections(path, archive, documents)
+
+
+def _anchor_job(source: Optional[Tuple[str, int, int]], root: str, backend: str,
+                stream_threshold: Optional[int], max_elements: Optional[int], path: str,
+                boundaries: List[Any], all_anchors: Set[str],
+                include_html: bool) -> Optional[List[Any]]:
+    from .toc_content_extractor import extract_anchor_sections
+
+    archive = _worker_archive(source, root)
+    documents = DocumentCache(root, archive, backend=backend, stream_threshold=stream_threshold)
+    with _element_budget(max_elements):
+        return extract_anchor_sections(path, boundaries, all_anchors, include_html,
+                                       archive, documents)
+
+
+def _profiled_job(job: Callable[..., Any], *args: Any) -> Tuple[Any, Dict[str, int]]:
+    """Run a job under a profiler of its own; returns its result and counters."""
+    profiler = Profiler()
+    with profiler.activate():
+        result = job(*args)
+    return result, profiler.counters
+
+
+def _add_counters(outcomes: List[Tuple[Any, Dict[str, int]]]) -> List[Any]:
+    """Results of profiled jobs, with their counters added to the active profiler."""
+    results = []
+    for result, counters in outcomes:
+        for name, amount in counters.items():
+            count(name, amount)
+        results.append(result)
+    return results
+
+
+def can_parallelize(archive: Optional[EpubArchive]) -> bool:
+    """Whether worker processes can open the book (in-memory archives cannot)."""
+    return archive is None or archive.path is not None
+
+
+class ExtractionPool:
+    """Worker processes running per-file extraction for one book.
+
+    ``root`` is the extracted directory, or the archive's virtual root when
+    an archive (opened from a file path) is given.
+    """
+
+    def __init__(self, workers: int, root: str, archive: Optional[EpubArchive] = None,
+                 backend: str = 'bs4', stream_threshold: Optional[int] = None,
+                 max_elements: Optional[int] = None):
+        if not can_parallelize(archive):
+            raise ValueError("Parallel extraction needs an EPUB file path or directory")
+        self.workers = workers
+        self.root = root
+        self.archive = archive
+        self.backend = backend
+        self.stream_threshold = stream_threshold
+        self.max_elements = max_elements
+        self._source: Optional[Tuple[str, int, int]] = None
+        if archive is not None and archive.path is not None:
+            stat = os.stat(archive.path)
+            self._source = (archive.path, stat.st_size, stat.st_mtime_ns)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def content_sections(self, paths: List[str]) -> List[List[Dict[str, Any]]]:
+        """compact_content_sections() for each path, in the order given."""
+        return self._run(_content_job, [(path,) for path in paths])
+
+    def anchor_sections(self, jobs: List[Tuple[str, List[Any]]], all_anchors: Set[str],
+                        include_html: bool = False) -> List[Optional[List[Any]]]:
+        """extract_anchor_sections() for each (path, boundaries) job, in the order given."""
+        return self._run(_anchor_job, [(path, boundaries, all_anchors, include_html)
+                                       for path, boundaries in jobs])
+
+    def close(self) -> None:
+        """Shut the worker processes down."""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def terminate(self) -> None:
+        """Kill the worker processes without waiting for running jobs."""
+        if self._executor is not None:
+            # Running jobs are not cancellable; stop the processes themselves
+            for process in list(getattr(self._executor, '_processes', {}).values()):
+                process.terminate()
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def __enter__(self) -> 'ExtractionPool':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _run(self, job: Callable[..., Any], calls: List[Tuple[Any, ...]]) -> List[Any]:
+        """Submit job(book..., *call) for each call, largest file first; results in call order."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=process_context())
+        book = (self._source, self.root, self.backend, self.stream_threshold, self.max_elements)
+        # Counters of work done in the workers are sent back with the results
+        profiled = active_profiler() is not None
+        run_job: Callable[..., Any] = functools.partial(_profiled_job, job) if profiled else job
+        futures: Dict[int, Future] = {}
+        # Largest files first, so a big file does not start last and finish late
+        for position in sorted(range(len(calls)), key=lambda i: -self._size(calls[i][0])):
+            futures[position] = self._executor.submit(run_job, *book, *calls[position])
+        budget = active_budget()
+        if budget is None:
+            results = [futures[position].result() for position in range(len(calls))]
+            return _add_counters(results) if profiled else results
+
+        results = []
+        try:
+            for position in range(len(calls)):
+                try:
+                    results.append(futures[position].result(timeout=budget.remaining()))
+                except FutureTimeout:
+                    budget.check_time()
+                    raise
+        except ResourceLimitExceeded as e:
+            budget.breach(e)
+            self.terminate()
+            raise
+        return _add_counters(results) if profiled else results
+
+    def _size(self, path: str) -> int:
+        try:
+            if self.archive is not None:
+                return self.archive.file_size(path)
+            return os.path.getsize(path)
+        except OSError:
+            return 0
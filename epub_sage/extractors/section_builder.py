@@ -1,12 +1,15 @@
 """Section boundary building for TOC-based content extraction."""
 
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple, Union
 
 from bs4 import BeautifulSoup, Tag
 from pydantic import BaseModel
 
 from ..models.structure import NavigationPoint
-from .element_extractors import extract_element, is_content_container
+from .anchor_index import AnchorIndex
+from .element_extractors import (
+    extract_element, is_content_container, collect_keywords, collect_references,
+)
 
 
 class SectionBoundary(BaseModel):
@@ -53,8 +56,29 @@ def build_section_boundaries(
     return boundaries
 
 
-def find_element_by_id(soup: BeautifulSoup, anchor_id: str) -> Optional[Tag]:
+def build_anchor_index(soup: Union[BeautifulSoup, Tag],
+                       anchors: Optional[Set[str]] = None) -> AnchorIndex:
+    """Index ids and names of a document (or subtree) in one pass.
+
+    Containment is tracked for ``anchors`` only, or for every id when None.
+    """
+    index = AnchorIndex(anchors)
+    for element in soup.descendants:
+        if not isinstance(element, Tag):
+            continue
+        element_id, name = element.get('id'), element.get('name')
+        index.add(element,
+                  element_id if isinstance(element_id, str) else None,
+                  name if isinstance(name, str) else None,
+                  element.parents)
+    return index
+
+
+def find_element_by_id(soup: BeautifulSoup, anchor_id: str,
+                       index: Optional[AnchorIndex] = None) -> Optional[Tag]:
     """Find element by ID, checking both id and name attributes."""
+    if index is not None:
+        return index.find(anchor_id)
     element = soup.find(id=anchor_id)
     if element:
         return element
@@ -64,13 +88,17 @@ def find_element_by_id(soup: BeautifulSoup, anchor_id: str) -> Optional[Tag]:
 def extract_container_children(
     container: Tag,
     all_anchors: Set[str],
-    include_html: bool = False
+    include_html: bool = False,
+    index: Optional[AnchorIndex] = None
 ) -> List[Dict]:
     """Extract direct children from a container element.
 
     Stops at child with any TOC anchor ID (subsection boundary).
     """
     content_blocks = []
+    if index is None:
+        index = build_anchor_index(container, all_anchors)
+    anchors = frozenset(all_anchors)
 
     for child in container.children:
         if not isinstance(child, Tag):
@@ -80,7 +108,7 @@ def extract_container_children(
         if child_id and child_id in all_anchors:
             break
 
-        if child.find(lambda el: isinstance(el, Tag) and el.get('id') in all_anchors):
+        if index.contains_any(child, anchors):
             break
 
         block = extract_element(child, include_html)
@@ -95,13 +123,17 @@ def extract_section_between_anchors(
     start_anchor: Optional[str],
     end_anchor: Optional[str],
     all_anchors: Optional[Set[str]] = None,
-    include_html: bool = False
+    include_html: bool = False,
+    index: Optional[AnchorIndex] = None
 ) -> List[Dict]:
     """Extract all content between two anchor IDs in an HTML document.
 
     Supports:
     1. Header-anchored: <h1 id="x">Title</h1><p>content</p>
     2. Container-anchored: <div id="x"><h1>Title</h1><p>content</p></div>
+
+    Pass an ``index`` from build_anchor_index() (tracking all_anchors and
+    end_anchor) when extracting several sections from the same document.
     """
     content_blocks: List[Dict] = []
     all_anchors = all_anchors or set()
@@ -110,20 +142,23 @@ def extract_section_between_anchors(
     if not body:
         return content_blocks
 
+    if index is None:
+        index = build_anchor_index(soup, all_anchors | {end_anchor} if end_anchor else all_anchors)
+
     start_element = None
     if start_anchor:
-        start_element = find_element_by_id(soup, start_anchor)
+        start_element = find_element_by_id(soup, start_anchor, index)
         if not start_element:
             return content_blocks
 
     end_element = None
     if end_anchor:
-        end_element = find_element_by_id(soup, end_anchor)
+        end_element = find_element_by_id(soup, end_anchor, index)
 
     if start_element:
         if is_content_container(start_element):
             content_blocks = extract_container_children(
-                start_element, all_anchors, include_html)
+                start_element, all_anchors, include_html, index)
         else:
             block = extract_element(start_element, include_html)
             if block is not None:
@@ -134,7 +169,7 @@ def extract_section_between_anchors(
                 if isinstance(current, Tag):
                     if end_element and current == end_element:
                         break
-                    if end_anchor and current.find(id=end_anchor):
+                    if end_anchor and index.contains(current, end_anchor):
                         break
                     if end_anchor and current.get('id') == end_anchor:
                         break
@@ -162,3 +197,17 @@ def extract_section_between_anchors(
                     content_blocks.append(block)
 
     return content_blocks
+
+
+def collect_anchor_terms(
+    soup: BeautifulSoup,
+    anchor: str,
+    index: Optional[AnchorIndex] = None
+) -> Tuple[List[Dict[str, str]], List[Dict[str, str]]]:
+    """Index terms and cross-references inside the element with the given id."""
+    start_elem = index.by_id(anchor) if index is not None else soup.find(id=anchor)
+    if not start_elem:
+        return [], []
+    indexterms = start_elem.find_all('a', attrs={'data-type': 'indexterm'})
+    xrefs = start_elem.find_all('a', attrs={'data-type': 'xref'})
+    return collect_keywords(indexterms), collect_references(xrefs)
@@ -0,0 +1,625 @@
+"""Streaming extraction for very large XHTML documents.
+
+Some EPUBs put the whole book in a single XHTML file of tens of megabytes,
+and building a full tree for it takes gigabytes of memory. The functions
+here run ``lxml.etree.iterparse`` over the document instead. They emit
+sections and blocks as elements close, then free each processed subtree.
+Peak memory is bounded by the largest single content item (or boilerplate
+element such as a ``nav``) rather than by the file size.
+
+Blocks are produced by the lxml extractors and match the tree-based
+extractors' output:
+
+* ``stream_content_sections`` groups the elements that
+  ``find_content_container`` and ``get_content_children`` pick. Which
+  element is the container, and whether a header is among its children,
+  depends on the rest of the document, so a first pass finds both (keeping
+  only the elements whose text it must measure) and a second pass emits
+  the sections.
+* An anchor matches the first element with that ``id``, else the first
+  with that ``name``. A ``name`` match is only trusted once the document is
+  known to have no such ``id``, which takes an extra pass over the ids when
+  a ``name`` match comes first.
+"""
+
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from lxml import etree
+from lxml.etree import _Element as Element
+
+from ..utils.limits import ELEMENT_CHECK_INTERVAL, check_elements, check_time, element_limit
+from ..utils.profiling import count
+from .blocks import materialize_section
+from .epub_archive import EpubArchive, open_file, path_exists
+from .html_parser import HEADER_KEYWORDS, HEADER_TAGS, JUNK_TAGS
+from .lxml_extractors import (
+    collect_keywords,
+    collect_references,
+    extract_element,
+    find_all,
+    get_text,
+    group_sections,
+    is_content_container,
+    is_generic_header,
+    iter_descendants,
+    tag_name,
+)
+
+# Children of the content container whose own children are the content
+# items when no header is among them (as in get_content_children)
+WRAPPER_TAGS = ('div', 'section', 'article')
+
+# Keyword headers are at most this long (see is_generic_header)
+HEADER_TEXT_LIMIT = 200
+
+# Blocks, keywords and references extracted for one TOC boundary
+AnchorSection = Tuple[List[Dict], List[Dict[str, str]], List[Dict[str, str]]]
+
+
+def iterparse_document(html_file_path: str,
+                       archive: Optional[EpubArchive] = None) -> Iterator[Tuple[str, Element]]:
+    """Yield ``start`` and ``end`` events for a document without building a full tree."""
+    count('documents_parsed')
+    elements = 0
+    limited = element_limit() is not None
+    with open_file(html_file_path, archive) as f:
+        events = etree.iterparse(f, events=('start', 'end'), recover=True, huge_tree=True)
+        try:
+            for event in events:
+                if event[0] == 'end':
+                    elements += 1
+                    if limited and elements % ELEMENT_CHECK_INTERVAL == 0:
+                        check_elements(elements, html_file_path)
+                        check_time()
+                yield event
+            if limited:
+                check_elements(elements, html_file_path)
+        except (etree.LxmlError, ValueError):
+            return
+        finally:
+            count('elements_visited', elements)
+
+
+def free_element(element: Element) -> None:
+    """Release a finished element and its subtree."""
+    parent = element.getparent()
+    element.clear()
+    if parent is None:
+        return
+    parent.remove(element)
+
+
+def _needs_text(element: Element) -> bool:
+    """Whether is_generic_header() has to measure the element's text."""
+    if tag_name(element) in HEADER_TAGS or element.get('role') == 'heading':
+        return False
+    combined = ((element.get('class') or '') + ' ' + (element.get('id') or '')).lower()
+    return any(keyword in combined for keyword in HEADER_KEYWORDS)
+
+
+def _find_boilerplate(root: Element) -> Set[Element]:
+    """find_boilerplate() for the subtree of a boilerplate element, root included.
+
+    Whether boilerplate is dropped depends only on its own subtree, so
+    each outermost boilerplate element can be settled once it closes.
+    """
+    skip: Set[Element] = set()
+    for junk_tag in JUNK_TAGS:
+        if root in skip:
+            break
+        candidates = find_all(root, (junk_tag,), skip)
+        if tag_name(root) == junk_tag:
+            candidates.insert(0, root)
+        for junk in candidates:
+            if not is_generic_header(junk, skip) and not any(
+                is_generic_header(c, skip) for c in iter_descendants(junk, skip)
+            ):
+                skip.add(junk)
+    return skip
+
+
+def _closed_text_length(element: Element, dropped: bool, skip: Set[Element]) -> int:
+    """Stripped text length a just-closed element adds to its parent's get_text().
+
+    Covers the text before the element (back to the previous element) and
+    the element's own text. The parent's tree may already hold later
+    siblings parsed ahead of their events, so it is not measured directly.
+    """
+    length = 0
+    node = element.getprevious()
+    while node is not None:
+        if node.tail:
+            length += len(node.tail.strip())
+        if isinstance(node.tag, str):
+            break
+        node = node.getprevious()
+    else:
+        parent = element.getparent()
+        if parent is not None and parent.text:
+            length += len(parent.text.strip())
+    if not dropped:
+        length += len(get_text(element, strip=True, skip=skip))
+    return length
+
+
+class _Frame:
+    """An open element of the layout pass (kept afterwards if on the container chain)."""
+
+    __slots__ = ('position', 'children', 'kept', 'first', 'has_header',
+                 'chain', 'watched', 'junk', 'measured', 'length')
+
+    def __init__(self, element: Element, position: int, chain: bool, watched: bool):
+        self.position = position
+        self.children = 0
+        # Child elements that are not dropped boilerplate, the first of them,
+        # and whether one of them is a header
+        self.kept = 0
+        self.first: Optional['_Frame'] = None
+        self.has_header = False
+        # Whether the element can still be on the container chain (every
+        # ancestor's first kept child), and whether its header status is needed
+        self.chain = chain
+        self.watched = watched
+        self.junk = tag_name(element) in JUNK_TAGS
+        # True while the text is kept to be measured, False once too long,
+        # and the stripped length of the text of the children closed so far
+        self.measured: Optional[bool] = True if watched and _needs_text(element) else None
+        self.length = 0
+
+    def fill(self, element: Element, skip: Set[Element]) -> None:
+        """Set the child counts from the element's (retained) subtree."""
+        children = [child for child in element if isinstance(child.tag, str)]
+        kept = [(position, child) for position, child in enumerate(children)
+                if child not in skip]
+        self.kept = len(kept)
+        self.has_header = any(is_generic_header(child, skip) for _, child in kept)
+        if len(kept) == 1:
+            position, child = kept[0]
+            self.first = _Frame(child, position, chain=True, watched=True)
+            self.first.fill(child, skip)
+
+
+def _scan_layout(html_file_path: str,
+                 archive: Optional[EpubArchive] = None) -> Optional[Tuple[List[int], bool]]:
+    """Find the content container as find_content_container() does.
+
+    Returns the container's path below body (child element positions) and
+    whether a header is among its kept children, or None without a body.
+    Subtrees are freed as they close, except boilerplate (until its
+    outermost element closes) and header candidates whose text is measured.
+    """
+    stack: List[_Frame] = []
+    body: Optional[_Frame] = None
+    junk_depth = 0
+    measuring = 0
+    # Dropped boilerplate inside subtrees kept for measuring
+    skip: Set[Element] = set()
+
+    for event, element in iterparse_document(html_file_path, archive):
+        if body is None:
+            if event == 'start' and tag_name(element) == 'body':
+                body = _Frame(element, 0, chain=True, watched=False)
+                stack.append(body)
+            elif event == 'end':
+                free_element(element)
+            continue
+        if not stack:
+            # Past body; read on to the end, where the element limit is checked
+            continue
+
+        if event == 'start':
+            parent = stack[-1]
+            if junk_depth:
+                # Settled from the subtree once the outermost boilerplate closes
+                frame = _Frame(element, parent.children, chain=False, watched=False)
+            else:
+                frame = _Frame(element, parent.children,
+                               chain=parent.chain and parent.kept == 0, watched=parent.chain)
+            if frame.junk:
+                junk_depth += 1
+            if frame.measured:
+                measuring += 1
+            parent.children += 1
+            stack.append(frame)
+            continue
+
+        frame = stack.pop()
+        if not stack:
+            continue
+        parent = stack[-1]
+        if frame.measured:
+            measuring -= 1
+        dropped = False
+        if frame.junk:
+            junk_depth -= 1
+            if not junk_depth:
+                boilerplate = _find_boilerplate(element)
+                dropped = element in boilerplate
+                if not dropped:
+                    skip.update(boilerplate)
+                    if frame.chain:
+                        frame.fill(element, skip)
+        if junk_depth:
+            continue
+
+        if not dropped and parent.chain:
+            parent.kept += 1
+            if parent.first is None:
+                parent.first = frame
+            if (frame.watched and frame.measured is not False
+                    and is_generic_header(element, skip)):
+                parent.has_header = True
+        if parent.measured:
+            parent.length += _closed_text_length(element, dropped, skip)
+            if parent.length >= HEADER_TEXT_LIMIT:
+                parent.measured = False
+                measuring -= 1
+
+        if not measuring:
+            free_element(element)
+            skip.clear()
+        elif dropped:
+            skip.add(element)
+
+    if body is None:
+        return None
+    node, path = body, []
+    while node.kept == 1 and node.first is not None:
+        node = node.first
+        path.append(node.position)
+    return path, node.has_header
+
+
+def _stream_units(html_file_path: str, archive: Optional[EpubArchive] = None,
+                  skip: Optional[Set[Element]] = None) -> Iterator[Element]:
+    """Yield the elements get_content_children() picks, as they close.
+
+    Each element is freed once the consumer asks for the next one. Dropped
+    boilerplate inside a yielded element is added to ``skip`` (cleared with
+    the element).
+    """
+    layout = _scan_layout(html_file_path, archive)
+    if layout is None:
+        return
+    path, headed = layout
+    skip = skip if skip is not None else set()
+    # Per open element of body: [role, child elements seen, items yielded]
+    # with role 'path' (body down to the container), 'off' (beside the
+    # path), 'wrapper' (flattened child of the container), 'unit' or 'inside'
+    stack: List[List[Any]] = []
+    junk_depth = 0
+    finished = False
+
+    for event, element in iterparse_document(html_file_path, archive):
+        if not stack:
+            # Past body the document is read on to the end, where the
+            # element limit is checked
+            if event == 'start' and not finished and tag_name(element) == 'body':
+                stack.append(['path', 0, 0])
+            elif event == 'end':
+                free_element(element)
+            continue
+
+        if event == 'start':
+            parent = stack[-1]
+            position = parent[1]
+            parent[1] += 1
+            if parent[0] == 'path':
+                level = len(stack) - 1
+                if level < len(path):
+                    role = 'path' if position == path[level] else 'off'
+                elif not headed and tag_name(element) in WRAPPER_TAGS:
+                    role = 'wrapper'
+                else:
+                    role = 'unit'
+            elif parent[0] == 'wrapper':
+                role = 'unit'
+            elif parent[0] == 'off':
+                role = 'off'
+            else:
+                role = 'inside'
+            stack.append([role, 0, 0])
+            if role in ('unit', 'inside') and tag_name(element) in JUNK_TAGS:
+                junk_depth += 1
+            continue
+
+        role, _, yielded = stack.pop()
+        if role in ('unit', 'inside') and tag_name(element) in JUNK_TAGS:
+            junk_depth -= 1
+            if not junk_depth:
+                boilerplate = _find_boilerplate(element)
+                if element in boilerplate:
+                    # Left out, as by find_boilerplate(); a wrapper without
+                    # items may still need the text around it
+                    if role == 'inside' or (stack[-1][0] == 'wrapper' and not stack[-1][2]):
+                        skip.add(element)
+                    else:
+                        free_element(element)
+                    continue
+                skip.update(boilerplate)
+
+        if role == 'unit':
+            if stack[-1][0] == 'wrapper':
+                stack[-1][2] += 1
+            yield element
+            free_element(element)
+            skip.clear()
+        elif role == 'wrapper':
+            if not yielded and get_text(element, skip=skip).strip():
+                yield element
+            free_element(element)
+            skip.clear()
+        elif role != 'inside':
+            free_element(element)
+            finished = not stack
+
+
+def stream_content_sections(html_file_path: str,
+                            archive: Optional[EpubArchive] = None) -> Iterator[Dict[str, Any]]:
+    """Stream content sections grouped by headers from an XHTML file.
+
+    Yields the same section dicts as ``extract_content_sections``; each is
+    yielded as soon as the next header closes it. The file is read twice
+    (see the module docstring).
+    """
+    return (materialize_section(section)
+            for section in stream_compact_sections(html_file_path, archive))
+
+
+def stream_compact_sections(html_file_path: str,
+                            archive: Optional[EpubArchive] = None) -> Iterator[Dict[str, Any]]:
+    """``stream_content_sections`` with ContentBlock blocks."""
+    if not path_exists(html_file_path, archive):
+        return iter(())
+    skip: Set[Element] = set()
+    return group_sections(_stream_units(html_file_path, archive, skip), skip)
+
+
+class _AnchorCollector:
+    """Collects the blocks of one TOC boundary from a stream of events."""
+
+    def __init__(self, start_anchor: Optional[str], end_anchor: Optional[str],
+                 all_anchors: Set[str], include_html: bool):
+        self.start_anchor = start_anchor or None
+        self.end_anchor = end_anchor
+        self.all_anchors = all_anchors
+        self.include_html = include_html
+        self.blocks: List[Dict] = []
+        self.keywords: List[Dict[str, str]] = []
+        self.references: List[Dict[str, str]] = []
+        # 'body' (children of body), 'container' (children of the start
+        # element) or 'siblings' (start element and its following siblings)
+        self.mode: Optional[str] = None
+        self.done = False
+        self.parent_depth = -1
+        self.unit_depth: Optional[int] = None
+        self.unit_is_start = False
+        # Depth of the start element while index terms are collected under
+        # it, and of the outermost open link (kept whole until it closes)
+        self.terms_depth: Optional[int] = None
+        self.link_depth: Optional[int] = None
+
+    def begin(self, element: Element, depth: int) -> None:
+        """Start collecting at the anchor element (or at body without an anchor)."""
+        if self.start_anchor is None:
+            self.mode, self.parent_depth = 'body', depth
+            return
+        if element.get('id') == self.start_anchor:
+            self.terms_depth = depth
+        if is_content_container(element):
+            self.mode, self.parent_depth = 'container', depth
+        else:
+            self.mode, self.parent_depth = 'siblings', depth - 1
+            self.unit_depth, self.unit_is_start = depth, True
+
+    def _reached_end(self, element: Element, anchor_name: Optional[str]) -> bool:
+        element_id = element.get('id')
+        if self.end_anchor and self.end_anchor in (element_id, anchor_name):
+            return True
+        return bool(element_id and element_id in self.all_anchors)
+
+    def start(self, element: Element, depth: int, anchor_name: Optional[str]) -> None:
+        """Handle a start event; anchor_name is set if the element is its name's anchor."""
+        if (self.terms_depth is not None and self.link_depth is None
+                and tag_name(element) == 'a'):
+            self.link_depth = depth
+        if self.done:
+            return
+
+        if depth == self.parent_depth + 1:
+            if self.mode == 'container':
+                stop = element.get('id') in self.all_anchors
+            else:
+                stop = self._reached_end(element, anchor_name)
+            if stop:
+                self.finish()
+            else:
+                self.unit_depth, self.unit_is_start = depth, False
+        elif self.unit_depth is not None and not self.unit_is_start:
+            element_id = element.get('id')
+            if self.mode == 'container':
+                stop = element_id in self.all_anchors
+            elif self.mode == 'siblings':
+                stop = bool(self.end_anchor) and element_id == self.end_anchor
+            else:
+                stop = False
+            if stop:
+                self.finish()
+
+    def end(self, element: Element, depth: int) -> None:
+        if self.terms_depth is not None:
+            if depth == self.terms_depth:
+                self.terms_depth = None
+            elif tag_name(element) == 'a':
+                self.keywords.extend(collect_keywords([element]))
+                self.references.extend(collect_references([element]))
+                if depth == self.link_depth:
+                    self.link_depth = None
+
+        if depth == self.unit_depth:
+            block = extract_element(element, self.include_html)
+            if block is not None:
+                self.blocks.append(block)
+            self.unit_depth, self.unit_is_start = None, False
+
+        if depth == self.parent_depth:
+            self.finish()
+
+    def finish(self) -> None:
+        """Stop collecting blocks (index terms continue to the start element's end)."""
+        self.done = True
+        self.unit_depth = None
+
+    @property
+    def active(self) -> bool:
+        return self.mode is not None and (not self.done or self.terms_depth is not None)
+
+    @property
+    def holding(self) -> bool:
+        """Whether an open element must be kept whole until it closes."""
+        return self.unit_depth is not None or self.link_depth is not None
+
+    def result(self) -> AnchorSection:
+        return self.blocks, self.keywords, self.references
+
+
+def stream_sections_by_anchors(
+    html_file_path: str,
+    boundaries: List[Tuple[Optional[str], Optional[str]]],
+    all_anchors: Optional[Set[str]] = None,
+    include_html: bool = False,
+    archive: Optional[EpubArchive] = None
+) -> Optional[List[AnchorSection]]:
+    """Extract several TOC sections from one document in a single streaming pass.
+
+    ``boundaries`` are ``(start_anchor, end_anchor)`` pairs. Returns one
+    ``(blocks, keywords, references)`` tuple per boundary, in order, or
+    None if the file does not exist. Blocks match
+    ``extract_section_between_anchors``; keywords and references match the
+    index terms and cross-references found under the start anchor's element.
+    Parsing stops as soon as every boundary is complete.
+
+    An anchor is the first element with that id, else the first with that
+    name. A ``name`` met before any such ``id`` is taken as the anchor; if
+    the document turns out to have the ``id`` after all, its ids are read in
+    a second pass and the sections are extracted again.
+    """
+    if not path_exists(html_file_path, archive):
+        return None
+
+    all_anchors = all_anchors or set()
+    keys = {anchor for boundary in boundaries for anchor in boundary if anchor}
+    collectors, guessed = _collect_anchor_sections(
+        html_file_path, boundaries, all_anchors, keys, include_html, archive, None)
+    if guessed:
+        ids = _document_ids(html_file_path, archive, keys)
+        if guessed & ids:
+            collectors, _ = _collect_anchor_sections(
+                html_file_path, boundaries, all_anchors, keys, include_html, archive, ids)
+    if collectors is None:
+        return [([], [], []) for _ in boundaries]
+    return [collector.result() for collector in collectors]
+
+
+def _collect_anchor_sections(
+    html_file_path: str,
+    boundaries: List[Tuple[Optional[str], Optional[str]]],
+    all_anchors: Set[str],
+    keys: Set[str],
+    include_html: bool,
+    archive: Optional[EpubArchive],
+    ids: Optional[Set[str]]
+) -> Tuple[Optional[List[_AnchorCollector]], Set[str]]:
+    """One streaming pass over the boundaries of a document.
+
+    ``ids`` are the ``keys`` the document has as ids, when known. Returns
+    the collectors (None without a body) and the keys whose ``name`` was
+    taken as the anchor before it was known that no element has that id.
+    """
+    collectors = [_AnchorCollector(start, end, all_anchors, include_html)
+                  for start, end in boundaries]
+    waiting: Dict[Optional[str], List[_AnchorCollector]] = {}
+    for collector in collectors:
+        waiting.setdefault(collector.start_anchor, []).append(collector)
+
+    active: List[_AnchorCollector] = []
+    depth = -1
+    seen_body = False
+    ids_seen: Set[str] = set()
+    names_seen: Set[str] = set()
+    guessed: Set[str] = set()
+
+    for event, element in iterparse_document(html_file_path, archive):
+        if event == 'start':
+            depth += 1
+            element_id = element.get('id')
+            if element_id in keys:
+                ids_seen.add(element_id)
+            # A name is an anchor at its first element, if no element has it as id
+            anchor_name = element.get('name')
+            if anchor_name not in keys or anchor_name in names_seen:
+                anchor_name = None
+            else:
+                names_seen.add(anchor_name)
+                if ids is not None:
+                    if anchor_name in ids:
+                        anchor_name = None
+                elif anchor_name in ids_seen:
+                    anchor_name = None
+                else:
+                    guessed.add(anchor_name)
+
+            for collector in active:
+                collector.start(element, depth, anchor_name)
+
+            starting: List[_AnchorCollector] = []
+            if not seen_body and tag_name(element) == 'body':
+                seen_body = True
+                starting.extend(waiting.pop(None, []))
+            for key in (element_id, anchor_name):
+                if key is not None and key in waiting:
+                    starting.extend(waiting.pop(key))
+            for collector in starting:
+                collector.begin(element, depth)
+            active.extend(starting)
+        else:
+            for collector in active:
+                collector.end(element, depth)
+            if not any(c.holding for c in active):
+                free_element(element)
+            depth -= 1
+
+        if any(not c.active for c in active):
+            active = [c for c in active if c.active]
+            if not active and not waiting:
+                break
+
+    return (collectors if seen_body else None), guessed
+
+
+def _document_ids(html_file_path: str, archive: Optional[EpubArchive],
+                  keys: Set[str]) -> Set[str]:
+    """The keys that are the id of some element of the document."""
+    found: Set[str] = set()
+    for event, element in iterparse_document(html_file_path, archive):
+        if event == 'start':
+            element_id = element.get('id')
+            if element_id in keys:
+                found.add(element_id)
+        else:
+            free_element(element)
+    return found
+
+
+def stream_section_between_anchors(
+    html_file_path: str,
+    start_anchor: Optional[str],
+    end_anchor: Optional[str],
+    all_anchors: Optional[Set[str]] = None,
+    include_html: bool = False,
+    archive: Optional[EpubArchive] = None
+) -> List[Dict]:
+    """Streaming counterpart of ``extract_section_between_anchors`` for a file."""
+    results = stream_sections_by_anchors(
+        html_file_path, [(start_anchor, end_anchor)], all_anchors, include_html, archive)
+    return results[0][0] if results else []
@@ -6,18 +6,30 @@ Extracts content between TOC anchor boundaries for precise section splitting.
 import os
 from typing import List, Dict, Any, Set, Optional
 
-from bs4 import BeautifulSoup
 from pydantic import BaseModel, Field
 
 from ..models.structure import NavigationPoint
+from ..utils.profiling import count, operation
 from .content_extractor import discover_epub_images, resolve_and_validate_images
-from .element_extractors import collect_keywords, collect_references
+from .anchor_index import AnchorIndex
+from .backends import get_backend
+from .document_cache import DocumentCache
+from .epub_archive import EpubArchive
+from .parallel import ExtractionPool
+from .html_parser import parse_html_file
+from .streaming_extractor import AnchorSection, stream_sections_by_anchors
 from .section_builder import (
     SectionBoundary,
     build_section_boundaries,
     extract_section_between_anchors,
 )
 
+# Re-export for backwards compatibility
+__all__ = [
+    'SectionBoundary', 'build_section_boundaries', 'extract_section_between_anchors',
+    'ExtractedSection', 'extract_by_toc', 'extract_book_by_toc',
+]
+
 
 class ExtractedSection(BaseModel):
     """Content extracted for a single TOC section."""
@@ -29,75 +41,120 @@ class ExtractedSection(BaseModel):
     references: Optional[List[Dict[str, str]]] = None
 
 
+def _tree_section(backend: Any, document: Any, boundary: SectionBoundary,
+                  all_anchors: Set[str], include_html: bool,
+                  index: AnchorIndex) -> AnchorSection:
+    """Blocks, keywords and references for one boundary of a parsed document."""
+    content_blocks = backend.section_blocks(
+        document, boundary.start_anchor, boundary.end_anchor,
+        all_anchors, include_html, index
+    )
+
+    keywords: List[Dict[str, str]] = []
+    references: List[Dict[str, str]] = []
+    if boundary.start_anchor:
+        keywords, references = backend.anchor_terms(
+            document, boundary.start_anchor, index)
+
+    return content_blocks, keywords, references
+
+
+def extract_anchor_sections(
+    html_file_path: str,
+    boundaries: List[SectionBoundary],
+    all_anchors: Set[str],
+    include_html: bool = False,
+    archive: Optional[EpubArchive] = None,
+    documents: Optional[DocumentCache] = None
+) -> Optional[List[AnchorSection]]:
+    """Blocks, keywords and references for each boundary of one document.
+
+    With a document cache the cached tree and the cache's backend are used,
+    or, for documents the cache marks for streaming, a single streaming pass
+    over the file covers all boundaries. Returns None if the document
+    cannot be read.
+    """
+    if documents is not None and documents.streams(html_file_path):
+        documents.release(html_file_path)
+        return stream_sections_by_anchors(
+            html_file_path, [(b.start_anchor, b.end_anchor) for b in boundaries],
+            all_anchors, include_html, documents.archive)
+
+    if documents is not None:
+        backend = documents.backend
+        document = documents.get(html_file_path)
+        documents.release(html_file_path)
+    else:
+        backend = get_backend()
+        document = parse_html_file(html_file_path, archive)
+    if document is None:
+        return None
+
+    # One index per document serves every boundary lookup
+    tracked = all_anchors | {b.end_anchor for b in boundaries if b.end_anchor}
+    index = backend.anchor_index(document, tracked)
+    return [_tree_section(backend, document, boundary, all_anchors, include_html, index)
+            for boundary in boundaries]
+
+
 def extract_by_toc(
     html_file_path: str,
     boundaries: List[SectionBoundary],
     valid_images: Set[str],
     all_anchors: Optional[Set[str]] = None,
-    include_html: bool = False
+    include_html: bool = False,
+    archive: Optional[EpubArchive] = None,
+    documents: Optional[DocumentCache] = None
 ) -> List[ExtractedSection]:
     """Extract content from HTML file using TOC-defined boundaries."""
-    if not os.path.exists(html_file_path):
-        return []
+    if all_anchors is None:
+        all_anchors = {b.start_anchor for b in boundaries if b.start_anchor}
 
-    try:
-        with open(html_file_path, 'r', encoding='utf-8') as f:
-            try:
-                soup = BeautifulSoup(f, 'lxml-xml')
-            except Exception:
-                f.seek(0)
-                soup = BeautifulSoup(f, 'html.parser')
-    except Exception:
+    extracted = extract_anchor_sections(
+        html_file_path, boundaries, all_anchors, include_html, archive, documents)
+    if extracted is None:
         return []
+    return build_extracted_sections(html_file_path, boundaries, extracted, valid_images)
 
-    html_rel_dir = os.path.dirname(html_file_path)
 
-    if all_anchors is None:
-        all_anchors = {b.start_anchor for b in boundaries if b.start_anchor}
+def build_extracted_sections(
+    html_file_path: str,
+    boundaries: List[SectionBoundary],
+    extracted: List[AnchorSection],
+    valid_images: Set[str]
+) -> List[ExtractedSection]:
+    """Resolve block images and wrap each boundary's content in an ExtractedSection."""
+    html_rel_dir = os.path.dirname(html_file_path)
 
     sections: List[ExtractedSection] = []
 
-    for boundary in boundaries:
-        content_blocks = extract_section_between_anchors(
-            soup, boundary.start_anchor, boundary.end_anchor,
-            all_anchors, include_html
-        )
-
-        keywords: List[Dict[str, str]] = []
-        references: List[Dict[str, str]] = []
-        if boundary.start_anchor:
-            start_elem = soup.find(id=boundary.start_anchor)
-            if start_elem:
-                indexterms = start_elem.find_all(
-                    'a', attrs={'data-type': 'indexterm'})
-                keywords = collect_keywords(indexterms)
-                xrefs = start_elem.find_all('a', attrs={'data-type': 'xref'})
-                references = collect_references(xrefs)
-
+    for boundary, (content_blocks, keywords, references) in zip(boundaries, extracted):
         all_images: List[str] = []
         total_text = 0
 
-        for block in content_blocks:
-            block_images = block.get('images', [])
-            if block.get('src'):
-                block_images = [block['src']] + block_images
+        with operation('image_resolution'):
+            for block in content_blocks:
+                block_images = block.get('images', [])
+                if block.get('src'):
+                    block_images = [block['src']] + block_images
 
-            resolved_images = resolve_and_validate_images(
-                block_images, html_rel_dir, valid_images
-            )
+                resolved_images = resolve_and_validate_images(
+                    block_images, html_rel_dir, valid_images
+                )
 
-            if 'images' in block:
-                block['images'] = resolved_images
-            elif block.get('src') and resolved_images:
-                block['src'] = resolved_images[0]
+                if 'images' in block:
+                    block['images'] = resolved_images
+                elif block.get('src') and resolved_images:
+                    block['src'] = resolved_images[0]
 
-            all_images.extend(resolved_images)
-            total_text += len(block.get('text', ''))
+                all_images.extend(resolved_images)
+                total_text += len(block.get('text', ''))
+        count('blocks_emitted', len(content_blocks))
 
         sections.append(ExtractedSection(
             nav_point=boundary.nav_point,
             content_blocks=content_blocks,
-            images=list(set(all_images)),
+            images=list(dict.fromkeys(all_images)),
             text_length=total_text,
             keywords=keywords if keywords else None,
             references=references if references else None
@@ -109,19 +166,40 @@ def extract_by_toc(
 def extract_book_by_toc(
     epub_directory_path: str,
     nav_points: List[NavigationPoint],
-    include_html: bool = False
+    include_html: bool = False,
+    archive: Optional[EpubArchive] = None,
+    documents: Optional[DocumentCache] = None,
+    pool: Optional[ExtractionPool] = None
 ) -> Dict[str, List[ExtractedSection]]:
-    """Extract entire book content using TOC structure."""
-    valid_images = discover_epub_images(epub_directory_path)
+    """Extract entire book content using TOC structure.
+
+    With a pool the files are extracted in worker processes.
+    """
+    valid_images = discover_epub_images(epub_directory_path, archive)
     boundaries = build_section_boundaries(nav_points)
     all_anchors: Set[str] = {nav.anchor for nav in nav_points if nav.anchor}
 
     result: Dict[str, List[ExtractedSection]] = {}
 
+    if pool is not None:
+        jobs = [(os.path.join(epub_directory_path, file_path), file_boundaries)
+                for file_path, file_boundaries in boundaries.items()]
+        all_extracted = pool.anchor_sections(jobs, all_anchors, include_html)
+        for (full_path, file_boundaries), file_path, extracted in zip(
+                jobs, boundaries, all_extracted):
+            if extracted is None:
+                continue
+            sections = build_extracted_sections(
+                full_path, file_boundaries, extracted, valid_images)
+            if sections:
+                result[file_path] = sections
+        return result
+
     for file_path, file_boundaries in boundaries.items():
         full_path = os.path.join(epub_directory_path, file_path)
         sections = extract_by_toc(
-            full_path, file_boundaries, valid_images, all_anchors, include_html)
+            full_path, file_boundaries, valid_images, all_anchors, include_html,
+            archive, documents)
         if sections:
             result[file_path] = sections
 
@@ -2,9 +2,21 @@
 
 from .orchestrator import SimpleEpubProcessor, process_epub
 from .result import SimpleEpubResult
+from .result_cache import ResultCache
+from .batch import BatchStats, process_many
+from .aio import ProcessingCancelled, aprocess_epub, aprocess_many, asave_to_json
+from .server import EpubServer
 
 __all__ = [
     'SimpleEpubProcessor',
     'SimpleEpubResult',
-    'process_epub'
+    'process_epub',
+    'process_many',
+    'BatchStats',
+    'aprocess_epub',
+    'aprocess_many',
+    'asave_to_json',
+    'ProcessingCancelled',
+    'ResultCache',
+    'EpubServer'
 ]
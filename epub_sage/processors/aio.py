@@ -0,0 +1,140 @@
+"""Asyncio entry points for the processing pipeline.
+
+The pipeline itself is blocking, so every step that touches the disk or the
+CPU runs in an executor and the event loop only awaits it: the book ID hash,
+ZIP member reads and parsing (``aprocess_epub``) and JSON export
+(``asave_to_json``). Books go through ``SimpleEpubProcessor.process_epub``,
+so result caching, limits and chapter spilling apply as in synchronous
+code. With the default thread executor, cancelling the awaiting task (or a
+timeout) also stops the worker thread at its next member read. A
+ProcessPoolExecutor can only drop books that have not started yet.
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..extractors.epub_archive import archive_checkpoint
+from ..services.export_service import save_to_json
+from .orchestrator import SimpleEpubProcessor
+from .result import SimpleEpubResult, create_error_result
+
+
+class ProcessingCancelled(BaseException):
+    """Raised inside a worker thread once its awaiting task is cancelled.
+
+    Like ``asyncio.CancelledError`` it is not an Exception, so the per-stage
+    error handling of the pipeline does not turn it into a partial result
+    (which the result cache could then store).
+    """
+
+
+def _process_in_thread(processor: SimpleEpubProcessor, epub_path: str, include_html: bool,
+                       cancelled: threading.Event) -> SimpleEpubResult:
+    def checkpoint() -> None:
+        if cancelled.is_set():
+            raise ProcessingCancelled(epub_path)
+
+    with archive_checkpoint(checkpoint):
+        return processor.process_epub(epub_path, include_html=include_html)
+
+
+def _process_in_process(epub_path: str, include_html: bool,
+                        options: Dict[str, Any]) -> SimpleEpubResult:
+    return SimpleEpubProcessor(**options).process_epub(epub_path, include_html=include_html)
+
+
+async def aprocess_epub(epub_path: str, include_html: bool = False, *,
+                        executor: Optional[Executor] = None,
+                        timeout: Optional[float] = None,
+                        semaphore: Optional[asyncio.Semaphore] = None,
+                        processor: Optional[SimpleEpubProcessor] = None,
+                        **processor_options: Any) -> SimpleEpubResult:
+    """Process an EPUB file without blocking the event loop.
+
+    Work runs in ``executor`` (the loop's default thread pool when None).
+    ``timeout`` bounds the processing time and raises ``asyncio.TimeoutError``;
+    time spent waiting for ``semaphore`` is not counted. ``processor`` reuses
+    a processor in threads; otherwise one is built from ``processor_options``.
+    """
+    if semaphore is not None:
+        async with semaphore:
+            return await aprocess_epub(epub_path, include_html, executor=executor,
+                                       timeout=timeout, processor=processor,
+                                       **processor_options)
+
+    loop = asyncio.get_running_loop()
+    cancelled = threading.Event()
+    if isinstance(executor, ProcessPoolExecutor):
+        call = functools.partial(_process_in_process, epub_path, include_html, processor_options)
+    else:
+        processor = processor or SimpleEpubProcessor(**processor_options)
+        call = functools.partial(_process_in_thread, processor, epub_path, include_html, cancelled)
+
+    try:
+        return await asyncio.wait_for(loop.run_in_executor(executor, call), timeout)
+    except BaseException:
+        cancelled.set()
+        raise
+
+
+async def aprocess_many(paths: Iterable[str], concurrency: int = 4,
+                        include_html: bool = False, *,
+                        executor: Optional[Executor] = None,
+                        timeout: Optional[float] = None,
+                        semaphore: Optional[asyncio.Semaphore] = None,
+                        **processor_options: Any) -> AsyncIterator[Tuple[str, SimpleEpubResult]]:
+    """Process EPUB files concurrently, yielding ``(path, result)`` as each completes.
+
+    At most ``concurrency`` books are scheduled at once, and ``semaphore``
+    (shared with other calls, if given) further limits how many run. A book
+    that exceeds ``timeout`` gets an error result. Closing the iterator or
+    cancelling its consumer cancels the books in flight.
+    """
+    semaphore = semaphore or asyncio.Semaphore(concurrency)
+    idle: List[SimpleEpubProcessor] = []
+    pending: Set['asyncio.Task[Tuple[str, SimpleEpubResult]]'] = set()
+    remaining = iter(paths)
+
+    async def run(path: str) -> Tuple[str, SimpleEpubResult]:
+        processor = None
+        if not isinstance(executor, ProcessPoolExecutor):
+            processor = idle.pop() if idle else SimpleEpubProcessor(**processor_options)
+        try:
+            result = await aprocess_epub(path, include_html, executor=executor, timeout=timeout,
+                                         semaphore=semaphore, processor=processor,
+                                         **processor_options)
+        except asyncio.TimeoutError:
+            # The worker thread may still be using the processor, so it is not reused
+            return path, create_error_result(f"Processing timed out after {timeout}s", {})
+        except Exception as e:
+            return path, create_error_result(f"Critical error: {str(e)}", {})
+        # Processors hold per-book parser state; only a finished one is reused
+        if processor is not None:
+            idle.append(processor)
+        return path, result
+
+    try:
+        while True:
+            for path in remaining:
+                pending.add(asyncio.ensure_future(run(path)))
+                if len(pending) >= concurrency:
+                    break
+            if not pending:
+                break
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def asave_to_json(data: Any, output_file: str, indent: Optional[int] = 2,
+                        executor: Optional[Executor] = None) -> None:
+    """``save_to_json`` run in an executor."""
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(executor, save_to_json, data, output_file, indent)
@@ -0,0 +1,183 @@
+"""Batch processing of many EPUB files with warm worker processes.
+
+``process_many`` keeps one SimpleEpubProcessor per worker process for the
+whole batch and yields ``(path, result)`` pairs as books finish. A book that
+raises gets an error result. A book that kills its worker (segfault, OOM
+kill) is retried alone on a fresh pool, and gets an error result if it
+crashes again, so one bad file never takes other books down with it.
+"""
+
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Deque, Dict, Iterable, Iterator, Optional, Tuple
+
+from ..extractors.parallel import process_context
+from .orchestrator import SimpleEpubProcessor
+from .result import SimpleEpubResult, create_error_result
+
+# Default cap on the summed file size of books being processed at once
+DEFAULT_IN_FLIGHT_MB = 512
+
+# Processor reused by every book handled in this worker process
+_worker_processor: Dict[str, SimpleEpubProcessor] = {}
+
+
+class BatchStats:
+    """Running totals and throughput for a process_many() batch."""
+
+    def __init__(self):
+        self.books = 0
+        self.failed = 0
+        self.bytes = 0
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def record(self, size: int, success: bool) -> None:
+        """Count one finished book."""
+        self.books += 1
+        self.failed += 0 if success else 1
+        self.bytes += size
+        self.elapsed = time.perf_counter() - self.started
+
+    @property
+    def books_per_second(self) -> float:
+        return self.books / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def mb_per_second(self) -> float:
+        return self.bytes / (1024 * 1024) / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'books': self.books,
+            'failed': self.failed,
+            'total_mb': round(self.bytes / (1024 * 1024), 2),
+            'elapsed_seconds': round(self.elapsed, 3),
+            'books_per_second': round(self.books_per_second, 2),
+            'mb_per_second': round(self.mb_per_second, 2),
+        }
+
+
+def _init_worker(options: Dict[str, Any]) -> None:
+    _worker_processor['processor'] = SimpleEpubProcessor(**options)
+
+
+def _run_book(processor: SimpleEpubProcessor, path: str, include_html: bool) -> SimpleEpubResult:
+    try:
+        return processor.process_epub(path, include_html=include_html)
+    except Exception as e:
+        return create_error_result(f"Critical error: {str(e)}", {})
+
+
+def _process_job(path: str, include_html: bool) -> SimpleEpubResult:
+    return _run_book(_worker_processor['processor'], path, include_html)
+
+
+def _file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def process_many(paths: Iterable[str], workers: Optional[int] = None,
+                 include_html: bool = False,
+                 max_in_flight_mb: float = DEFAULT_IN_FLIGHT_MB,
+                 stats: Optional[BatchStats] = None,
+                 **processor_options: Any) -> Iterator[Tuple[str, SimpleEpubResult]]:
+    """Process EPUB files, yielding ``(path, result)`` as each book completes.
+
+    ``workers`` defaults to the CPU count; with 1 books are processed in
+    order in this process. Paths are consumed lazily, and new books are
+    only started while the books in flight total less than
+    ``max_in_flight_mb`` on disk (one book is always allowed). Pass a
+    ``BatchStats`` to follow progress and throughput. Remaining keyword
+    arguments go to ``SimpleEpubProcessor``; each book uses a single process.
+    """
+    stats = stats if stats is not None else BatchStats()
+    workers = workers or os.cpu_count() or 1
+    options = dict(processor_options, workers=1)
+
+    if workers <= 1:
+        processor = SimpleEpubProcessor(**options)
+        for path in paths:
+            result = _run_book(processor, path, include_html)
+            stats.record(_file_size(path), result.success)
+            yield path, result
+        return
+
+    yield from _process_pooled(iter(paths), workers, include_html,
+                               max_in_flight_mb * 1024 * 1024, stats, options)
+
+
+def _process_pooled(paths: Iterator[str], workers: int, include_html: bool,
+                    budget: float, stats: BatchStats,
+                    options: Dict[str, Any]) -> Iterator[Tuple[str, SimpleEpubResult]]:
+    def new_executor() -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=workers, mp_context=process_context(),
+                                   initializer=_init_worker, initargs=(options,))
+
+    executor = new_executor()
+    # future -> (path, size, running alone)
+    in_flight: Dict[Future, Tuple[str, int, bool]] = {}
+    # Books whose worker crashed while other books were running
+    suspects: Deque[Tuple[str, int]] = deque()
+    upcoming: Optional[Tuple[str, int]] = None
+    in_flight_bytes = 0
+
+    def submit(path: str, size: int, alone: bool) -> None:
+        nonlocal in_flight_bytes
+        in_flight[executor.submit(_process_job, path, include_html)] = (path, size, alone)
+        in_flight_bytes += size
+
+    try:
+        while True:
+            if suspects:
+                # Suspects run one at a time, so a second crash is their own
+                if not in_flight:
+                    submit(*suspects.popleft(), alone=True)
+            else:
+                while len(in_flight) < workers * 2:
+                    if upcoming is None:
+                        path = next(paths, None)
+                        if path is None:
+                            break
+                        upcoming = (path, _file_size(path))
+                    if in_flight and in_flight_bytes + upcoming[1] > budget:
+                        break
+                    submit(*upcoming, alone=False)
+                    upcoming = None
+            if not in_flight:
+                break
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            crashed = False
+            for future in done:
+                path, size, alone = in_flight.pop(future)
+                in_flight_bytes -= size
+                try:
+                    result = future.result()
+                except BrokenProcessPool:
+                    crashed = True
+                    if not alone:
+                        suspects.append((path, size))
+                        continue
+                    result = create_error_result(
+                        f"Worker process crashed while processing {os.path.basename(path)}", {})
+                except Exception as e:
+                    result = create_error_result(f"Critical error: {str(e)}", {})
+                stats.record(size, result.success)
+                yield path, result
+
+            if crashed:
+                # Every other book on the broken pool is lost too
+                suspects.extend((path, size) for path, size, _ in in_flight.values())
+                in_flight.clear()
+                in_flight_bytes = 0
+                executor.shutdown(wait=False, cancel_futures=True)
+                executor = new_executor()
+    finally:
+        executor.shutdown(cancel_futures=True)
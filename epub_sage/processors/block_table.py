@@ -0,0 +1,43 @@
+"""Book-level block table.
+
+With ``SimpleEpubProcessor(block_table=True)`` the content blocks of every
+chapter and section are moved, in reading order, into one list on the
+result (``SimpleEpubResult.blocks``). Each chapter and section keeps a
+``content_range`` of ``[start, end)`` indices into it in place of its
+``content`` list, so each block is stored once and the JSON export no longer
+repeats deeply indented block lists per section.
+"""
+
+from typing import Any, Dict, List
+
+
+class BlockTable:
+    """Collects blocks and hands out the index range of each list added."""
+
+    def __init__(self):
+        self.blocks: List[Dict[str, Any]] = []
+
+    def add(self, blocks: List[Dict[str, Any]]) -> List[int]:
+        start = len(self.blocks)
+        self.blocks.extend(blocks)
+        return [start, len(self.blocks)]
+
+    def index_chapter(self, chapter: Dict[str, Any]) -> None:
+        """Replace the chapter's and its sections' content with ranges, in place."""
+        if 'content' in chapter:
+            _replace_content(chapter, self.add(chapter['content']))
+        for section in chapter.get('sections', []):
+            self._index_section(section)
+
+    def _index_section(self, section: Dict[str, Any]) -> None:
+        _replace_content(section, self.add(section.get('content', [])))
+        for subsection in section.get('subsections', []):
+            self._index_section(subsection)
+
+
+def _replace_content(item: Dict[str, Any], content_range: List[int]) -> None:
+    """Swap 'content' for 'content_range', keeping the key's position."""
+    fields = [(('content_range', content_range) if key == 'content' else (key, value))
+              for key, value in item.items()]
+    item.clear()
+    item.update(fields)
@@ -0,0 +1,137 @@
+"""Spill-to-disk storage for chapter bodies.
+
+With ``SimpleEpubProcessor(spill_chapters=True)`` each chapter's ``content``
+and ``sections`` are written to an append-only temp file (one JSON line
+each) as soon as the chapter is built. The chapter dict keeps SpilledList
+handles that read the line back on access, so only the chapter being built
+is held in memory however long the book is.
+"""
+
+import json
+import tempfile
+import threading
+from collections.abc import Sequence
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from pydantic_core import SchemaSerializer, core_schema
+
+# Chapter keys whose values are spilled
+SPILLED_KEYS = ('content', 'sections')
+
+
+class ChapterStore:
+    """Append-only temp file of JSON records, deleted on close().
+
+    A store that is never closed keeps its file descriptor until it is
+    garbage collected; long-running processes should close it (or use it as
+    a context manager) once its handles are no longer needed.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self._file = tempfile.TemporaryFile(prefix='epub-sage-chapters-', dir=directory)
+        self._lock = threading.Lock()
+        self._end = 0
+        # Most recently read record, so indexing a handle in a loop reads once
+        self._last: Tuple[int, Optional[List[Any]]] = (-1, None)
+        self.bytes_written = 0
+
+    def append(self, items: List[Any]) -> 'SpilledList':
+        """Write a list and return a handle that loads it lazily."""
+        data = json.dumps(items, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        with self._lock:
+            offset = self._end
+            self._file.seek(offset)
+            self._file.write(data + b'\n')
+            self._end += len(data) + 1
+            self.bytes_written += len(data) + 1
+        return SpilledList(self, offset, len(data), len(items))
+
+    def __enter__(self) -> 'ChapterStore':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    def spill(self, chapter: Dict[str, Any]) -> Dict[str, Any]:
+        """Replace the non-empty bodies of a finished chapter with handles, in place."""
+        for key in SPILLED_KEYS:
+            value = chapter.get(key)
+            if value and not isinstance(value, SpilledList):
+                chapter[key] = self.append(value)
+        return chapter
+
+    def read(self, offset: int, size: int) -> List[Any]:
+        with self._lock:
+            if self._file.closed:
+                raise ValueError("ChapterStore is closed")
+            if self._last[0] == offset and self._last[1] is not None:
+                return self._last[1]
+            self._file.flush()
+            self._file.seek(offset)
+            items = json.loads(self._file.read(size))
+            self._last = (offset, items)
+        return items
+
+    def close(self) -> None:
+        """Delete the file; handles can no longer be read."""
+        with self._lock:
+            self._file.close()
+            self._last = (-1, None)
+
+
+class SpilledList(Sequence):
+    """Read-only list stored in a ChapterStore, loaded on access.
+
+    ``len()`` needs no read. Iteration and indexing read the record back
+    (the last record read is kept); ``load()`` returns a plain list copy.
+    Pydantic dumps, ``save_to_json`` and pickling turn it into a list.
+    """
+
+    __slots__ = ('_store', '_offset', '_size', '_length')
+
+    def __init__(self, store: ChapterStore, offset: int, size: int, length: int):
+        self._store = store
+        self._offset = offset
+        self._size = size
+        self._length = length
+
+    def load(self) -> List[Any]:
+        """Stored items as a new list."""
+        return list(self._items())
+
+    def _items(self) -> List[Any]:
+        return self._store.read(self._offset, self._size)
+
+    def close(self) -> None:
+        """Close the store this list belongs to (every handle of the book)."""
+        self._store.close()
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):  # type: ignore[override]
+        return self._items()[index]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._items())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SpilledList):
+            other = other._items()
+        return isinstance(other, list) and self._items() == other
+
+    def __reduce__(self):
+        return list, (self.load(),)
+
+    def __repr__(self) -> str:
+        return f"SpilledList(<{self._length} items>)"
+
+
+# Serialized as the stored list wherever pydantic meets one (chapters are Dict[str, Any])
+SpilledList.__pydantic_serializer__ = SchemaSerializer(  # type: ignore[attr-defined]
+    core_schema.any_schema(serialization=core_schema.plain_serializer_function_ser_schema(
+        SpilledList.load, when_used='always')))
@@ -0,0 +1,302 @@
+"""Chapter-at-a-time processing for very large books.
+
+``SimpleEpubProcessor.process_epub`` extracts the content and TOC sections
+of every file before it builds any chapter, so the whole book is held in
+memory at once. A ChapterStream builds the same chapter dicts one at a
+time, in spine order: it extracts a file's content and TOC sections only
+when its chapter is built, and drops them once the chapter is yielded.
+Metadata and totals are available afterwards as ``summary``.
+"""
+
+import os
+from contextlib import ExitStack
+from typing import (
+    TYPE_CHECKING, Any, Dict, Generator, Iterable, Iterator, List, Optional, Set, Tuple,
+)
+
+from ..extractors.content_extractor import (
+    compact_content_sections, list_html_files, resolve_section_images,
+)
+from ..extractors.document_cache import DocumentCache
+from ..extractors.epub_archive import EpubArchive
+from ..extractors.image_resolver import discover_epub_images
+from ..extractors.toc_content_extractor import (
+    ExtractedSection, build_section_boundaries, extract_by_toc,
+)
+from .content_consolidator import (
+    build_fallback_chapter, build_non_spine_chapter, build_spine_chapter,
+    finalize_chapter, spine_hrefs,
+)
+from .helpers import (
+    build_nested_section, calculate_reading_time, calculate_section_stats,
+    navigation_by_file,
+)
+from ..utils.limits import Budget, active_budget
+from ..utils.profiling import Profiler, active_profiler, stage
+from .result import (
+    SimpleEpubResult, create_error_result, create_limit_error_result, create_success_result,
+)
+from .stages import STAGE_CONTENT, STAGE_METADATA, STAGE_SECTIONS, STAGE_STRUCTURE
+
+if TYPE_CHECKING:
+    from .orchestrator import SimpleEpubProcessor
+
+
+class _TocSections:
+    """Builds chapter sections, extracting each file's TOC sections on first use."""
+
+    def __init__(self, structure: Any, structure_parser: Any, root: str,
+                 valid_images: Set[str], include_html: bool,
+                 archive: Optional[EpubArchive], documents: DocumentCache):
+        nav_points = structure_parser.toc_parser.flatten_navigation_tree(
+            structure.navigation_tree)
+        self.boundaries = build_section_boundaries(nav_points)
+        self.all_anchors = {nav.anchor for nav in nav_points if nav.anchor}
+        self.file_of = {boundary.nav_point.id: file_path
+                        for file_path, file_boundaries in self.boundaries.items()
+                        for boundary in file_boundaries}
+        self.nav_by_file = navigation_by_file(structure.navigation_tree)
+        self.flatten = structure_parser.toc_parser.flatten_navigation_tree
+        self.root = root
+        self.valid_images = valid_images
+        self.include_html = include_html
+        self.archive = archive
+        self.documents = documents
+        self.extracted_files: Set[str] = set()
+        self.lookup: Dict[str, ExtractedSection] = {}
+
+    def sections_for(self, href: str) -> List[Dict[str, Any]]:
+        """Nested sections of the chapter at href (same as enrich_with_sections)."""
+        top_level_navs = self.nav_by_file.get(href, [])
+        nav_ids = [nav.id for nav in self.flatten(top_level_navs)]
+
+        needed = {self.file_of[nav_id] for nav_id in nav_ids if nav_id in self.file_of}
+        for file_path, file_boundaries in self.boundaries.items():
+            if file_path not in needed or file_path in self.extracted_files:
+                continue
+            self.extracted_files.add(file_path)
+            for section in extract_by_toc(
+                    os.path.join(self.root, file_path), file_boundaries, self.valid_images,
+                    self.all_anchors, self.include_html, self.archive, self.documents):
+                self.lookup[section.nav_point.id] = section
+
+        sections = [build_nested_section(nav, self.lookup) for nav in top_level_navs]
+        for nav_id in nav_ids:
+            self.lookup.pop(nav_id, None)
+        return sections
+
+
+class ChapterStream:
+    """Iterator over the finished chapter dicts of a book, in spine order.
+
+    Chapters match those of ``process_epub``. ``summary`` is None until the
+    stream is exhausted, then holds a SimpleEpubResult with the metadata and
+    totals but no chapters. Processing errors end the stream early and are
+    reported in ``summary``, as ``process_epub`` reports them in its result.
+
+    ``hrefs`` (EPUB-root- or OPF-relative) and ``spine_range`` (a
+    ``(start, end)`` slice of the spine) limit the stream to those files;
+    other content files are never read, and totals cover the selection.
+    Untitled selected chapters are numbered by spine position.
+
+    With ``profile=True`` on the processor, ``summary.timings`` holds the
+    stage timings of the whole stream (time between chapters excluded).
+    With ``limits``, a breached limit ends the stream and ``summary`` is the
+    structured error; the timeout counts from when the stream is created.
+    """
+
+    def __init__(self, processor: 'SimpleEpubProcessor', epub_path: str,
+                 include_html: bool = False, hrefs: Optional[Iterable[str]] = None,
+                 spine_range: Optional[Tuple[Optional[int], Optional[int]]] = None):
+        self.processor = processor
+        self.epub_path = epub_path
+        self.include_html = include_html
+        self.hrefs = [href.split('#')[0] for href in hrefs] if hrefs is not None else None
+        self.spine_range = spine_range
+        self.summary: Optional[SimpleEpubResult] = None
+        self._profiler = (Profiler() if processor.profile and active_profiler() is None
+                          else None)
+        self._budget = (Budget(processor.limits)
+                        if processor.limits is not None and active_budget() is None else None)
+        self._chapters = self._generate()
+
+    def __iter__(self) -> 'ChapterStream':
+        return self
+
+    def __next__(self) -> Dict[str, Any]:
+        if self._profiler is None and self._budget is None:
+            return next(self._chapters)
+        with ExitStack() as contexts:
+            if self._budget is not None:
+                contexts.enter_context(self._budget.activate())
+            if self._profiler is not None:
+                contexts.enter_context(self._profiler.activate())
+            try:
+                return next(self._chapters)
+            except StopIteration:
+                self._finish_summary()
+                raise
+
+    def _finish_summary(self) -> None:
+        if self.summary is None:
+            return
+        if self._budget is not None and self._budget.exceeded is not None:
+            self.summary = create_limit_error_result(self._budget.exceeded)
+        if self._profiler is not None:
+            self.summary.timings = self._profiler.to_dict()
+
+    def __enter__(self) -> 'ChapterStream':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop early and close the EPUB file."""
+        self._chapters.close()
+
+    def _generate(self) -> Generator[Dict[str, Any], None, None]:
+        extractor = self.processor.extractor
+        with stage('open'):
+            epub_info = extractor.get_epub_info(self.epub_path)
+        if not epub_info.get('success'):
+            self.summary = create_error_result(
+                epub_info.get('error', 'Failed to read EPUB'), epub_info)
+            return
+        try:
+            with stage('open'):
+                archive = extractor.open_archive(self.epub_path)
+        except Exception as e:
+            self.summary = create_error_result(f"Failed to open archive: {str(e)}", epub_info)
+            return
+        with archive:
+            try:
+                yield from self._build(archive, epub_info)
+            except Exception as e:
+                self.summary = create_error_result(f"Processing failed: {str(e)}", {})
+
+    def _build(self, archive: EpubArchive, epub_info: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        processor = self.processor
+        root = archive.root
+        errors: List[str] = []
+        book_id, total_files, total_size_mb = processor._get_file_info(
+            root, epub_info.get('book_id'), epub_info, archive)
+        stages = processor.stages
+        documents = DocumentCache(root, archive, max_bytes=processor.document_cache_bytes,
+                                  consumers=2 if STAGE_SECTIONS in stages else 1,
+                                  backend=processor.backend,
+                                  stream_threshold=processor.stream_threshold)
+
+        content_opf_path, parsed_opf, metadata = None, None, None
+        if STAGE_METADATA in stages:
+            with stage(STAGE_METADATA):
+                content_opf_path = processor.extractor.find_content_opf(root, archive)
+                parsed_opf, metadata, errors = processor._parse_metadata(
+                    content_opf_path, errors, archive)
+        structure, structure_map = None, {}
+        if STAGE_STRUCTURE in stages:
+            # Structure only needs book content to associate images, which
+            # chapters do not use; skip it rather than extracting everything up front
+            with stage(STAGE_STRUCTURE):
+                structure, structure_map = processor._parse_structure(
+                    parsed_opf, root, errors, archive, {})
+
+        valid_images = discover_epub_images(root, archive)
+        html_files: Dict[str, str] = {}
+        if STAGE_CONTENT in stages:
+            html_files = {os.path.relpath(path, root).replace('\\', '/'): path
+                          for path in list_html_files(root, archive)}
+        toc = None
+        if STAGE_SECTIONS in stages and structure and structure.navigation_tree:
+            toc = _TocSections(structure, processor.structure_parser, root, valid_images,
+                               self.include_html, archive, documents)
+
+        def content_for(href: str) -> Optional[List[Dict[str, Any]]]:
+            path = html_files.get(href)
+            if path is None:
+                return None
+            with stage(STAGE_CONTENT):
+                sections = compact_content_sections(path, archive, documents)
+                documents.release(path)
+                if not sections:
+                    return None
+                resolve_section_images(sections, href, valid_images)
+            return sections
+
+        total_words = total_sections = max_section_depth = chapter_index = 0
+        processed: Set[str] = set()
+
+        # (href, kind, chapter index or None to count): spine items first,
+        # then the remaining files
+        def candidates() -> Iterator[Tuple[str, str, Optional[int]]]:
+            order = list(spine_hrefs(parsed_opf, root)) if parsed_opf else list(html_files)
+            kind = 'spine' if parsed_opf else 'fallback'
+            if self.hrefs is None and self.spine_range is None:
+                yield from ((href, kind, None) for href in order)
+                if parsed_opf:
+                    yield from ((href, 'extra', None) for href in html_files)
+                return
+
+            wanted = set(self.hrefs or ())
+            if parsed_opf:
+                wanted.update(parsed_opf.resolve_href(href, root) for href in self.hrefs or ())
+            in_range: Set[int] = set()
+            if self.spine_range is not None:
+                in_range = set(range(len(order))[slice(*self.spine_range)])
+            for position, href in enumerate(order):
+                if position in in_range or href in wanted:
+                    yield href, kind, position
+            for position, href in enumerate(html_files, len(order)):
+                if href in wanted and href not in order:
+                    yield href, 'extra', position
+
+        try:
+            for href, kind, position in candidates():
+                if href in processed:
+                    continue
+                processed.add(href)
+                sections = content_for(href)
+                if sections is None:
+                    continue
+                index = chapter_index if position is None else position
+
+                with stage('chapters'):
+                    if kind == 'fallback':
+                        chapter, words = build_fallback_chapter(href, sections, index)
+                    elif kind == 'spine':
+                        chapter, words = build_spine_chapter(
+                            href, sections, structure_map.get(href), index)
+                    else:
+                        chapter, words = build_non_spine_chapter(
+                            href, sections, structure_map.get(href), index)
+                del sections
+
+                with stage(STAGE_SECTIONS):
+                    chapter['sections'] = toc.sections_for(href) if toc else []
+                with stage('finalize'):
+                    finalize_chapter(chapter)
+                    documents.discard(html_files[href])
+
+                count, depth = calculate_section_stats([chapter])
+                total_words += words
+                total_sections += count
+                max_section_depth = max(max_section_depth, depth)
+                chapter_index += 1
+                yield chapter
+        finally:
+            documents.clear()
+
+        missing = [href for href in self.hrefs or () if href not in processed and not (
+            parsed_opf and parsed_opf.resolve_href(href, root) in processed)]
+        if missing:
+            errors.append(f"Requested files not found: {', '.join(missing)}")
+        if not chapter_index and STAGE_CONTENT in stages:
+            errors.append("No content could be extracted from HTML files")
+        self.summary = create_success_result(
+            metadata, [], total_words, calculate_reading_time(total_words), book_id,
+            root, content_opf_path, errors, total_files, total_size_mb,
+            total_sections, max_section_depth, chapter_index > 0
+        )
+        self.summary.total_chapters = chapter_index
+        if not chapter_index and (self.hrefs is not None or self.spine_range is not None):
+            self.summary.success = False
@@ -1,8 +1,9 @@
 """Content consolidation logic for chapter building."""
 
 import os
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 
+from ..extractors.blocks import materialize_blocks
 from .helpers import get_chapter_id, get_best_title, format_part_roman
 
 
@@ -62,6 +63,78 @@ def build_chapter_dict(
     }
 
 
+def spine_hrefs(parsed_opf, extracted_dir: str) -> Iterator[str]:
+    """Yield resolved hrefs of the spine items, in spine order."""
+    manifest_map = {item['id']: item['href']
+                    for item in parsed_opf.manifest_items}
+
+    for idref in parsed_opf.spine_items:
+        raw_href = manifest_map.get(idref)
+        if raw_href:
+            yield parsed_opf.resolve_href(raw_href, extracted_dir)
+
+
+def build_spine_chapter(href: str, sections: List[Dict], struct_item: Optional[Any],
+                        chapter_index: int) -> Tuple[Dict[str, Any], int]:
+    """Build the chapter dict for a spine item; returns it with its word count."""
+    content, images, main_title = consolidate_sections(sections)
+
+    chapter_text = ' '.join([item['text'] for item in content])
+    word_count = len(chapter_text.split())
+
+    chapter_dict = build_chapter_dict(
+        href, content, struct_item, main_title, chapter_index)
+    chapter_dict['image_count'] = len(images)
+    return chapter_dict, word_count
+
+
+def build_non_spine_chapter(href: str, sections: List[Dict], struct_item: Optional[Any],
+                            chapter_index: int) -> Tuple[Dict[str, Any], int]:
+    """Build the chapter dict for content not in the spine, with its word count."""
+    content, images, main_title = consolidate_sections(sections)
+
+    chapter_text = ' '.join([item['text'] for item in content])
+    word_count = len(chapter_text.split())
+
+    fallback_title = f'Extra: {os.path.basename(href)}'
+    struct_title = struct_item.title if struct_item else None
+    best_title = get_best_title(struct_title, main_title, fallback_title)
+
+    chapter_dict = build_chapter_dict(
+        href, content, struct_item, main_title, chapter_index, 'other')
+    chapter_dict['title'] = best_title
+    chapter_dict['image_count'] = len(images)
+    chapter_dict['linear'] = struct_item.linear if struct_item else False
+    return chapter_dict, word_count
+
+
+def build_fallback_chapter(href: str, sections: List[Dict],
+                           chapter_index: int) -> Tuple[Dict[str, Any], int]:
+    """Build the chapter dict for a file when no OPF is available, with its word count."""
+    content, images, main_title = consolidate_sections(sections)
+
+    chapter_text = ' '.join([item['text'] for item in content])
+    word_count = len(chapter_text.split())
+
+    char_count = sum(len(item['text']) for item in content)
+    reading_minutes = max(1, word_count // 250)
+
+    return {
+        'id': get_chapter_id(href),
+        'title': main_title or f'Section {chapter_index + 1}',
+        'href': href,
+        'type': 'chapter',
+        'chapter_number': chapter_index + 1,
+        'part': None,
+        'word_count': word_count,
+        'char_count': char_count,
+        'reading_minutes': reading_minutes,
+        'image_count': len(images),
+        'linear': True,
+        '_temp_content': content,
+    }, word_count
+
+
 def process_spine_items(parsed_opf, all_content: Dict, structure_map: Dict, extracted_dir: str) -> tuple:
     """Process content in spine order."""
     chapters = []
@@ -69,30 +142,14 @@ def process_spine_items(parsed_opf, all_content: Dict, structure_map: Dict, extr
     processed_hrefs = set()
     chapter_index = 0
 
-    manifest_map = {item['id']: item['href']
-                    for item in parsed_opf.manifest_items}
-
-    for idref in parsed_opf.spine_items:
-        raw_href = manifest_map.get(idref)
-        if not raw_href:
-            continue
-
-        href = parsed_opf.resolve_href(raw_href, extracted_dir)
+    for href in spine_hrefs(parsed_opf, extracted_dir):
         if href not in all_content or href in processed_hrefs:
             continue
 
-        sections = all_content[href]
-        content, images, main_title = consolidate_sections(sections)
-
-        chapter_text = ' '.join([item['text'] for item in content])
-        word_count = len(chapter_text.split())
+        chapter_dict, word_count = build_spine_chapter(
+            href, all_content[href], structure_map.get(href), chapter_index)
         total_words += word_count
 
-        struct_item = structure_map.get(href)
-        chapter_dict = build_chapter_dict(
-            href, content, struct_item, main_title, chapter_index)
-        chapter_dict['image_count'] = len(images)
-
         chapters.append(chapter_dict)
         chapter_index += 1
         processed_hrefs.add(href)
@@ -110,23 +167,10 @@ def process_non_spine_items(all_content: Dict, processed_hrefs: set, structure_m
         if href in processed_hrefs:
             continue
 
-        content, images, main_title = consolidate_sections(sections)
-
-        chapter_text = ' '.join([item['text'] for item in content])
-        word_count = len(chapter_text.split())
+        chapter_dict, word_count = build_non_spine_chapter(
+            href, sections, structure_map.get(href), chapter_index)
         total_words += word_count
 
-        struct_item = structure_map.get(href)
-        fallback_title = f'Extra: {os.path.basename(href)}'
-        struct_title = struct_item.title if struct_item else None
-        best_title = get_best_title(struct_title, main_title, fallback_title)
-
-        chapter_dict = build_chapter_dict(
-            href, content, struct_item, main_title, chapter_index, 'other')
-        chapter_dict['title'] = best_title
-        chapter_dict['image_count'] = len(images)
-        chapter_dict['linear'] = struct_item.linear if struct_item else False
-
         chapters.append(chapter_dict)
         chapter_index += 1
         processed_hrefs.add(href)
@@ -141,39 +185,24 @@ def process_fallback_content(all_content: Dict) -> tuple:
     chapter_index = 0
 
     for href, sections in all_content.items():
-        content, images, main_title = consolidate_sections(sections)
-
-        chapter_text = ' '.join([item['text'] for item in content])
-        word_count = len(chapter_text.split())
+        chapter_dict, word_count = build_fallback_chapter(href, sections, chapter_index)
         total_words += word_count
-
-        char_count = sum(len(item['text']) for item in content)
-        reading_minutes = max(1, word_count // 250)
-
-        chapters.append({
-            'id': get_chapter_id(href),
-            'title': main_title or f'Section {chapter_index + 1}',
-            'href': href,
-            'type': 'chapter',
-            'chapter_number': chapter_index + 1,
-            'part': None,
-            'word_count': word_count,
-            'char_count': char_count,
-            'reading_minutes': reading_minutes,
-            'image_count': len(images),
-            'linear': True,
-            '_temp_content': content,
-        })
+        chapters.append(chapter_dict)
         chapter_index += 1
 
     return chapters, total_words
 
 
+def finalize_chapter(chapter: Dict) -> None:
+    """Finalize chapter format - move _temp_content to content (as dicts) or remove."""
+    temp_content = chapter.pop('_temp_content', None)
+    sections = chapter.get('sections', [])
+
+    if not sections or all(not s.get('content') for s in sections):
+        chapter['content'] = materialize_blocks(temp_content or [])
+
+
 def finalize_chapters(chapters: List[Dict]) -> None:
-    """Finalize chapter format - move _temp_content to content or remove."""
+    """Finalize every chapter (see finalize_chapter)."""
     for chapter in chapters:
-        temp_content = chapter.pop('_temp_content', None)
-        sections = chapter.get('sections', [])
-
-        if not sections or all(not s.get('content') for s in sections):
-            chapter['content'] = temp_content or []
+        finalize_chapter(chapter)
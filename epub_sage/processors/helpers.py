@@ -71,7 +71,9 @@ def build_nested_section(nav_point: NavigationPoint, content_lookup: Dict[str, E
 
 
 def enrich_with_sections(chapters: List[Dict], structure: Any, extracted_dir: str,
-                         structure_parser: Any, include_html: bool = False) -> None:
+                         structure_parser: Any, include_html: bool = False,
+                         archive: Any = None, documents: Any = None,
+                         pool: Any = None) -> None:
     """Add nested sections to chapters matching TOC tree structure."""
     if not structure or not structure.navigation_tree:
         for chapter in chapters:
@@ -79,24 +81,35 @@ def enrich_with_sections(chapters: List[Dict], structure: Any, extracted_dir: st
         return
 
     toc_content = structure_parser.extract_content_by_toc(
-        extracted_dir, structure, include_html)
+        extracted_dir, structure, include_html, archive, documents, pool)
 
+    content_lookup = sections_by_nav_id(toc_content)
+    nav_by_file = navigation_by_file(structure.navigation_tree)
+
+    for chapter in chapters:
+        top_level_navs = nav_by_file.get(chapter['href'], [])
+        chapter['sections'] = [build_nested_section(
+            nav, content_lookup) for nav in top_level_navs]
+
+
+def sections_by_nav_id(toc_content: Dict[str, List[ExtractedSection]]) -> Dict[str, ExtractedSection]:
+    """Index extracted TOC sections by navigation point ID."""
     content_lookup: Dict[str, ExtractedSection] = {}
     for sections in toc_content.values():
         for section in sections:
             content_lookup[section.nav_point.id] = section
+    return content_lookup
 
+
+def navigation_by_file(navigation_tree: List[NavigationPoint]) -> Dict[str, List[NavigationPoint]]:
+    """Group top-level navigation points by the file they point into."""
     nav_by_file: Dict[str, List[NavigationPoint]] = {}
-    for nav_point in structure.navigation_tree:
+    for nav_point in navigation_tree:
         file_path = nav_point.href.split('#')[0]
         if file_path not in nav_by_file:
             nav_by_file[file_path] = []
         nav_by_file[file_path].append(nav_point)
-
-    for chapter in chapters:
-        top_level_navs = nav_by_file.get(chapter['href'], [])
-        chapter['sections'] = [build_nested_section(
-            nav, content_lookup) for nav in top_level_navs]
+    return nav_by_file
 
 
 def calculate_section_stats(chapters: List[Dict]) -> tuple:
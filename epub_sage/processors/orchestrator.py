@@ -2,14 +2,31 @@
 
 import os
 import tempfile
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, Iterable, List, Optional, Any, Tuple
 
-from ..extractors.epub_extractor import EpubExtractor
-from ..extractors.content_extractor import extract_book_content
+from ..extractors.epub_archive import EpubArchive
+from ..extractors.epub_extractor import EpubExtractor, ID_MODE_CONTENT
+from ..extractors.content_extractor import IMAGE_EXTENSIONS, compact_book_content
+from ..extractors.backends import get_backend
+from ..extractors.document_cache import DocumentCache, DEFAULT_MAX_BYTES
+from ..extractors.parallel import ExtractionPool, can_parallelize
 from ..core.dublin_core_parser import DublinCoreParser
+from ..core.metadata_reader import read_content_opf
 from ..core.structure_parser import EpubStructureParser
+from ..utils.limits import ResourceLimitExceeded, ResourceLimits, active_budget
+from ..utils.profiling import Profiler, active_profiler, stage
 
-from .result import SimpleEpubResult, create_error_result, create_success_result
+from .result import (
+    SimpleEpubResult, create_error_result, create_limit_error_result, create_success_result,
+)
+from .result_cache import ResultCache
+from .chapter_stream import ChapterStream
+from .chapter_store import ChapterStore
+from .block_table import BlockTable
+from .stages import (
+    STAGE_CONTENT, STAGE_IMAGES, STAGE_METADATA, STAGE_SECTIONS, STAGE_STRUCTURE,
+    resolve_stages,
+)
 from .helpers import enrich_with_sections, calculate_section_stats, calculate_reading_time
 from .content_consolidator import (
     process_spine_items, process_non_spine_items,
@@ -20,84 +37,365 @@ from .content_consolidator import (
 class SimpleEpubProcessor:
     """Simple processor for one-step EPUB processing."""
 
-    def __init__(self, temp_dir: Optional[str] = None):
+    def __init__(self, temp_dir: Optional[str] = None, id_mode: str = ID_MODE_CONTENT,
+                 document_cache_bytes: int = DEFAULT_MAX_BYTES, backend: str = 'bs4',
+                 stream_threshold: Optional[int] = None, workers: int = 1,
+                 stages: Optional[Iterable[str]] = None, profile: bool = False,
+                 result_cache: Optional[ResultCache] = None, spill_chapters: bool = False,
+                 block_table: bool = False, limits: Optional[ResourceLimits] = None,
+                 selective_extraction: bool = False):
+        if spill_chapters and block_table:
+            raise ValueError("spill_chapters and block_table cannot be combined")
         self.temp_dir = temp_dir or tempfile.gettempdir()
-        self.extractor = EpubExtractor(base_dir=self.temp_dir)
+        self.stages = resolve_stages(stages)
+        self.profile = profile
+        self.result_cache = result_cache
+        self.spill_chapters = spill_chapters
+        self.block_table = block_table
+        self.limits = limits
+        self.selective_extraction = selective_extraction
+        self.document_cache_bytes = document_cache_bytes
+        self.stream_threshold = stream_threshold
+        self.workers = max(1, workers)
+        self.backend = get_backend(backend)
+        self.extractor = EpubExtractor(base_dir=self.temp_dir, id_mode=id_mode, limits=limits)
         self.parser = DublinCoreParser()
         self.structure_parser = EpubStructureParser()
 
     def process_epub(self, epub_path: str, cleanup: bool = True,
-                     include_html: bool = False) -> SimpleEpubResult:
-        """Process EPUB file in one step."""
+                     include_html: bool = False, hrefs: Optional[List[str]] = None,
+                     spine_range: Optional[Tuple[Optional[int], Optional[int]]] = None
+                     ) -> SimpleEpubResult:
+        """Process EPUB file in one step.
+
+        With cleanup (the default) members are read straight from the ZIP and
+        nothing is written to disk. Without it the book is extracted to the
+        temp dir and left there for the caller; with ``selective_extraction``
+        only the members the enabled stages read are extracted.
+
+        ``hrefs`` and ``spine_range`` (a ``(start, end)`` slice of the spine)
+        process only the selected files, read in place whatever ``cleanup``
+        is; totals cover the selected chapters.
+
+        With a ``result_cache``, successful results of in-place runs
+        (``cleanup=True``) are stored and later returned without reading the
+        book again. Profiled runs bypass the cache.
+
+        With ``spill_chapters``, chapters are built one at a time and their
+        ``content`` and ``sections`` are written to a temp file in
+        ``temp_dir``, leaving read-only handles that load on access;
+        ``result.close()`` (or ``with result:``) deletes the file.
+
+        With ``limits``, a book that breaches one gets an error result whose
+        ``limit_exceeded`` names the limit.
+        """
+        if self.limits is not None and active_budget() is None:
+            return self._process_limited(lambda: self.process_epub(
+                epub_path, cleanup, include_html, hrefs, spine_range))
+        profiler = self._new_profiler()
+        if profiler is not None:
+            with profiler.activate():
+                result = self._process_epub(epub_path, cleanup, include_html, hrefs, spine_range)
+            result.timings = profiler.to_dict()
+            return result
+        if self.result_cache is not None and cleanup:
+            return self._process_cached(epub_path, include_html, hrefs, spine_range)
+        return self._process_epub(epub_path, cleanup, include_html, hrefs, spine_range)
+
+    def _process_epub(self, epub_path: str, cleanup: bool, include_html: bool,
+                      hrefs: Optional[List[str]],
+                      spine_range: Optional[Tuple[Optional[int], Optional[int]]]
+                      ) -> SimpleEpubResult:
+        if hrefs is not None or spine_range is not None or self.spill_chapters:
+            return self._process_stream(epub_path, include_html, hrefs, spine_range)
+
         extracted_dir = None
 
         try:
-            epub_info = self.extractor.get_epub_info(epub_path)
+            with stage('open'):
+                epub_info = self.extractor.get_epub_info(epub_path)
             if not epub_info.get('success'):
                 return create_error_result(epub_info.get('error', 'Failed to read EPUB'), epub_info)
 
+            if cleanup:
+                try:
+                    with stage('open'):
+                        archive = self.extractor.open_archive(epub_path)
+                except Exception as e:
+                    return create_error_result(f"Failed to open archive: {str(e)}", epub_info)
+                with archive:
+                    return self.process_archive(
+                        archive, book_id=epub_info.get('book_id'),
+                        epub_info=epub_info, include_html=include_html
+                    )
+
             try:
-                extracted_dir = self.extractor.extract_epub(epub_path)
+                with stage('extract'):
+                    extracted_dir = self.extractor.extract_epub(
+                        epub_path, book_id=epub_info.get('book_id'),
+                        patterns=self._extraction_patterns(), workers=self.workers)
             except Exception as e:
                 return create_error_result(f"Extraction failed: {str(e)}", epub_info)
 
-            result = self.process_directory(
+            return self.process_directory(
                 extracted_dir, book_id=epub_info.get('book_id'),
                 epub_info=epub_info, include_html=include_html
             )
 
-            if cleanup and extracted_dir:
-                self.extractor.cleanup_extraction(extracted_dir)
-
-            return result
-
         except Exception as e:
-            if cleanup and extracted_dir:
-                self.extractor.cleanup_extraction(extracted_dir)
             return create_error_result(f"Critical error: {str(e)}", {})
 
+    def _extraction_patterns(self) -> Optional[List[str]]:
+        """Member globs the enabled stages read (None extracts everything).
+
+        The package files are always extracted. Content resolves images
+        against the files present, so it needs them as the images stage does;
+        fonts, stylesheets and media are never read.
+        """
+        if not self.selective_extraction:
+            return None
+        patterns: List[str] = []
+        if self.stages & {STAGE_STRUCTURE, STAGE_CONTENT, STAGE_SECTIONS}:
+            patterns += ['*.html', '*.xhtml', '*.htm']
+        if self.stages & {STAGE_IMAGES, STAGE_CONTENT, STAGE_SECTIONS}:
+            patterns += [f'*{extension}' for extension in IMAGE_EXTENSIONS]
+        return patterns
+
+    def iter_chapters(self, epub_path: str, include_html: bool = False,
+                      hrefs: Optional[List[str]] = None,
+                      spine_range: Optional[Tuple[Optional[int], Optional[int]]] = None
+                      ) -> ChapterStream:
+        """Yield the chapters of an EPUB one at a time, in spine order.
+
+        Each chapter is built from its own file's content and TOC sections,
+        which are dropped once it is yielded; ``workers`` is not used. After
+        the last chapter, the stream's ``summary`` holds metadata and totals.
+        ``hrefs`` and ``spine_range`` select files as in ``process_epub``.
+        """
+        return ChapterStream(self, epub_path, include_html, hrefs, spine_range)
+
+    def _process_cached(self, epub_path: str, include_html: bool,
+                        hrefs: Optional[List[str]],
+                        spine_range: Optional[Tuple[Optional[int], Optional[int]]]
+                        ) -> SimpleEpubResult:
+        """process_epub through the result cache."""
+        cache = self.result_cache
+        assert cache is not None
+        try:
+            key = cache.key_for(epub_path, self._cache_options(include_html, hrefs, spine_range))
+        except (OSError, ValueError):
+            # Unreadable book: let the normal path report the error
+            return self._process_epub(epub_path, True, include_html, hrefs, spine_range)
+
+        cached = cache.get(key, root=os.path.abspath(epub_path))
+        if cached is not None:
+            return cached
+        result = self._process_epub(epub_path, True, include_html, hrefs, spine_range)
+        budget = active_budget()
+        if result.success and (budget is None or budget.exceeded is None):
+            cache.put(key, result)
+        return result
+
+    def _cache_options(self, include_html: bool, hrefs: Optional[List[str]],
+                       spine_range: Optional[Tuple[Optional[int], Optional[int]]]
+                       ) -> Dict[str, Any]:
+        """Options that change the result of process_epub (part of cache keys)."""
+        return {
+            'id_mode': self.extractor.id_mode,
+            'backend': self.backend.name,
+            'stream_threshold': self.stream_threshold,
+            'stages': sorted(self.stages),
+            'include_html': include_html,
+            'hrefs': hrefs,
+            'spine_range': list(spine_range) if spine_range is not None else None,
+            'block_table': self.block_table,
+        }
+
+    def _process_limited(self, process: Callable[[], SimpleEpubResult]) -> SimpleEpubResult:
+        """Run process() with a budget for ``limits``; a breach gives a limit error result."""
+        assert self.limits is not None
+        with self.limits.activate() as budget:
+            try:
+                result = process()
+            except ResourceLimitExceeded as e:
+                budget.breach(e)
+        if budget.exceeded is not None:
+            return create_limit_error_result(budget.exceeded)
+        return result
+
+    def _new_profiler(self) -> Optional[Profiler]:
+        """Profiler for an outermost call when profiling (None otherwise)."""
+        if self.profile and active_profiler() is None:
+            return Profiler()
+        return None
+
+    def _process_stream(self, epub_path: str, include_html: bool,
+                        hrefs: Optional[List[str]],
+                        spine_range: Optional[Tuple[Optional[int], Optional[int]]]
+                        ) -> SimpleEpubResult:
+        """Result built from a chapter stream (selected files or spilled chapters)."""
+        stream = self.iter_chapters(epub_path, include_html, hrefs, spine_range)
+        table = BlockTable() if self.block_table else None
+        chapters = []
+        store = ChapterStore(self.temp_dir) if self.spill_chapters else None
+        try:
+            for chapter in stream:
+                if store is not None:
+                    store.spill(chapter)
+                if table is not None:
+                    table.index_chapter(chapter)
+                chapters.append(chapter)
+        except BaseException:
+            if store is not None:
+                store.close()
+            raise
+        result = stream.summary or create_error_result("Processing failed", {})
+        result.chapters = chapters
+        result._chapter_store = store
+        if table is not None and result.success:
+            result.blocks = table.blocks
+        return result
+
+    def process_archive(self, archive: EpubArchive, book_id: Optional[str] = None,
+                        epub_info: Optional[Dict[str, Any]] = None,
+                        include_html: bool = False) -> SimpleEpubResult:
+        """Process an open EPUB archive (file, ZipFile or bytes) in place."""
+        return self.process_directory(
+            archive.root, book_id=book_id, epub_info=epub_info,
+            include_html=include_html, archive=archive
+        )
+
     def process_directory(self, extracted_dir: str, book_id: Optional[str] = None,
                           epub_info: Optional[Dict[str, Any]] = None,
-                          include_html: bool = False) -> SimpleEpubResult:
-        """Process an already extracted EPUB directory."""
+                          include_html: bool = False,
+                          archive: Optional[EpubArchive] = None) -> SimpleEpubResult:
+        """Process an already extracted EPUB directory.
+
+        When an archive is given, extracted_dir is its virtual root.
+        """
+        if self.limits is not None and active_budget() is None:
+            return self._process_limited(lambda: self.process_directory(
+                extracted_dir, book_id, epub_info, include_html, archive))
+        profiler = self._new_profiler()
+        if profiler is not None:
+            with profiler.activate():
+                result = self.process_directory(
+                    extracted_dir, book_id, epub_info, include_html, archive)
+            result.timings = profiler.to_dict()
+            return result
+
         errors: List[str] = []
         _book_id, _total_files, _total_size_mb = self._get_file_info(
-            extracted_dir, book_id, epub_info
+            extracted_dir, book_id, epub_info, archive
         )
+        stages = self.stages
+        # Each document is parsed once and shared by the content pass and
+        # the TOC section pass
+        documents = DocumentCache(extracted_dir, archive,
+                                  max_bytes=self.document_cache_bytes,
+                                  consumers=2 if STAGE_SECTIONS in stages else 1,
+                                  backend=self.backend,
+                                  stream_threshold=self.stream_threshold)
+        pool = None
 
         try:
-            content_opf_path = self.extractor.find_content_opf(extracted_dir)
-            parsed_opf, metadata, errors = self._parse_metadata(
-                content_opf_path, errors)
-            structure, structure_map = self._parse_structure(
-                parsed_opf, extracted_dir, errors)
-
-            chapters, total_words, content_found, errors = self._extract_content(
-                extracted_dir, parsed_opf, structure_map, errors
-            )
+            content_opf_path, parsed_opf, metadata = None, None, None
+            if STAGE_METADATA in stages:
+                with stage(STAGE_METADATA):
+                    content_opf_path = self.extractor.find_content_opf(
+                        extracted_dir, archive)
+                    parsed_opf, metadata, errors = self._parse_metadata(
+                        content_opf_path, errors, archive)
+
+            all_content = None
+            if STAGE_CONTENT in stages:
+                with stage(STAGE_CONTENT):
+                    pool = self._open_pool(extracted_dir, archive)
+                    all_content = self._load_content(extracted_dir, archive, documents, pool)
+
+            structure, structure_map = None, {}
+            if STAGE_STRUCTURE in stages:
+                # Without the images stage, skip content-based image association
+                content_data = all_content if STAGE_IMAGES in stages else {}
+                with stage(STAGE_STRUCTURE):
+                    structure, structure_map = self._parse_structure(
+                        parsed_opf, extracted_dir, errors, archive, content_data)
+
+            chapters: List[Dict[str, Any]] = []
+            total_words, content_found = 0, False
+            if STAGE_CONTENT in stages:
+                with stage('chapters'):
+                    chapters, total_words, content_found, errors = self._extract_content(
+                        extracted_dir, parsed_opf, structure_map, errors, archive, all_content
+                    )
+                # Chapters now hold the blocks they use; let finalization free the rest
+                all_content = None
 
             reading_time = calculate_reading_time(total_words)
-            enrich_with_sections(
-                chapters, structure, extracted_dir, self.structure_parser, include_html)
-            finalize_chapters(chapters)
-            total_sections, max_section_depth = calculate_section_stats(
-                chapters)
+            if STAGE_SECTIONS in stages:
+                with stage(STAGE_SECTIONS):
+                    enrich_with_sections(
+                        chapters, structure, extracted_dir, self.structure_parser,
+                        include_html, archive, documents, pool)
+            else:
+                for chapter in chapters:
+                    chapter['sections'] = []
+            with stage('finalize'):
+                finalize_chapters(chapters)
+                total_sections, max_section_depth = calculate_section_stats(
+                    chapters)
 
-            return create_success_result(
+            result = create_success_result(
                 metadata, chapters, total_words, reading_time, _book_id,
                 extracted_dir, content_opf_path, errors, _total_files,
                 _total_size_mb, total_sections, max_section_depth, content_found
             )
+            if self.block_table:
+                table = BlockTable()
+                for chapter in chapters:
+                    table.index_chapter(chapter)
+                result.blocks = table.blocks
+            return result
 
         except Exception as e:
             return create_error_result(f"Processing failed: {str(e)}", {})
+        finally:
+            documents.clear()
+            if pool is not None:
+                pool.close()
+
+    def _open_pool(self, extracted_dir: str,
+                   archive: Optional[EpubArchive]) -> Optional[ExtractionPool]:
+        """Worker pool for per-file extraction, or None to extract in process."""
+        if self.workers <= 1 or not can_parallelize(archive):
+            return None
+        return ExtractionPool(self.workers, extracted_dir, archive,
+                              backend=self.backend.name,
+                              stream_threshold=self.stream_threshold,
+                              max_elements=self.limits.max_elements if self.limits else None)
+
+    def _load_content(self, extracted_dir: str, archive: Optional[EpubArchive],
+                      documents: DocumentCache,
+                      pool: Optional[ExtractionPool] = None) -> Optional[Dict[str, Any]]:
+        """Extract book content once for all stages (None if it fails)."""
+        try:
+            return compact_book_content(extracted_dir, archive, documents, pool)
+        except Exception:
+            return None
 
     def _get_file_info(self, extracted_dir: str, book_id: Optional[str],
-                       epub_info: Optional[Dict]) -> tuple:
-        """Get file info from epub_info or calculate from directory."""
+                       epub_info: Optional[Dict],
+                       archive: Optional[EpubArchive] = None) -> tuple:
+        """Get file info from epub_info or calculate from directory or archive."""
         if epub_info:
             return (book_id or '', epub_info.get('total_files', 0),
                     epub_info.get('total_size_mb', 0.0))
+        if archive is not None:
+            infos = archive.infolist()
+            size_bytes = sum(info.file_size for info in infos)
+            _book_id = book_id or os.path.splitext(
+                os.path.basename(archive.root))[0] or 'memory'
+            return _book_id, len(infos), round(size_bytes / (1024 * 1024), 2)
         file_count, size_bytes = 0, 0
         for root, _, files in os.walk(extracted_dir):
             file_count += len(files)
@@ -109,27 +407,30 @@ class SimpleEpubProcessor:
         _book_id = book_id or os.path.basename(os.path.dirname(extracted_dir)) or 'local-dir'
         return _book_id, file_count, round(size_bytes / (1024 * 1024), 2)
 
-    def _parse_metadata(self, content_opf_path: Optional[str], errors: list) -> tuple:
+    def _parse_metadata(self, content_opf_path: Optional[str], errors: list,
+                        archive: Optional[EpubArchive] = None) -> tuple:
         """Parse metadata from content.opf."""
         if not content_opf_path:
             errors.append("No content.opf file found")
             return None, None, errors
 
         try:
-            parsed_opf = self.parser.parse_file(content_opf_path)
+            parsed_opf = self.parser.parse_file(content_opf_path, archive)
             return parsed_opf, parsed_opf.metadata, errors
         except Exception as e:
             errors.append(f"Metadata parsing error: {str(e)}")
             return None, None, errors
 
-    def _parse_structure(self, parsed_opf, extracted_dir: str, errors: list) -> tuple:
+    def _parse_structure(self, parsed_opf, extracted_dir: str, errors: list,
+                         archive: Optional[EpubArchive] = None,
+                         content_data: Optional[Dict[str, Any]] = None) -> tuple:
         """Parse EPUB structure."""
         if not parsed_opf:
             return None, {}
 
         try:
             structure = self.structure_parser.parse_complete_structure(
-                parsed_opf, extracted_dir)
+                parsed_opf, extracted_dir, archive, content_data)
             structure_map = {}
             for item in (structure.chapters + structure.front_matter +
                          structure.back_matter + structure.parts):
@@ -140,10 +441,12 @@ class SimpleEpubProcessor:
             return None, {}
 
     def _extract_content(self, extracted_dir: str, parsed_opf, structure_map: Dict,
-                         errors: list) -> tuple:
+                         errors: list, archive: Optional[EpubArchive] = None,
+                         all_content: Optional[Dict[str, Any]] = None) -> tuple:
         """Extract and consolidate content."""
         try:
-            all_content = extract_book_content(extracted_dir)
+            if all_content is None:
+                all_content = compact_book_content(extracted_dir, archive)
             if not all_content:
                 errors.append("No content could be extracted from HTML files")
                 return [], 0, False, errors
@@ -167,29 +470,23 @@ class SimpleEpubProcessor:
             return [], 0, False, errors
 
     def quick_info(self, epub_path: str) -> Dict[str, Any]:
-        """Get quick EPUB information without full processing."""
+        """Get quick EPUB information without full processing.
+
+        Metadata is parsed from the OPF alone, read in place from the ZIP.
+        """
         epub_info = self.extractor.get_epub_info(epub_path)
         if not epub_info.get('success'):
             return epub_info
-        extracted_dir = None
         try:
-            extracted_dir = self.extractor.extract_epub(epub_path)
-            content_opf_path = self.extractor.find_content_opf(extracted_dir)
-            if content_opf_path:
-                metadata = self.parser.parse_file(content_opf_path).metadata
-                return {"book_id": epub_info['book_id'], "filename": epub_info['filename'],
-                        "title": metadata.title or 'Unknown', "author": metadata.get_primary_author() or 'Unknown',
-                        "publisher": metadata.publisher, "language": metadata.language, "isbn": metadata.get_isbn(),
-                        "total_files": epub_info['total_files'], "total_size_mb": epub_info['total_size_mb'], "success": True}
+            metadata = read_content_opf(epub_path, self.parser).metadata
+        except FileNotFoundError:
             return {**epub_info, "title": "Unknown", "author": "Unknown", "warning": "Could not parse metadata"}
         except Exception as e:
             return {**epub_info, "error": f"Metadata extraction failed: {str(e)}", "success": False}
-        finally:
-            if extracted_dir:
-                try:
-                    self.extractor.cleanup_extraction(extracted_dir)
-                except BaseException:
-                    pass
+        return {"book_id": epub_info['book_id'], "filename": epub_info['filename'],
+                "title": metadata.title or 'Unknown', "author": metadata.get_primary_author() or 'Unknown',
+                "publisher": metadata.publisher, "language": metadata.language, "isbn": metadata.get_isbn(),
+                "total_files": epub_info['total_files'], "total_size_mb": epub_info['total_size_mb'], "success": True}
 
 
 def process_epub(epub_path: str, include_html: bool = False) -> SimpleEpubResult:
@@ -2,7 +2,7 @@
 
 from typing import List, Dict, Optional, Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 from ..models.dublin_core import DublinCoreMetadata
 
@@ -36,6 +36,57 @@ class SimpleEpubResult(BaseModel):
 
     full_metadata: Optional[DublinCoreMetadata] = None
 
+    # Book-level block table, set when processing with block_table=True;
+    # chapters and sections then hold content_range [start, end) indices into it
+    blocks: Optional[List[Dict[str, Any]]] = None
+
+    # The breached limit (limit, value, maximum, member) when processing
+    # with limits stopped on a ResourceLimitExceeded
+    limit_exceeded: Optional[Dict[str, Any]] = None
+
+    # Per-stage timings and counters, set when processing with profile=True
+    timings: Optional[Dict[str, Any]] = None
+
+    # ChapterStore holding spilled chapter bodies (spill_chapters=True)
+    _chapter_store: Optional[Any] = PrivateAttr(default=None)
+
+    def __enter__(self) -> 'SimpleEpubResult':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __getstate__(self) -> Dict[Any, Any]:
+        # Pickled SpilledLists become plain lists, so copies need no store
+        state = super().__getstate__()
+        private = state.get('__pydantic_private__')
+        if private and private.get('_chapter_store') is not None:
+            state['__pydantic_private__'] = {**private, '_chapter_store': None}
+        return state
+
+    def __deepcopy__(self, memo: Optional[Dict[int, Any]] = None) -> 'SimpleEpubResult':
+        memo = {} if memo is None else memo
+        if self._chapter_store is not None:
+            # As with pickling: the copy holds plain lists and no store
+            memo.setdefault(id(self._chapter_store), None)
+        return super().__deepcopy__(memo)
+
+    def close(self) -> None:
+        """Delete the spill file of a spill_chapters result (a no-op otherwise).
+
+        Spilled chapter bodies can no longer be read afterwards; dump the
+        result first if they are still needed.
+        """
+        if self._chapter_store is not None:
+            self._chapter_store.close()
+
+    def block_content(self, item: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Content blocks of a chapter or section, from the block table if one was built."""
+        if self.blocks is None or 'content_range' not in item:
+            return item.get('content', [])
+        start, end = item['content_range']
+        return self.blocks[start:end]
+
 
 def create_error_result(error_message: str, epub_info: Dict[str, Any]) -> SimpleEpubResult:
     """Create error result when processing fails."""
@@ -62,6 +113,13 @@ def create_error_result(error_message: str, epub_info: Dict[str, Any]) -> Simple
     )
 
 
+def create_limit_error_result(error) -> SimpleEpubResult:
+    """Create error result for a book that breached a resource limit."""
+    result = create_error_result(str(error), {})
+    result.limit_exceeded = error.to_dict()
+    return result
+
+
 def create_success_result(
     metadata,
     chapters: List[Dict],
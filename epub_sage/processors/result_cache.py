@@ -0,0 +1,202 @@
+"""Persistent cache of processed books, keyed by content.
+
+Entries are keyed by the book's fingerprint, the processing options that
+affect the result and the library version, so a copied or renamed book still
+hits and an upgrade or option change misses. Results are stored as
+zlib-compressed JSON in a SQLite file (WAL mode), which several processes can
+read and write at once. The least recently used entries are evicted once the
+stored size exceeds the quota.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ..services.fingerprint_service import (
+    FingerprintService, default_cache_dir, get_fingerprint_service,
+)
+from .result import SimpleEpubResult
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILENAME = 'results.sqlite3'
+
+# Total compressed size kept before least recently used entries are evicted
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+class ResultCache:
+    """Processed results in a size-capped SQLite store shared between processes."""
+
+    def __init__(self, cache_path: Optional[str] = None,
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 fingerprints: Optional[FingerprintService] = None):
+        self.cache_path = Path(cache_path) if cache_path else (
+            default_cache_dir() / CACHE_FILENAME)
+        self.max_bytes = max_bytes
+        self.fingerprints = fingerprints or get_fingerprint_service()
+        self.enabled = True
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Sent to worker processes without the connection; workers use
+        # their own fingerprint service
+        return {'cache_path': self.cache_path, 'max_bytes': self.max_bytes}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(str(state['cache_path']), state['max_bytes'])  # type: ignore[misc]
+
+    def key_for(self, epub_path: str, options: Dict[str, Any]) -> str:
+        """Cache key of a book processed with the given options."""
+        from .. import __version__
+
+        payload = json.dumps({
+            'fingerprint': self.fingerprints.fingerprint(epub_path),
+            'options': options,
+            'version': __version__,
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str, root: Optional[str] = None) -> Optional[SimpleEpubResult]:
+        """Cached result for key, or None.
+
+        Paths in the result are rebased onto ``root`` (the absolute path of
+        the book being processed) when the entry was stored for another copy.
+        """
+        with self._lock:
+            db = self._connect()
+            if db is None:
+                return None
+            try:
+                row = db.execute('SELECT root, data FROM results WHERE key = ?',
+                                 (key,)).fetchone()
+                if row is None:
+                    return None
+                with db:
+                    db.execute('UPDATE results SET accessed = ? WHERE key = ?',
+                               (time.time(), key))
+            except sqlite3.Error as e:
+                logger.warning(f"Result cache read failed: {e}")
+                return None
+
+        try:
+            result = SimpleEpubResult.model_validate_json(zlib.decompress(row[1]))
+        except (zlib.error, ValueError) as e:
+            logger.warning(f"Discarding unreadable result cache entry: {e}")
+            self.discard(key)
+            return None
+        if root is not None and row[0] != root:
+            _rebase(result, row[0], root)
+        return result
+
+    def put(self, key: str, result: SimpleEpubResult) -> None:
+        """Store a result, evicting least recently used entries over the quota."""
+        data = zlib.compress(result.model_dump_json(exclude={'timings'}).encode('utf-8'))
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            db = self._connect()
+            if db is None:
+                return
+            try:
+                with db:
+                    db.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)',
+                               (key, result.extracted_dir, len(data), time.time(), data))
+                    self._evict(db)
+            except sqlite3.Error as e:
+                logger.warning(f"Result cache write failed: {e}")
+
+    def discard(self, key: str) -> None:
+        """Remove one entry."""
+        self._execute('DELETE FROM results WHERE key = ?', (key,))
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        self._execute('DELETE FROM results', ())
+
+    def size(self) -> int:
+        """Total stored (compressed) size in bytes."""
+        with self._lock:
+            db = self._connect()
+            if db is None:
+                return 0
+            try:
+                return int(db.execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()[0])
+            except sqlite3.Error:
+                return 0
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _evict(self, db: sqlite3.Connection) -> None:
+        total = db.execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        stale = []
+        for key, size in db.execute('SELECT key, size FROM results ORDER BY accessed'):
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        db.executemany('DELETE FROM results WHERE key = ?', stale)
+
+    def _execute(self, sql: str, params: tuple) -> None:
+        with self._lock:
+            db = self._connect()
+            if db is None:
+                return
+            try:
+                with db:
+                    db.execute(sql, params)
+            except sqlite3.Error as e:
+                logger.warning(f"Result cache write failed: {e}")
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if not self.enabled:
+            return None
+        if self._db is None:
+            try:
+                self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+                db = sqlite3.connect(
+                    str(self.cache_path), timeout=10.0, check_same_thread=False)
+                db.execute('PRAGMA journal_mode=WAL')
+                db.execute(
+                    'CREATE TABLE IF NOT EXISTS results ('
+                    'key TEXT PRIMARY KEY, root TEXT, size INTEGER, '
+                    'accessed REAL, data BLOB)')
+                db.execute('CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)')
+                db.commit()
+                self._db = db
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"Result cache disabled: {e}")
+                self.enabled = False
+        return self._db
+
+
+def _rebase(result: SimpleEpubResult, old_root: str, new_root: str) -> None:
+    """Point the path fields of a cached result at another copy of the book."""
+    result.extracted_dir = new_root
+    if result.content_opf_path and result.content_opf_path.startswith(old_root):
+        result.content_opf_path = new_root + result.content_opf_path[len(old_root):]
+
+
+_default_cache: Optional[ResultCache] = None
+
+
+def get_result_cache() -> ResultCache:
+    """Process-wide ResultCache in the default cache directory."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResultCache()
+    return _default_cache
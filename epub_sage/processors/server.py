@@ -0,0 +1,441 @@
+"""Long-lived processing server with warm worker processes.
+
+``EpubServer`` (``epub-sage serve``) keeps a pool of worker processes that
+have already imported the parsers and built a SimpleEpubProcessor, and
+answers jobs over HTTP on a loopback address or on a Unix socket::
+
+    POST /process  {"path": "book.epub", "include_html": false}
+    POST /info     {"path": "book.epub"}
+    POST /toc      {"path": "book.epub"}
+    POST /search   {"path": "book.epub", "query": "term", "limit": 10}
+    GET  /health
+
+Jobs are only accepted as POST requests with a JSON body
+(``Content-Type: application/json``) whose ``Host`` names the server's own
+loopback address, and without a foreign ``Origin``. A web page can then
+neither start jobs with a plain link or form nor read responses through DNS
+rebinding. Responses are JSON, sent with chunked transfer encoding as they
+are encoded. Identical jobs that arrive while one is running (same job, same
+file, unchanged on disk, same parameters) share its result.
+"""
+
+import ipaddress
+import json
+import logging
+import os
+import socketserver
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from ..dublin_core_service import DublinCoreService
+from ..extractors.parallel import process_context
+from ..services.export_service import DateTimeEncoder
+from ..services.search_service import SearchService
+from .orchestrator import SimpleEpubProcessor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8765
+
+# Response bodies are written in chunks of about this size
+STREAM_CHUNK_BYTES = 64 * 1024
+
+# Job name -> (required parameters, optional parameters with defaults)
+JOBS: Dict[str, Tuple[Tuple[str, ...], Dict[str, Any]]] = {
+    'process': (('path',), {'include_html': False}),
+    'info': (('path',), {}),
+    'toc': (('path',), {}),
+    'search': (('path', 'query'), {'limit': 10, 'case_sensitive': False}),
+}
+
+# Services reused by every job handled in this worker process
+_worker_state: Dict[str, Any] = {}
+
+
+class JobError(Exception):
+    """A job that cannot be answered; ``status`` is the HTTP status to send."""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+def _init_worker(options: Dict[str, Any]) -> None:
+    _worker_state['processor'] = SimpleEpubProcessor(**options)
+    _worker_state['dublin_core'] = DublinCoreService()
+    _worker_state['search'] = SearchService(context_size=100)
+
+
+def _warm_up() -> int:
+    return os.getpid()
+
+
+def _process_book(path: str, include_html: bool = False):
+    return _worker_state['processor'].process_epub(path, include_html=include_html)
+
+
+def _require_success(result) -> None:
+    if not result.success:
+        raise JobError(f"Failed to process EPUB: {', '.join(result.errors)}", 422)
+
+
+def _job_process(path: str, include_html: bool) -> Dict[str, Any]:
+    with _process_book(path, include_html) as result:
+        return result.model_dump(mode='json')
+
+
+def _job_info(path: str) -> Dict[str, Any]:
+    with _process_book(path) as result:
+        return _info(result)
+
+
+def _info(result) -> Dict[str, Any]:
+    _require_success(result)
+    return {
+        'title': result.title,
+        'author': result.author,
+        'publisher': result.publisher,
+        'language': result.language,
+        'words': result.total_words,
+        'reading_time': result.estimated_reading_time,
+        'chapters': sum(1 for ch in result.chapters
+                        if ch.get('content_type', 'chapter') == 'chapter'),
+        'sections': result.total_sections,
+    }
+
+
+def _job_toc(path: str) -> Dict[str, Any]:
+    return _worker_state['dublin_core'].get_navigation_structure(path)
+
+
+def _job_search(path: str, query: str, limit: int, case_sensitive: bool) -> Dict[str, Any]:
+    with _process_book(path) as result:
+        return _search(result, query, limit, case_sensitive)
+
+
+def _search(result, query: str, limit: int, case_sensitive: bool) -> Dict[str, Any]:
+    _require_success(result)
+    service: SearchService = _worker_state['search']
+    matches = service.search_sections(result.chapters, query, case_sensitive=case_sensitive)
+    if not matches:
+        # Books without TOC sections are searched chapter by chapter
+        chapters = [{
+            'chapter_id': ch.get('chapter_id', 0),
+            'title': ch.get('title', f"Chapter {ch.get('chapter_id', 0)}"),
+            'content': ' '.join(block.get('text', '') for block in ch.get('content', [])
+                                if isinstance(block, dict)),
+        } for ch in result.chapters]
+        matches = service.search_content(chapters, query, case_sensitive=case_sensitive)
+    return {
+        'query': query,
+        'total': len(matches),
+        'results': [match.model_dump() for match in matches[:limit]],
+    }
+
+
+_JOB_FUNCTIONS: Dict[str, Callable[..., Dict[str, Any]]] = {
+    'process': _job_process,
+    'info': _job_info,
+    'toc': _job_toc,
+    'search': _job_search,
+}
+
+
+def _run_job(job: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    return _JOB_FUNCTIONS[job](**params)
+
+
+def _job_params(job: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Validated parameters of a job, with defaults filled in."""
+    if job not in JOBS:
+        raise JobError(f"Unknown job: {job}", 404)
+    required, optional = JOBS[job]
+    unknown = set(params) - set(required) - set(optional)
+    if unknown:
+        raise JobError(f"Unknown parameters: {', '.join(sorted(unknown))}")
+    missing = [name for name in required if not params.get(name)]
+    if missing:
+        raise JobError(f"Missing parameters: {', '.join(missing)}")
+
+    values = dict(optional, **params)
+    for name, default in optional.items():
+        value = values[name]
+        try:
+            if isinstance(default, bool) and isinstance(value, str):
+                value = value.lower() in ('1', 'true', 'yes')
+            values[name] = type(default)(value)
+        except (TypeError, ValueError):
+            raise JobError(f"Invalid value for {name}: {value!r}")
+    values['path'] = os.path.realpath(str(values['path']))
+    if not os.path.exists(values['path']):
+        raise JobError(f"File not found: {params['path']}", 404)
+    return values
+
+
+class EpubServer:
+    """Serve processing jobs from a pool of warm worker processes.
+
+    Listens on ``host``:``port`` (loopback addresses only; port 0 picks a
+    free port) or, with ``socket_path``, on a Unix socket. ``workers``
+    defaults to the CPU count. Remaining keyword arguments go to the
+    SimpleEpubProcessor of each worker; each job uses a single process.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = DEFAULT_PORT,
+                 socket_path: Optional[str] = None, workers: Optional[int] = None,
+                 **processor_options: Any):
+        if socket_path is None and not _is_loopback(host):
+            raise ValueError(f"host must be a loopback address, got {host!r}")
+        self.host = host
+        self.port = port
+        self.socket_path = socket_path
+        self.workers = workers or os.cpu_count() or 1
+        self.options = dict(processor_options, workers=1)
+        self.jobs = 0
+        self.coalesced = 0
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Tuple, Future] = {}
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._httpd: Optional[socketserver.BaseServer] = None
+        self._serving = False
+
+    @property
+    def address(self) -> str:
+        """Where the server listens: ``http://host:port`` or the socket path."""
+        if self.socket_path is not None:
+            return self.socket_path
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> None:
+        """Start and warm up the worker pool, then bind the listening socket."""
+        self._executor = self._new_executor()
+        # Start every worker now, so the first jobs do not pay for imports
+        warm = [self._executor.submit(_warm_up) for _ in range(self.workers)]
+        for future in warm:
+            future.result()
+
+        httpd: Union[_HTTPServer, _UnixHTTPServer]
+        if self.socket_path is not None:
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            httpd = _UnixHTTPServer(self.socket_path, _Handler)
+        else:
+            httpd = _HTTPServer((self.host, self.port), _Handler)
+            self.port = httpd.server_address[1]
+        httpd.epub_server = self
+        self._httpd = httpd
+
+    def serve_forever(self) -> None:
+        """Handle requests until shutdown() is called from another thread."""
+        if self._httpd is None:
+            self.start()
+        assert self._httpd is not None
+        self._serving = True
+        self._httpd.serve_forever()
+
+    def shutdown(self) -> None:
+        """Stop serving and stop the worker pool."""
+        if self._httpd is not None:
+            if self._serving:
+                # Returns once serve_forever() has stopped, in any thread
+                self._httpd.shutdown()
+                self._serving = False
+            self._httpd.server_close()
+            self._httpd = None
+            if self.socket_path is not None and os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def __enter__(self) -> 'EpubServer':
+        self.start()
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.shutdown()
+
+    def submit(self, job: str, params: Dict[str, Any]) -> Future:
+        """Future for a job's response; joins a running identical job if there is one."""
+        values = _job_params(job, params)
+        stat = os.stat(values['path'])
+        key = (job, stat.st_size, stat.st_mtime_ns,
+               json.dumps(values, sort_keys=True, default=str))
+        with self._lock:
+            self.jobs += 1
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future
+            if self._executor is None:
+                raise JobError("Server is not running", 503)
+            future = self._executor.submit(_run_job, job, values)
+            self._in_flight[key] = future
+        future.add_done_callback(lambda _: self._finish(key))
+        return future
+
+    def run(self, job: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a job and return its response, replacing the pool if a worker died."""
+        future = self.submit(job, params)
+        try:
+            return future.result()
+        except BrokenProcessPool:
+            self._replace_executor()
+            raise JobError("Worker process crashed while running the job", 500)
+
+    def accepts_host(self, host: str) -> bool:
+        """Whether a Host header names this server: a loopback name, on its port."""
+        try:
+            parts = urlsplit('//' + host)
+            name, port = parts.hostname, parts.port
+        except ValueError:
+            return False
+        if not name or not _is_loopback(name):
+            return False
+        return self.socket_path is not None or (port or 80) == self.port
+
+    def health(self) -> Dict[str, Any]:
+        with self._lock:
+            in_flight = len(self._in_flight)
+        return {'status': 'ok', 'workers': self.workers, 'jobs': self.jobs,
+                'coalesced': self.coalesced, 'in_flight': in_flight}
+
+    def _finish(self, key: Tuple) -> None:
+        with self._lock:
+            self._in_flight.pop(key, None)
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=process_context(),
+                                   initializer=_init_worker, initargs=(self.options,))
+
+    def _replace_executor(self) -> None:
+        with self._lock:
+            broken = self._executor
+            if broken is None or not getattr(broken, '_broken', False):
+                return
+            self._executor = self._new_executor()
+        broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _is_loopback(host: str) -> bool:
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    epub_server: EpubServer
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """HTTP over a Unix stream socket."""
+
+    daemon_threads = True
+    epub_server: EpubServer
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'epub-sage'
+
+    def do_GET(self) -> None:
+        self._handle()
+
+    def do_POST(self) -> None:
+        self._handle()
+
+    def address_string(self) -> str:
+        # Unix socket clients have no address
+        return self.client_address[0] if self.client_address else 'unix'
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def _handle(self) -> None:
+        server: EpubServer = self.server.epub_server  # type: ignore[attr-defined]
+        job = urlsplit(self.path).path.strip('/')
+        try:
+            self._check_sender(server)
+            if job == 'health' and self.command in ('GET', 'POST'):
+                payload = server.health()
+            elif self.command != 'POST':
+                raise JobError("Jobs must be sent as POST with a JSON body", 405)
+            else:
+                payload = server.run(job, self._read_params())
+        except JobError as e:
+            headers = {'Allow': 'POST'} if e.status == 405 else {}
+            if e.status in (403, 405, 415):
+                # The request body was not read, so the connection cannot be reused
+                headers['Connection'] = 'close'
+            self._send_json(e.status, {'error': str(e)}, headers)
+            return
+        except Exception as e:
+            logger.exception("Job %s failed", job)
+            self._send_json(500, {'error': str(e)})
+            return
+        self._stream_json(payload)
+
+    def _check_sender(self, server: EpubServer) -> None:
+        """Reject requests a web page may have sent (cross-site or through DNS rebinding)."""
+        host = self.headers.get('Host', '')
+        if not server.accepts_host(host):
+            raise JobError(f"Host not allowed: {host!r}", 403)
+        origin = self.headers.get('Origin')
+        if origin is not None and origin != f"http://{host}":
+            raise JobError(f"Origin not allowed: {origin!r}", 403)
+
+    def _read_params(self) -> Dict[str, Any]:
+        content_type = (self.headers.get('Content-Type') or '').split(';', 1)[0].strip()
+        if content_type.lower() != 'application/json':
+            raise JobError("Request body must be sent as application/json", 415)
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        try:
+            params = json.loads(self.rfile.read(length))
+        except ValueError:
+            raise JobError("Request body is not valid JSON")
+        if not isinstance(params, dict):
+            raise JobError("Request body must be a JSON object")
+        return params
+
+    def _send_json(self, status: int, payload: Dict[str, Any],
+                   headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream_json(self, payload: Dict[str, Any]) -> None:
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        encoder = DateTimeEncoder(ensure_ascii=False)
+        pending = []
+        size = 0
+        for piece in encoder.iterencode(payload):
+            data = piece.encode('utf-8')
+            pending.append(data)
+            size += len(data)
+            if size >= STREAM_CHUNK_BYTES:
+                self._write_chunk(b''.join(pending))
+                pending, size = [], 0
+        if pending:
+            self._write_chunk(b''.join(pending))
+        self.wfile.write(b'0\r\n\r\n')
+
+    def _write_chunk(self, data: bytes) -> None:
+        self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
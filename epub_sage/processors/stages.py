@@ -0,0 +1,36 @@
+"""Pipeline stages that SimpleEpubProcessor can run or skip."""
+
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+
+STAGE_METADATA = 'metadata'      # content.opf: metadata, manifest and spine
+STAGE_STRUCTURE = 'structure'    # TOC parsing and chapter classification
+STAGE_IMAGES = 'images'          # image-to-chapter association in the structure
+STAGE_CONTENT = 'content'        # per-file content extraction into chapters
+STAGE_SECTIONS = 'sections'      # TOC-based nested sections per chapter
+
+ALL_STAGES: Tuple[str, ...] = (
+    STAGE_METADATA, STAGE_STRUCTURE, STAGE_IMAGES, STAGE_CONTENT, STAGE_SECTIONS,
+)
+
+# Stages each stage needs to be meaningful
+STAGE_REQUIREMENTS: Dict[str, Tuple[str, ...]] = {
+    STAGE_STRUCTURE: (STAGE_METADATA,),
+    STAGE_IMAGES: (STAGE_STRUCTURE,),
+    STAGE_SECTIONS: (STAGE_STRUCTURE, STAGE_CONTENT),
+}
+
+
+def resolve_stages(stages: Optional[Iterable[str]] = None) -> FrozenSet[str]:
+    """Validate a stage selection (all stages when None)."""
+    if stages is None:
+        return frozenset(ALL_STAGES)
+    selected = frozenset(stages)
+    unknown = selected.difference(ALL_STAGES)
+    if unknown:
+        raise ValueError(f"Unknown stages: {', '.join(sorted(unknown))} "
+                         f"(expected any of {', '.join(ALL_STAGES)})")
+    for stage in sorted(selected):
+        missing = [s for s in STAGE_REQUIREMENTS.get(stage, ()) if s not in selected]
+        if missing:
+            raise ValueError(f"Stage '{stage}' requires {', '.join(missing)}")
+    return selected
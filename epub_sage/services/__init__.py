@@ -2,8 +2,11 @@
 High-level service interfaces for EPUB processing.
 """
 from .search_service import SearchService, SearchResult
+from .fingerprint_service import FingerprintService, get_fingerprint_service
 
 __all__ = [
     'SearchService',
-    'SearchResult'
+    'SearchResult',
+    'FingerprintService',
+    'get_fingerprint_service'
 ]
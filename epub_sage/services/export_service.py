@@ -1,4 +1,5 @@
 import json
+from collections.abc import Sequence
 from datetime import datetime
 from typing import Any, Optional
 
@@ -9,6 +10,9 @@ class DateTimeEncoder(json.JSONEncoder):
     def default(self, o):
         if isinstance(o, datetime):
             return o.isoformat()
+        if isinstance(o, Sequence) and not isinstance(o, (str, bytes)):
+            # Lazily loaded lists, such as spilled chapter bodies
+            return list(o)
         return super().default(o)
 
 
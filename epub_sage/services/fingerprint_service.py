@@ -0,0 +1,189 @@
+"""Book fingerprinting with a persistent (path, size, mtime) sidecar cache.
+
+Every stage that needs a book's identity asks the shared FingerprintService,
+so a file is hashed at most once per run, and not at all on later runs while
+its size and mtime are unchanged.
+"""
+
+import hashlib
+import logging
+import mmap
+import os
+import sqlite3
+import threading
+import zipfile
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Read buffer for files below the mmap threshold
+HASH_BUFFER_SIZE = 1024 * 1024
+
+# Files at least this large are hashed through mmap
+MMAP_THRESHOLD = 8 * 1024 * 1024
+
+# Length of the book_id prefix taken from the hex digest
+BOOK_ID_LENGTH = 16
+
+CACHE_FILENAME = 'fingerprints.sqlite3'
+
+
+def default_cache_dir() -> Path:
+    """Directory for epub-sage caches.
+
+    Honours EPUB_SAGE_CACHE_DIR, then XDG_CACHE_HOME, then ~/.cache.
+    """
+    override = os.environ.get('EPUB_SAGE_CACHE_DIR')
+    if override:
+        return Path(override)
+    xdg = os.environ.get('XDG_CACHE_HOME')
+    base = Path(xdg) if xdg else Path.home() / '.cache'
+    return base / 'epub-sage'
+
+
+def hash_file(file_path: str) -> str:
+    """SHA-256 hex digest of a file using mmap or large buffered reads."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                digest.update(mapped)
+        else:
+            buffer = bytearray(HASH_BUFFER_SIZE)
+            view = memoryview(buffer)
+            while True:
+                read = f.readinto(buffer)
+                if not read:
+                    break
+                digest.update(view[:read])
+    return digest.hexdigest()
+
+
+def hash_central_directory(file_path: str) -> str:
+    """SHA-256 hex digest of a ZIP central directory.
+
+    Covers member names, CRC-32s and compressed and uncompressed sizes in
+    archive order. Only the end of the file is read, so the cost does not
+    grow with the size of the members.
+    """
+    digest = hashlib.sha256()
+    try:
+        with zipfile.ZipFile(file_path, 'r') as zf:
+            for info in zf.infolist():
+                digest.update(info.filename.encode('utf-8'))
+                digest.update(
+                    f"\0{info.CRC:08x}\0{info.compress_size}\0{info.file_size}\n".encode('ascii'))
+    except zipfile.BadZipFile:
+        raise ValueError(f"Invalid ZIP/EPUB file: {file_path}")
+    return digest.hexdigest()
+
+
+class FingerprintService:
+    """Content fingerprints cached in memory and in a SQLite sidecar file."""
+
+    def __init__(self, cache_path: Optional[str] = None, persistent: bool = True):
+        self.cache_path = Path(cache_path) if cache_path else (
+            default_cache_dir() / CACHE_FILENAME)
+        self.persistent = persistent
+        self._memo: Dict[Tuple[str, int, int], str] = {}
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+    def fingerprint(self, file_path: str) -> str:
+        """Full SHA-256 hex digest of a file, reused while it is unchanged."""
+        key = self._stat_key(file_path)
+        with self._lock:
+            cached = self._memo.get(key)
+        if cached is not None:
+            return cached
+
+        cached = self._load(key)
+        if cached is None:
+            cached = hash_file(file_path)
+            self._store(key, cached)
+
+        with self._lock:
+            self._memo[key] = cached
+        return cached
+
+    def book_id(self, file_path: str) -> str:
+        """Short book identifier derived from the fingerprint."""
+        return self.fingerprint(file_path)[:BOOK_ID_LENGTH]
+
+    def clear(self) -> None:
+        """Forget in-memory entries (the sidecar file is kept)."""
+        with self._lock:
+            self._memo.clear()
+
+    def close(self) -> None:
+        """Close the sidecar database connection."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    @staticmethod
+    def _stat_key(file_path: str) -> Tuple[str, int, int]:
+        path = os.path.abspath(file_path)
+        stat = os.stat(path)
+        return path, stat.st_size, stat.st_mtime_ns
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if not self.persistent:
+            return None
+        if self._db is None:
+            try:
+                self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+                db = sqlite3.connect(
+                    str(self.cache_path), timeout=5.0, check_same_thread=False)
+                db.execute(
+                    'CREATE TABLE IF NOT EXISTS fingerprints ('
+                    'path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, '
+                    'digest TEXT)')
+                self._db = db
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"Fingerprint cache disabled: {e}")
+                self.persistent = False
+        return self._db
+
+    def _load(self, key: Tuple[str, int, int]) -> Optional[str]:
+        with self._lock:
+            db = self._connect()
+            if db is None:
+                return None
+            try:
+                row = db.execute(
+                    'SELECT size, mtime_ns, digest FROM fingerprints WHERE path = ?',
+                    (key[0],)).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"Fingerprint cache read failed: {e}")
+                return None
+        if row and row[0] == key[1] and row[1] == key[2]:
+            return str(row[2])
+        return None
+
+    def _store(self, key: Tuple[str, int, int], digest: str) -> None:
+        with self._lock:
+            db = self._connect()
+            if db is None:
+                return
+            try:
+                with db:
+                    db.execute(
+                        'INSERT OR REPLACE INTO fingerprints VALUES (?, ?, ?, ?)',
+                        (key[0], key[1], key[2], digest))
+            except sqlite3.Error as e:
+                logger.warning(f"Fingerprint cache write failed: {e}")
+
+
+_default_service: Optional[FingerprintService] = None
+
+
+def get_fingerprint_service() -> FingerprintService:
+    """Process-wide FingerprintService shared by all extractors."""
+    global _default_service
+    if _default_service is None:
+        _default_service = FingerprintService()
+    return _default_service
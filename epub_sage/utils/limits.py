@@ -0,0 +1,193 @@
+"""Opt-in resource limits for untrusted EPUB files.
+
+``SimpleEpubProcessor(limits=ResourceLimits())`` checks the ZIP central
+directory of a book before any member is read (uncompressed size,
+compression ratio, member count) and activates a Budget while it processes
+the book, which enforces the element count of each parsed document and the
+per-book wall-clock timeout. Deeper code checks the budget through
+module-level helpers, which do nothing unless a budget is active in the
+current context (as with profiling), so the default path stays free.
+
+A breached limit raises ResourceLimitExceeded. The budget remembers the
+first breach and fails every later check, so processing stops at the next
+check even where a caller catches per-file errors, and the processor can
+still report the breach as a structured error.
+"""
+
+import time
+import zipfile
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+_active: ContextVar[Optional['Budget']] = ContextVar('epub_sage_budget', default=None)
+
+DEFAULT_MAX_UNCOMPRESSED_BYTES = 1024 * 1024 * 1024
+DEFAULT_MAX_COMPRESSION_RATIO = 100.0
+DEFAULT_MAX_MEMBERS = 10000
+DEFAULT_MAX_ELEMENTS = 1000000
+
+# Members smaller than this skip the ratio check: small repetitive files
+# (CSS, sparse XHTML) compress far better than 100:1 without being bombs
+RATIO_MIN_BYTES = 1024 * 1024
+
+# Streamed documents are checked every this many elements
+ELEMENT_CHECK_INTERVAL = 4096
+
+
+class ResourceLimitExceeded(Exception):
+    """A book breached a ResourceLimits limit.
+
+    ``limit`` is the name of the limit, ``value`` the observed value,
+    ``maximum`` the configured maximum and ``member`` the archive member or
+    document concerned, if any.
+    """
+
+    def __init__(self, limit: str, value: float, maximum: float,
+                 member: Optional[str] = None):
+        where = f" in {member}" if member else ""
+        super().__init__(f"Resource limit exceeded: {limit} is {value}{where} "
+                         f"(maximum {maximum})")
+        self.limit = limit
+        self.value = value
+        self.maximum = maximum
+        self.member = member
+
+    def __reduce__(self) -> Any:
+        return type(self), (self.limit, self.value, self.maximum, self.member)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'limit': self.limit, 'value': self.value,
+                'maximum': self.maximum, 'member': self.member}
+
+
+class ResourceLimits:
+    """Limits for one book; any limit set to None is not enforced.
+
+    ``max_elements`` is checked while each document is read: documents parsed
+    into a tree are counted by a tree-less pre-pass, streamed documents every
+    ELEMENT_CHECK_INTERVAL elements, so neither is built in full first.
+    ``timeout`` (seconds, off by default) bounds the wall-clock time of
+    processing a book. Parsing a single document is not interrupted; the
+    timeout is checked whenever a file is opened and while documents are
+    streamed.
+    """
+
+    def __init__(self, max_uncompressed_bytes: Optional[int] = DEFAULT_MAX_UNCOMPRESSED_BYTES,
+                 max_compression_ratio: Optional[float] = DEFAULT_MAX_COMPRESSION_RATIO,
+                 max_members: Optional[int] = DEFAULT_MAX_MEMBERS,
+                 max_elements: Optional[int] = DEFAULT_MAX_ELEMENTS,
+                 timeout: Optional[float] = None):
+        for name, value in (('max_uncompressed_bytes', max_uncompressed_bytes),
+                            ('max_compression_ratio', max_compression_ratio),
+                            ('max_members', max_members), ('max_elements', max_elements),
+                            ('timeout', timeout)):
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be positive, got {value}")
+        self.max_uncompressed_bytes = max_uncompressed_bytes
+        self.max_compression_ratio = max_compression_ratio
+        self.max_members = max_members
+        self.max_elements = max_elements
+        self.timeout = timeout
+
+    def check_archive(self, infos: Iterable[zipfile.ZipInfo]) -> None:
+        """Check a ZIP central directory; raises ResourceLimitExceeded."""
+        members = 0
+        total = 0
+        for info in infos:
+            members += 1
+            total += info.file_size
+            if (self.max_compression_ratio is not None
+                    and info.file_size >= RATIO_MIN_BYTES):
+                ratio = info.file_size / max(info.compress_size, 1)
+                if ratio > self.max_compression_ratio:
+                    raise _exceeded(ResourceLimitExceeded(
+                        'max_compression_ratio', round(ratio, 1),
+                        self.max_compression_ratio, info.filename))
+        if self.max_members is not None and members > self.max_members:
+            raise _exceeded(ResourceLimitExceeded('max_members', members, self.max_members))
+        if self.max_uncompressed_bytes is not None and total > self.max_uncompressed_bytes:
+            raise _exceeded(ResourceLimitExceeded(
+                'max_uncompressed_bytes', total, self.max_uncompressed_bytes))
+
+    def check_elements(self, elements: int, document: Optional[str] = None) -> None:
+        """Check the element count of a document; raises ResourceLimitExceeded."""
+        if self.max_elements is not None and elements > self.max_elements:
+            raise _exceeded(ResourceLimitExceeded(
+                'max_elements', elements, self.max_elements, document))
+
+    @contextmanager
+    def activate(self) -> Iterator['Budget']:
+        """Start a Budget that module-level helpers check against."""
+        budget = Budget(self)
+        with budget.activate():
+            yield budget
+
+
+class Budget:
+    """Running wall-clock budget of one book, and the first breach seen."""
+
+    def __init__(self, limits: ResourceLimits):
+        self.limits = limits
+        self.started = time.monotonic()
+        self.exceeded: Optional[ResourceLimitExceeded] = None
+
+    @contextmanager
+    def activate(self) -> Iterator['Budget']:
+        """Make this the budget that module-level helpers check against."""
+        token = _active.set(self)
+        try:
+            yield self
+        finally:
+            _active.reset(token)
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left before the timeout (None without a timeout)."""
+        if self.limits.timeout is None:
+            return None
+        return self.limits.timeout - (time.monotonic() - self.started)
+
+    def check_time(self) -> None:
+        if self.exceeded is not None:
+            raise self.exceeded
+        remaining = self.remaining()
+        if remaining is not None and remaining < 0:
+            raise self.breach(ResourceLimitExceeded(
+                'timeout', round(time.monotonic() - self.started, 3), self.limits.timeout or 0))
+
+    def breach(self, error: ResourceLimitExceeded) -> ResourceLimitExceeded:
+        """Record a breach (the first one is kept) and return it."""
+        if self.exceeded is None:
+            self.exceeded = error
+        return error
+
+
+def active_budget() -> Optional[Budget]:
+    """Budget active in the current context, if any."""
+    return _active.get()
+
+
+def check_time() -> None:
+    """Fail once the active budget is spent or breached (no-op without one)."""
+    budget = _active.get()
+    if budget is not None:
+        budget.check_time()
+
+
+def element_limit() -> Optional[int]:
+    """Element limit of the active budget, if any."""
+    budget = _active.get()
+    return budget.limits.max_elements if budget is not None else None
+
+
+def check_elements(elements: int, document: Optional[str] = None) -> None:
+    """Check a document's element count against the active budget (no-op without one)."""
+    budget = _active.get()
+    if budget is not None:
+        budget.limits.check_elements(elements, document)
+
+
+def _exceeded(error: ResourceLimitExceeded) -> ResourceLimitExceeded:
+    """Record a breach on the active budget, if any, and return it."""
+    budget = _active.get()
+    return budget.breach(error) if budget is not None else error
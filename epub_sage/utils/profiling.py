@@ -0,0 +1,133 @@
+"""Opt-in profiling of the processing pipeline.
+
+``SimpleEpubProcessor(profile=True)`` activates a Profiler while it
+processes a book. The processor times its stages with ``stage()``. Deeper
+code reports operations (``operation()``) and counters (``count()``,
+``record_read()``) through module-level helpers, which do nothing unless a
+profiler is active in the current context, so the default path stays free.
+
+CPU time is the calling thread's (``time.thread_time``); work done in
+worker processes (``workers > 1``) shows up as wall time only. Its counters
+are sent back with each job's result and added to the calling profiler.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+_active: ContextVar[Optional['Profiler']] = ContextVar('epub_sage_profiler', default=None)
+
+# Counters that are also reported per stage
+READ_COUNTERS = ('files_read', 'bytes_read')
+
+
+class Profiler:
+    """Wall/CPU time per stage and operation, plus counters, for one book."""
+
+    def __init__(self):
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.operations: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, int] = {
+            'documents_parsed': 0, 'elements_visited': 0, 'blocks_emitted': 0,
+            'files_read': 0, 'bytes_read': 0,
+        }
+        self._started = (time.perf_counter(), time.thread_time())
+
+    @contextmanager
+    def activate(self) -> Iterator['Profiler']:
+        """Make this the profiler that module-level helpers report to."""
+        token = _active.set(self)
+        try:
+            yield self
+        finally:
+            _active.reset(token)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a pipeline stage; repeated entries accumulate."""
+        reads = [self.counters[key] for key in READ_COUNTERS]
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            entry = self.stages.setdefault(
+                name, {'wall_seconds': 0.0, 'cpu_seconds': 0.0, 'files_read': 0, 'bytes_read': 0})
+            entry['wall_seconds'] += time.perf_counter() - wall
+            entry['cpu_seconds'] += time.thread_time() - cpu
+            for key, before in zip(READ_COUNTERS, reads):
+                entry[key] += self.counters[key] - before
+
+    @contextmanager
+    def operation(self, name: str) -> Iterator[None]:
+        """Time one call of an operation nested inside stages."""
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            entry = self.operations.setdefault(
+                name, {'calls': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0})
+            entry['calls'] += 1
+            entry['wall_seconds'] += time.perf_counter() - wall
+            entry['cpu_seconds'] += time.thread_time() - cpu
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Structured timings, with seconds rounded to microseconds."""
+        def rounded(entry: Dict[str, float]) -> Dict[str, Any]:
+            return {key: round(value, 6) if isinstance(value, float) else value
+                    for key, value in entry.items()}
+
+        return {
+            'total': rounded({
+                'wall_seconds': time.perf_counter() - self._started[0],
+                'cpu_seconds': time.thread_time() - self._started[1],
+            }),
+            'stages': {name: rounded(entry) for name, entry in self.stages.items()},
+            'operations': {name: rounded(entry) for name, entry in self.operations.items()},
+            'counters': dict(self.counters),
+        }
+
+
+def active_profiler() -> Optional[Profiler]:
+    """Profiler active in the current context, if any."""
+    return _active.get()
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a pipeline stage on the active profiler (no-op without one)."""
+    profiler = _active.get()
+    if profiler is None:
+        yield
+        return
+    with profiler.stage(name):
+        yield
+
+
+@contextmanager
+def operation(name: str) -> Iterator[None]:
+    """Time an operation on the active profiler (no-op without one)."""
+    profiler = _active.get()
+    if profiler is None:
+        yield
+        return
+    with profiler.operation(name):
+        yield
+
+
+def count(name: str, amount: int = 1) -> None:
+    """Add to a counter on the active profiler (no-op without one)."""
+    profiler = _active.get()
+    if profiler is not None:
+        profiler.count(name, amount)
+
+
+def record_read(size: int) -> None:
+    """Count one file (or archive member) opened for reading."""
+    profiler = _active.get()
+    if profiler is not None:
+        profiler.count('files_read')
+        profiler.count('bytes_read', size)
@@ -0,0 +1,100 @@
+"""Shared fixtures: small synthetic EPUB files built on the fly."""
+
+import os
+import tempfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+# Keep persistent caches out of the user's home directory during tests
+os.environ.setdefault('EPUB_SAGE_CACHE_DIR', tempfile.mkdtemp(prefix='epub-sage-cache-'))
+
+XHTML = '''<?xml version="1.0" encoding="utf-8"?>
+<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops">
+<head><title>{title}</title></head>
+<body>{body}</body></html>'''
+
+CONTAINER = '''<?xml version="1.0"?>
+<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">
+<rootfiles><rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/></rootfiles>
+</container>'''
+
+
+def _chapter_body(n: int, sections: int) -> str:
+    parts = [
+        f'<section id="ch{n}"><h1>Chapter {n}: Title {n}</h1>',
+        f'<p>Intro paragraph for chapter {n}.</p>',
+    ]
+    for s in range(1, sections + 1):
+        parts.append(
+            f'<section id="ch{n}-s{s}"><h2>Section {n}.{s}</h2>'
+            f'<p>Body text of section {n}.{s} with some words.</p>'
+            f'<figure><img src="../images/fig{n}_{s}.png" alt="Figure {n}.{s}"/>'
+            f'<h6>Caption {n}.{s}</h6></figure>'
+            '<ul><li>One</li><li>Two</li></ul>'
+            '<nav><a href="#top">Skip</a></nav>'
+            '</section>')
+    parts.append('</section>')
+    return ''.join(parts)
+
+
+def build_epub(path: Path, chapters: int = 3, sections: int = 2,
+               image_size: int = 512) -> Path:
+    """Write a minimal EPUB 2 book with an NCX TOC and per-section images."""
+    manifest = ['<item id="ncx" href="toc.ncx" media-type="application/x-dtbncx+xml"/>']
+    spine = []
+    nav_points = []
+    order = 1
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(zipfile.ZipInfo('mimetype'), 'application/epub+zip',
+                    compress_type=zipfile.ZIP_STORED)
+        zf.writestr('META-INF/container.xml', CONTAINER)
+        for n in range(1, chapters + 1):
+            manifest.append(
+                f'<item id="chapter-{n}" href="text/ch{n}.xhtml" media-type="application/xhtml+xml"/>')
+            spine.append(f'<itemref idref="chapter-{n}"/>')
+            zf.writestr(f'OEBPS/text/ch{n}.xhtml',
+                        XHTML.format(title=f'Chapter {n}', body=_chapter_body(n, sections)))
+            children = []
+            for s in range(1, sections + 1):
+                manifest.append(
+                    f'<item id="fig{n}_{s}" href="images/fig{n}_{s}.png" media-type="image/png"/>')
+                zf.writestr(f'OEBPS/images/fig{n}_{s}.png', bytes(
+                    (i * n * s) % 251 for i in range(image_size)))
+                children.append(
+                    f'<navPoint id="np-{n}-{s}" playOrder="{order + s}">'
+                    f'<navLabel><text>Section {n}.{s}</text></navLabel>'
+                    f'<content src="text/ch{n}.xhtml#ch{n}-s{s}"/></navPoint>')
+            nav_points.append(
+                f'<navPoint id="np-{n}" playOrder="{order}">'
+                f'<navLabel><text>Chapter {n}: Title {n}</text></navLabel>'
+                f'<content src="text/ch{n}.xhtml#ch{n}"/>' + ''.join(children) + '</navPoint>')
+            order += sections + 1
+        zf.writestr('OEBPS/toc.ncx',
+                    '<?xml version="1.0"?><ncx xmlns="http://www.daisy.org/z3986/2005/ncx/">'
+                    '<navMap>' + ''.join(nav_points) + '</navMap></ncx>')
+        zf.writestr('OEBPS/content.opf', f'''<?xml version="1.0" encoding="utf-8"?>
+<package xmlns="http://www.idpf.org/2007/opf" version="2.0" unique-identifier="bookid">
+<metadata xmlns:dc="http://purl.org/dc/elements/1.1/">
+<dc:title>Sample Book</dc:title><dc:creator>Jane Doe</dc:creator>
+<dc:language>en</dc:language><dc:identifier id="bookid">urn:isbn:9781234567897</dc:identifier>
+</metadata>
+<manifest>{''.join(manifest)}</manifest>
+<spine toc="ncx">{''.join(spine)}</spine>
+</package>''')
+    return path
+
+
+@pytest.fixture
+def epub_factory(tmp_path):
+    """Return a callable that builds a synthetic EPUB under tmp_path."""
+    def factory(name: str = 'book.epub', **kwargs) -> Path:
+        return build_epub(tmp_path / name, **kwargs)
+    return factory
+
+
+@pytest.fixture
+def sample_epub(epub_factory) -> Path:
+    """A small three-chapter EPUB."""
+    return epub_factory()
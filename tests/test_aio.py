@@ -0,0 +1,191 @@
+"""Tests for the asyncio API."""
+
+import asyncio
+import json
+import threading
+
+import pytest
+
+from epub_sage import (
+    ResourceLimits, ResultCache, SimpleEpubProcessor, aprocess_epub, aprocess_many, asave_to_json,
+)
+from epub_sage.extractors.epub_archive import EpubArchive
+from epub_sage.processors.chapter_store import SpilledList
+
+
+def _summary(result):
+    return result.success, result.title, result.total_chapters, result.total_words
+
+
+class TestAprocessEpub:
+    """Single-book processing."""
+
+    def test_matches_sync_processing(self, sample_epub):
+        result = asyncio.run(aprocess_epub(str(sample_epub)))
+        assert _summary(result) == _summary(SimpleEpubProcessor().process_epub(str(sample_epub)))
+
+    def test_missing_file(self, tmp_path):
+        result = asyncio.run(aprocess_epub(str(tmp_path / 'missing.epub')))
+        assert not result.success
+
+    def test_timeout_stops_worker_thread(self, epub_factory, monkeypatch):
+        epub = str(epub_factory(chapters=6))
+        opened = []
+        real_open = EpubArchive.open
+
+        def slow_open(self, path):
+            threading.Event().wait(0.05)
+            member = real_open(self, path)
+            opened.append(path)
+            return member
+
+        monkeypatch.setattr(EpubArchive, 'open', slow_open)
+        asyncio.run(aprocess_epub(epub))
+        full_run = len(opened)
+        opened.clear()
+
+        async def run():
+            with pytest.raises(asyncio.TimeoutError):
+                await aprocess_epub(epub, timeout=0.1)
+            # Give the worker thread time to reach its next member read and stop
+            await asyncio.sleep(0.5)
+
+        asyncio.run(run())
+        assert len(opened) < full_run
+
+    def test_semaphore_limits_concurrency(self, epub_factory, monkeypatch):
+        paths = [str(epub_factory(f'b{n}.epub')) for n in range(4)]
+        running, peak = [0], [0]
+        real = SimpleEpubProcessor.process_archive
+
+        def counting(self, *args, **kwargs):
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+            try:
+                return real(self, *args, **kwargs)
+            finally:
+                running[0] -= 1
+
+        monkeypatch.setattr(SimpleEpubProcessor, 'process_archive', counting)
+
+        async def run():
+            semaphore = asyncio.Semaphore(1)
+            return await asyncio.gather(*(aprocess_epub(p, semaphore=semaphore) for p in paths))
+
+        assert all(r.success for r in asyncio.run(run()))
+        assert peak[0] == 1
+
+
+class TestProcessorOptions:
+    """Thread-executor runs go through process_epub."""
+
+    def test_result_cache(self, sample_epub, tmp_path, monkeypatch):
+        runs = []
+        real = SimpleEpubProcessor.process_archive
+
+        def counting(self, *args, **kwargs):
+            runs.append(1)
+            return real(self, *args, **kwargs)
+
+        monkeypatch.setattr(SimpleEpubProcessor, 'process_archive', counting)
+        cache = ResultCache(str(tmp_path / 'results.sqlite3'))
+        try:
+            first = asyncio.run(aprocess_epub(str(sample_epub), result_cache=cache))
+            second = asyncio.run(aprocess_epub(str(sample_epub), result_cache=cache))
+        finally:
+            cache.close()
+        assert runs == [1]
+        assert second.model_dump() == first.model_dump()
+
+    def test_limits(self, sample_epub):
+        result = asyncio.run(aprocess_epub(str(sample_epub),
+                                           limits=ResourceLimits(max_elements=5)))
+        assert result.limit_exceeded['limit'] == 'max_elements'
+
+    def test_spill_chapters(self, epub_factory):
+        epub = str(epub_factory(chapters=3))
+        with asyncio.run(aprocess_epub(epub, spill_chapters=True)) as result:
+            assert any(isinstance(chapter['sections'], SpilledList)
+                       for chapter in result.chapters)
+            assert result.model_dump() == SimpleEpubProcessor().process_epub(epub).model_dump()
+
+    def test_cancelled_run_is_not_cached(self, epub_factory, tmp_path, monkeypatch):
+        epub = str(epub_factory(chapters=6))
+        real_open = EpubArchive.open
+
+        def slow_open(self, path):
+            threading.Event().wait(0.05)
+            return real_open(self, path)
+
+        monkeypatch.setattr(EpubArchive, 'open', slow_open)
+        cache = ResultCache(str(tmp_path / 'results.sqlite3'))
+
+        async def run():
+            with pytest.raises(asyncio.TimeoutError):
+                await aprocess_epub(epub, timeout=0.1, result_cache=cache)
+            await asyncio.sleep(0.5)
+            return await aprocess_epub(epub, result_cache=cache)
+
+        try:
+            result = asyncio.run(run())
+        finally:
+            cache.close()
+        assert _summary(result) == _summary(SimpleEpubProcessor().process_epub(epub))
+
+
+class TestAprocessMany:
+    """Concurrent batches."""
+
+    def test_yields_every_book(self, epub_factory, tmp_path):
+        paths = [str(epub_factory(f'b{n}.epub', chapters=n + 1)) for n in range(3)]
+        paths.append(str(tmp_path / 'missing.epub'))
+
+        async def run():
+            return {path: result async for path, result in aprocess_many(paths, concurrency=2)}
+
+        results = asyncio.run(run())
+        assert sorted(results) == sorted(paths)
+        assert [results[p].total_chapters for p in paths[:3]] == [1, 2, 3]
+        assert not results[paths[3]].success
+
+    def test_timed_out_processor_is_not_reused(self, epub_factory, monkeypatch):
+        paths = [str(epub_factory('slow.epub')), str(epub_factory('b0.epub')),
+                 str(epub_factory('b1.epub'))]
+        used = {}
+        real = SimpleEpubProcessor.process_epub
+
+        def tracking(self, epub_path, *args, **kwargs):
+            used[epub_path] = self
+            if epub_path == paths[0]:
+                # A parse that the checkpoint cannot interrupt
+                threading.Event().wait(0.5)
+            return real(self, epub_path, *args, **kwargs)
+
+        monkeypatch.setattr(SimpleEpubProcessor, 'process_epub', tracking)
+
+        async def run():
+            return {path: result async for path, result in
+                    aprocess_many(paths, concurrency=1, timeout=0.2)}
+
+        results = asyncio.run(run())
+        assert 'timed out' in results[paths[0]].errors[0]
+        assert used[paths[1]] is not used[paths[0]]
+        assert used[paths[2]] is used[paths[1]]
+
+    def test_early_close_cancels_pending(self, epub_factory):
+        paths = [str(epub_factory(f'b{n}.epub')) for n in range(6)]
+
+        async def run():
+            books = aprocess_many(paths, concurrency=2)
+            first = await books.__anext__()
+            await books.aclose()
+            return first
+
+        path, result = asyncio.run(run())
+        assert path in paths and result.success
+
+
+def test_asave_to_json(tmp_path):
+    target = tmp_path / 'out.json'
+    asyncio.run(asave_to_json({'title': 'Ünïcode'}, str(target)))
+    assert json.loads(target.read_text(encoding='utf-8')) == {'title': 'Ünïcode'}
@@ -0,0 +1,77 @@
+"""Tests for the per-document anchor index."""
+
+import pytest
+
+from epub_sage.extractors import lxml_extractors
+from epub_sage.extractors.backends import Bs4Backend, LxmlBackend
+
+from .test_lxml_backend import ANCHORS, DOCUMENT
+
+DUPLICATES = '''<?xml version="1.0" encoding="utf-8"?>
+<html xmlns="http://www.w3.org/1999/xhtml"><body>
+<a name="dup"/>
+<div id="outer"><p id="inner">Inner</p><p id="dup">By id</p></div>
+<p id="inner">Second inner</p>
+</body></html>'''
+
+
+@pytest.fixture(params=[Bs4Backend(), LxmlBackend()], ids=['bs4', 'lxml'])
+def backend(request):
+    return request.param
+
+
+def _parse(backend, tmp_path, text):
+    path = tmp_path / 'doc.xhtml'
+    path.write_text(text, encoding='utf-8')
+    return backend.parse_file(str(path))
+
+
+class TestAnchorIndex:
+    """Lookups and containment flags."""
+
+    def test_id_preferred_over_earlier_name(self, backend, tmp_path):
+        index = backend.anchor_index(_parse(backend, tmp_path, DUPLICATES))
+        assert index.find('dup').get('id') == 'dup'
+        assert index.by_id('missing') is None and index.find('missing') is None
+
+    def test_first_element_wins(self, backend, tmp_path):
+        index = backend.anchor_index(_parse(backend, tmp_path, DUPLICATES))
+        assert index.by_id('inner').get('id') == 'inner'
+        assert index.contains(index.by_id('outer'), 'inner')
+
+    def test_containment(self, backend, tmp_path):
+        index = backend.anchor_index(_parse(backend, tmp_path, DOCUMENT), ANCHORS)
+        chapter, first = index.by_id('ch'), index.by_id('s1')
+        assert index.contains(chapter, 's2')
+        assert not index.contains(first, 's2')
+        assert not index.contains(first, 's1')
+        assert index.contains_any(chapter, frozenset({'s1', 'missing'}))
+        assert not index.contains_any(first, {'s2'})
+
+    def test_containment_limited_to_tracked_anchors(self, backend, tmp_path):
+        index = backend.anchor_index(_parse(backend, tmp_path, DOCUMENT), {'s1'})
+        assert index.contains(index.by_id('ch'), 's1')
+        assert not index.contains(index.by_id('ch'), 's2')
+
+
+class TestIndexedExtraction:
+    """A shared index gives the same sections as per-call lookups."""
+
+    @pytest.mark.parametrize('start,end', [
+        ('ch', 's1'), ('s1', 's2'), ('s2', None), (None, 'ch'), ('named-anchor', None),
+    ])
+    def test_same_blocks_and_terms(self, backend, tmp_path, start, end):
+        document = _parse(backend, tmp_path, DOCUMENT)
+        index = backend.anchor_index(document, ANCHORS)
+        assert (backend.section_blocks(document, start, end, ANCHORS, True, index)
+                == backend.section_blocks(document, start, end, ANCHORS, True))
+        if start:
+            assert (backend.anchor_terms(document, start, index)
+                    == backend.anchor_terms(document, start))
+
+    def test_no_subtree_search_per_sibling(self, tmp_path, monkeypatch):
+        root = _parse(LxmlBackend(), tmp_path, DOCUMENT)
+        index = lxml_extractors.build_anchor_index(root, ANCHORS)
+        monkeypatch.setattr(lxml_extractors, 'find_by_attr', None)
+        assert lxml_extractors.extract_section_between_anchors(root, 's1', 's2', ANCHORS, index=index)
+        assert lxml_extractors.extract_section_between_anchors(root, 'ch', 's1', ANCHORS, index=index)
@@ -0,0 +1,61 @@
+"""Tests for process_many batch processing."""
+
+import os
+
+import pytest
+
+from epub_sage import BatchStats, SimpleEpubProcessor, process_many
+from epub_sage.processors import batch
+
+
+def _crash_on_bad(path, include_html):
+    """Job that kills its worker on files named bad*."""
+    if os.path.basename(path).startswith('bad'):
+        os._exit(1)
+    return batch._run_book(SimpleEpubProcessor(), path, include_html)
+
+
+@pytest.fixture
+def books(epub_factory, tmp_path):
+    paths = [str(epub_factory(f'book{n}.epub', chapters=n + 1)) for n in range(4)]
+    broken = tmp_path / 'broken.epub'
+    broken.write_bytes(b'not a zip')
+    return paths + [str(broken), str(tmp_path / 'missing.epub')]
+
+
+def _summary(result):
+    return result.success, result.title, result.total_chapters, result.total_words
+
+
+class TestProcessMany:
+    """Results, failure isolation and stats."""
+
+    @pytest.mark.parametrize('workers', [1, 2])
+    def test_matches_single_book_processing(self, books, workers):
+        stats = BatchStats()
+        results = dict(process_many(books, workers=workers, stats=stats))
+
+        assert sorted(results) == sorted(books)
+        processor = SimpleEpubProcessor()
+        for path in books:
+            assert _summary(results[path]) == _summary(processor.process_epub(path))
+        assert stats.books == 6 and stats.failed == 2
+        assert stats.to_dict()['books_per_second'] > 0
+
+    def test_serial_keeps_order(self, books):
+        assert [path for path, _ in process_many(books, workers=1)] == books
+
+    def test_in_flight_cap_still_runs_every_book(self, books):
+        results = list(process_many(books, workers=2, max_in_flight_mb=0))
+        assert len(results) == len(books)
+
+    def test_worker_crash_is_isolated(self, books, tmp_path, monkeypatch):
+        bad = tmp_path / 'bad.epub'
+        bad.write_bytes(open(books[0], 'rb').read())
+        monkeypatch.setattr(batch, '_process_job', _crash_on_bad)
+
+        results = dict(process_many(books[:3] + [str(bad)], workers=2))
+
+        assert not results[str(bad)].success
+        assert 'crashed' in results[str(bad)].errors[0]
+        assert all(results[path].success for path in books[:3])
@@ -0,0 +1,66 @@
+"""Tests for the book-level block table."""
+
+import json
+
+import pytest
+
+from epub_sage import SimpleEpubProcessor
+from epub_sage.processors.block_table import BlockTable
+
+
+def _restore(result, item):
+    """Copy of a chapter or section with its content ranges resolved."""
+    restored = {('content' if key == 'content_range' else key): value
+                for key, value in item.items()}
+    if 'content_range' in item:
+        restored['content'] = result.block_content(item)
+    if 'sections' in item:
+        restored['sections'] = [_restore(result, section) for section in item['sections']]
+    if 'subsections' in item:
+        restored['subsections'] = [_restore(result, sub) for sub in item['subsections']]
+    return restored
+
+
+class TestBlockTable:
+    def test_ranges(self):
+        table = BlockTable()
+        chapter = {'title': 'A', 'content': [{'text': 'x'}], 'sections': [
+            {'title': 'S', 'content': [{'text': 'y'}, {'text': 'z'}],
+             'subsections': [{'title': 'T', 'content': []}]}]}
+        table.index_chapter(chapter)
+
+        assert list(chapter) == ['title', 'content_range', 'sections']
+        assert chapter['content_range'] == [0, 1]
+        section = chapter['sections'][0]
+        assert section['content_range'] == [1, 3]
+        assert section['subsections'][0]['content_range'] == [3, 3]
+        assert [block['text'] for block in table.blocks] == ['x', 'y', 'z']
+
+
+class TestBlockTableProcessing:
+    def test_restores_default_chapters(self, epub_factory):
+        epub = str(epub_factory(chapters=3))
+        plain = SimpleEpubProcessor().process_epub(epub)
+        tabled = SimpleEpubProcessor(block_table=True).process_epub(epub)
+
+        assert plain.blocks is None and tabled.blocks
+        assert [_restore(tabled, chapter) for chapter in tabled.chapters] == plain.chapters
+
+    def test_selected_files(self, epub_factory):
+        epub = str(epub_factory(chapters=3))
+        plain = SimpleEpubProcessor().process_epub(epub, spine_range=(0, 2))
+        tabled = SimpleEpubProcessor(block_table=True).process_epub(epub, spine_range=(0, 2))
+        assert [_restore(tabled, chapter) for chapter in tabled.chapters] == plain.chapters
+
+    def test_smaller_indented_export(self, epub_factory):
+        epub = str(epub_factory(chapters=3))
+        plain = SimpleEpubProcessor().process_epub(epub)
+        tabled = SimpleEpubProcessor(block_table=True).process_epub(epub)
+        size = len(json.dumps({'chapters': plain.chapters}, indent=2))
+        tabled_size = len(json.dumps(
+            {'chapters': tabled.chapters, 'blocks': tabled.blocks}, indent=2))
+        assert tabled_size < size
+
+    def test_rejects_spilling(self):
+        with pytest.raises(ValueError):
+            SimpleEpubProcessor(spill_chapters=True, block_table=True)
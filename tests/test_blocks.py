@@ -0,0 +1,70 @@
+"""Tests for compact content-pass blocks."""
+
+import json
+import os
+import pickle
+
+from epub_sage import SimpleEpubProcessor
+from epub_sage.extractors import lxml_extractors
+from epub_sage.extractors.blocks import ContentBlock, materialize_blocks
+from epub_sage.extractors.content_extractor import (
+    compact_book_content, extract_book_content, extract_content_sections,
+)
+from epub_sage.extractors.streaming_extractor import stream_content_sections
+from epub_sage.extractors.epub_archive import EpubArchive
+
+
+class TestContentBlock:
+    def test_reads_like_a_dict(self):
+        block = ContentBlock('p', 'Hello', '<p>Hello</p>', [])
+        assert block['text'] == 'Hello'
+        assert block.get('is_header') is None and 'is_header' not in block
+        assert block == {'tag': 'p', 'text': 'Hello', 'html': '<p>Hello</p>', 'images': []}
+
+        block['images'] = ['a.png']
+        assert dict(block)['images'] == ['a.png']
+
+    def test_header_key_order(self):
+        header = ContentBlock('h1', 'Title', '<h1>Title</h1>', [], is_header=True)
+        assert list(header.to_dict()) == ['tag', 'text', 'html', 'images', 'is_header']
+        assert header['is_header'] is True
+
+    def test_pickle(self):
+        block = ContentBlock('p', 'x', '<p>x</p>', ['i.png'])
+        assert pickle.loads(pickle.dumps(block)) == block
+
+    def test_materialize(self):
+        blocks = [ContentBlock('p', 'x', '', []), {'type': 'paragraph'}]
+        plain = materialize_blocks(blocks)
+        assert all(type(block) is dict for block in plain)
+
+
+class TestBlocksInPipeline:
+    def test_content_pass_is_compact(self, sample_epub):
+        with EpubArchive(str(sample_epub)) as archive:
+            content = compact_book_content(archive.root, archive)
+        blocks = [block for sections in content.values()
+                  for section in sections for block in section['content']]
+        assert blocks and all(isinstance(block, ContentBlock) for block in blocks)
+
+    def test_public_content_functions_return_dicts(self, sample_epub):
+        with EpubArchive(str(sample_epub)) as archive:
+            content = extract_book_content(archive.root, archive)
+            path = os.path.join(archive.root, 'OEBPS', 'text', 'ch1.xhtml')
+            sections = {
+                'bs4': extract_content_sections(path, archive),
+                'lxml': lxml_extractors.extract_content_sections(
+                    lxml_extractors.parse_html_file(path, archive)),
+                'stream': list(stream_content_sections(path, archive)),
+            }
+        json.dumps(content)
+        blocks = [block for found in [*content.values(), *sections.values()]
+                  for section in found for block in section['content']]
+        assert blocks and all(type(block) is dict for block in blocks)
+
+    def test_chapters_hold_plain_dicts(self, sample_epub):
+        result = SimpleEpubProcessor(stages={'metadata', 'content'}).process_epub(
+            str(sample_epub))
+        blocks = [block for chapter in result.chapters for block in chapter['content']]
+        assert blocks and all(type(block) is dict for block in blocks)
+        assert blocks[0]['is_header'] is True
@@ -0,0 +1,92 @@
+"""Tests for spill-to-disk chapter storage."""
+
+import copy
+import json
+import pickle
+
+import pytest
+
+from epub_sage import SimpleEpubProcessor, process_many, save_to_json
+from epub_sage.processors.chapter_store import ChapterStore, SpilledList
+
+
+class TestChapterStore:
+    def test_round_trip(self, tmp_path):
+        store = ChapterStore(str(tmp_path))
+        first = store.append([{'text': 'a'}, {'text': 'ü'}])
+        second = store.append([1, 2, 3])
+
+        assert len(first) == 2 and first[1] == {'text': 'ü'}
+        assert list(second) == [1, 2, 3] and second == [1, 2, 3]
+        assert first.load() == [{'text': 'a'}, {'text': 'ü'}]
+        assert store.bytes_written > 0
+
+    def test_spill_keeps_empty_bodies(self, tmp_path):
+        chapter = {'content': [], 'sections': [{'title': 'S'}]}
+        ChapterStore(str(tmp_path)).spill(chapter)
+        assert chapter['content'] == []
+        assert isinstance(chapter['sections'], SpilledList)
+
+    def test_pickles_as_list(self, tmp_path):
+        handle = ChapterStore(str(tmp_path)).append(['x'])
+        assert pickle.loads(pickle.dumps(handle)) == ['x']
+
+    def test_close(self, tmp_path):
+        with ChapterStore(str(tmp_path)) as store:
+            handle = store.append(['x'])
+            assert handle == ['x'] and not store.closed
+        assert store.closed
+        with pytest.raises(ValueError):
+            handle.load()
+        handle.close()  # already closed
+
+
+class TestSpilledProcessing:
+    def test_matches_in_memory_result(self, epub_factory):
+        epub = str(epub_factory(chapters=4))
+        plain = SimpleEpubProcessor().process_epub(epub)
+        spilled = SimpleEpubProcessor(spill_chapters=True).process_epub(epub)
+
+        assert spilled.model_dump() == plain.model_dump()
+        assert any(isinstance(chapter['sections'], SpilledList) for chapter in spilled.chapters)
+
+    def test_json_export(self, epub_factory, tmp_path):
+        epub = str(epub_factory(chapters=2))
+        spilled = SimpleEpubProcessor(spill_chapters=True).process_epub(epub)
+        output = tmp_path / 'book.json'
+        save_to_json({'chapters': spilled.chapters}, str(output))
+
+        plain = SimpleEpubProcessor().process_epub(epub)
+        assert json.loads(output.read_text(encoding='utf-8'))['chapters'] == plain.chapters
+        assert json.loads(spilled.model_dump_json())['chapters'] == plain.chapters
+
+    def test_result_close_releases_store(self, epub_factory):
+        epub = str(epub_factory(chapters=2))
+        with SimpleEpubProcessor(spill_chapters=True).process_epub(epub) as result:
+            sections = result.chapters[0]['sections']
+            assert len(sections.load()) == len(sections)
+        with pytest.raises(ValueError):
+            sections.load()
+
+    def test_result_pickles_and_copies_as_plain_lists(self, epub_factory):
+        epub = str(epub_factory(chapters=2))
+        plain = SimpleEpubProcessor().process_epub(epub)
+        with SimpleEpubProcessor(spill_chapters=True).process_epub(epub) as spilled:
+            copies = [pickle.loads(pickle.dumps(spilled)), copy.deepcopy(spilled)]
+        for result in copies:
+            assert result.model_dump() == plain.model_dump()
+            assert isinstance(result.chapters[0]['sections'], list)
+            result.close()
+
+    def test_process_many_returns_spilled_results(self, epub_factory):
+        books = [str(epub_factory(f'book{n}.epub', chapters=n + 1)) for n in range(2)]
+        results = dict(process_many(books, workers=2, spill_chapters=True))
+        for path in books:
+            assert results[path].success
+            assert (results[path].model_dump() ==
+                    SimpleEpubProcessor().process_epub(path).model_dump())
+
+    def test_close_without_spill_is_noop(self, epub_factory):
+        result = SimpleEpubProcessor().process_epub(str(epub_factory(chapters=1)))
+        result.close()
+        assert result.chapters[0]['sections'] is not None
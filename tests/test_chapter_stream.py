@@ -0,0 +1,106 @@
+"""Tests for SimpleEpubProcessor.iter_chapters()."""
+
+import zipfile
+
+import pytest
+
+from epub_sage import SimpleEpubProcessor
+from epub_sage.extractors import toc_content_extractor
+from epub_sage.extractors.epub_archive import EpubArchive
+from epub_sage.processors import chapter_stream
+
+
+@pytest.fixture
+def processor(tmp_path):
+    return SimpleEpubProcessor(temp_dir=str(tmp_path))
+
+
+class TestIterChapters:
+    """Chapters and summary match process_epub()."""
+
+    @pytest.mark.parametrize('include_html', [False, True])
+    def test_matches_process_epub(self, processor, epub_factory, include_html):
+        epub = str(epub_factory(chapters=4, sections=3))
+        full = processor.process_epub(epub, include_html=include_html)
+        stream = processor.iter_chapters(epub, include_html=include_html)
+
+        assert list(stream) == full.chapters
+        assert (stream.summary.model_dump(exclude={'chapters'})
+                == full.model_dump(exclude={'chapters'}))
+        assert stream.summary.chapters == []
+
+    def test_without_opf(self, processor, epub_factory, tmp_path):
+        source = epub_factory(chapters=2)
+        stripped = tmp_path / 'no_opf.epub'
+        with zipfile.ZipFile(source) as src, zipfile.ZipFile(stripped, 'w') as dst:
+            for info in src.infolist():
+                if not info.filename.endswith('.opf'):
+                    dst.writestr(info, src.read(info))
+
+        full = processor.process_epub(str(stripped))
+        stream = processor.iter_chapters(str(stripped))
+        assert list(stream) == full.chapters
+        assert stream.summary.total_chapters == full.total_chapters == 2
+
+    def test_toc_sections_extracted_per_chapter(self, processor, epub_factory, monkeypatch):
+        epub = str(epub_factory(chapters=3))
+        calls = []
+        real = chapter_stream.extract_by_toc
+
+        def counting(path, *args, **kwargs):
+            calls.append(path)
+            return real(path, *args, **kwargs)
+
+        monkeypatch.setattr(chapter_stream, 'extract_by_toc', counting)
+        monkeypatch.setattr(toc_content_extractor, 'extract_book_by_toc', None)
+        stream = processor.iter_chapters(epub)
+        next(stream)
+        assert [p.rsplit('/', 1)[-1] for p in calls] == ['ch1.xhtml']
+        stream.close()
+        assert stream.summary is None
+
+    def test_missing_file(self, processor, tmp_path):
+        stream = processor.iter_chapters(str(tmp_path / 'missing.epub'))
+        assert list(stream) == []
+        assert not stream.summary.success
+
+
+class TestPartialProcessing:
+    """process_epub(hrefs=..., spine_range=...)."""
+
+    @pytest.fixture
+    def book(self, processor, epub_factory):
+        epub = str(epub_factory(chapters=5, sections=2))
+        return epub, processor.process_epub(epub)
+
+    def test_spine_range(self, processor, book):
+        epub, full = book
+        result = processor.process_epub(epub, spine_range=(1, 3))
+        assert result.chapters == full.chapters[1:3]
+        assert result.total_chapters == 2
+        assert result.total_words == sum(c['word_count'] for c in full.chapters[1:3])
+        assert result.title == full.title
+
+    def test_hrefs_root_or_opf_relative(self, processor, book):
+        epub, full = book
+        result = processor.process_epub(epub, hrefs=['text/ch4.xhtml', 'OEBPS/text/ch2.xhtml#ch2'])
+        assert result.chapters == [full.chapters[1], full.chapters[3]]
+
+    def test_reads_only_selected_members(self, processor, book, monkeypatch):
+        epub, _ = book
+        opened = []
+        real_open = EpubArchive.open
+
+        def recording(self, path):
+            opened.append(path.rsplit('/', 1)[-1])
+            return real_open(self, path)
+
+        monkeypatch.setattr(EpubArchive, 'open', recording)
+        processor.process_epub(epub, spine_range=(2, 3))
+        assert [name for name in opened if name.endswith('.xhtml')] == ['ch3.xhtml']
+
+    def test_unknown_href(self, processor, book):
+        epub, _ = book
+        result = processor.process_epub(epub, hrefs=['text/missing.xhtml'])
+        assert not result.success and result.chapters == []
+        assert 'Requested files not found: text/missing.xhtml' in result.errors
@@ -0,0 +1,73 @@
+"""Tests for container.xml-driven rootfile resolution."""
+
+import zipfile
+
+import pytest
+
+from epub_sage import EpubArchive, EpubExtractor, read_metadata
+from epub_sage.extractors import container
+from epub_sage.extractors.epub_validator import validate_epub_structure
+
+MULTI_CONTAINER = '''<?xml version="1.0"?>
+<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container"><rootfiles>
+<rootfile full-path="fixed/package.opf" media-type="application/oebps-package+xml"/>
+<rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/>
+</rootfiles></container>'''
+
+
+@pytest.fixture
+def multi_rendition_epub(sample_epub, tmp_path):
+    """The sample book with a second, default rendition and a stray root OPF."""
+    path = tmp_path / 'multi.epub'
+    with zipfile.ZipFile(sample_epub) as src, zipfile.ZipFile(path, 'w') as dst:
+        for info in src.infolist():
+            data = src.read(info)
+            if info.filename == 'META-INF/container.xml':
+                data = MULTI_CONTAINER.encode()
+            dst.writestr(info.filename, data)
+        opf = src.read('OEBPS/content.opf').replace(b'Sample Book', b'Fixed Layout')
+        dst.writestr('fixed/package.opf', opf)
+        dst.writestr('content.opf', b'<package/>')
+    return path
+
+
+class TestRootfiles:
+    def test_renditions_in_container_order(self, multi_rendition_epub):
+        with EpubArchive(str(multi_rendition_epub)) as archive:
+            assert archive.rootfiles() == ('fixed/package.opf', 'OEBPS/content.opf')
+            assert EpubExtractor().find_content_opf(archive.root, archive) == \
+                archive.full_path('fixed/package.opf')
+        assert read_metadata(str(multi_rendition_epub)).title == 'Fixed Layout'
+
+    def test_info_and_validation(self, multi_rendition_epub):
+        info = EpubExtractor().get_epub_info(str(multi_rendition_epub))
+        assert info['content_opf'] == 'fixed/package.opf'
+        assert info['rootfiles'] == ['fixed/package.opf', 'OEBPS/content.opf']
+        assert validate_epub_structure(str(multi_rendition_epub))['has_content_opf']
+
+    def test_missing_container_falls_back_to_opf_member(self, sample_epub, tmp_path):
+        path = tmp_path / 'bare.epub'
+        with zipfile.ZipFile(sample_epub) as src, zipfile.ZipFile(path, 'w') as dst:
+            for info in src.infolist():
+                if info.filename != 'META-INF/container.xml':
+                    dst.writestr(info.filename, src.read(info))
+        with EpubArchive(str(path)) as archive:
+            assert archive.rootfiles() == ('OEBPS/content.opf',)
+
+    def test_extracted_directory(self, multi_rendition_epub, tmp_path):
+        with zipfile.ZipFile(multi_rendition_epub) as zf:
+            zf.extractall(tmp_path / 'out')
+        extractor = EpubExtractor(base_dir=str(tmp_path / 'uploads'))
+        assert extractor.find_content_opf(str(tmp_path / 'out')) == \
+            str(tmp_path / 'out' / 'fixed' / 'package.opf')
+
+    def test_resolved_once_per_book(self, sample_epub, monkeypatch):
+        container.clear_cache()
+        calls = []
+        read = container._read_rootfiles
+        monkeypatch.setattr(container, '_read_rootfiles',
+                            lambda zip_file: calls.append(1) or read(zip_file))
+        EpubExtractor().get_epub_info(str(sample_epub))
+        validate_epub_structure(str(sample_epub))
+        read_metadata(str(sample_epub))
+        assert len(calls) == 1
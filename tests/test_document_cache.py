@@ -0,0 +1,71 @@
+"""Tests for the per-book parsed document cache."""
+
+import os
+
+from epub_sage import EpubArchive, SimpleEpubProcessor
+from epub_sage.extractors import backends, document_cache
+from epub_sage.extractors.content_extractor import extract_content_sections
+from epub_sage.extractors.document_cache import DocumentCache
+
+
+def _chapter_path(archive, n=1):
+    return os.path.join(archive.root, 'OEBPS', 'text', f'ch{n}.xhtml')
+
+
+class TestDocumentCache:
+    """Caching, release and memory cap."""
+
+    def test_get_parses_once(self, sample_epub):
+        with EpubArchive(str(sample_epub)) as archive:
+            cache = DocumentCache(archive.root, archive, consumers=2)
+            path = _chapter_path(archive)
+            assert cache.get(path) is cache.get(path)
+            assert cache.parses == 1 and cache.hits == 1
+            assert 'OEBPS/text/ch1.xhtml' in cache._docs
+
+    def test_released_by_last_consumer(self, sample_epub):
+        with EpubArchive(str(sample_epub)) as archive:
+            cache = DocumentCache(archive.root, archive, consumers=2)
+            path = _chapter_path(archive)
+            cache.get(path)
+            cache.release(path)
+            assert path in cache
+            cache.release(path)
+            assert path not in cache
+            assert cache.total_bytes == 0
+
+    def test_memory_cap_evicts_least_recently_used(self, sample_epub):
+        with EpubArchive(str(sample_epub)) as archive:
+            one, two = _chapter_path(archive, 1), _chapter_path(archive, 2)
+            size = archive.file_size(one) * document_cache.TREE_OVERHEAD_FACTOR
+            cache = DocumentCache(archive.root, archive, max_bytes=size + 1)
+            cache.get(one)
+            cache.get(two)
+            assert one not in cache and two in cache
+            assert cache.evictions == 1
+
+    def test_shared_tree_is_left_unmodified(self, sample_epub):
+        with EpubArchive(str(sample_epub)) as archive:
+            cache = DocumentCache(archive.root, archive, consumers=2)
+            path = _chapter_path(archive)
+            before = str(cache.get(path))
+            sections = extract_content_sections(path, archive, cache)
+            assert sections
+            assert str(cache.get(path)) == before
+            assert '<nav>' in before
+
+
+class TestProcessorSharing:
+    """The processor parses each document once."""
+
+    def test_each_document_parsed_once(self, sample_epub, tmp_path, monkeypatch):
+        parsed = []
+        real_parse = backends.parse_html_file
+        monkeypatch.setattr(backends, 'parse_html_file',
+                            lambda path, archive=None: parsed.append(path) or real_parse(path, archive))
+
+        result = SimpleEpubProcessor(temp_dir=str(tmp_path)).process_epub(str(sample_epub))
+
+        assert result.success
+        assert result.total_sections > 0
+        assert len(parsed) == len(set(parsed)) == 3
@@ -0,0 +1,94 @@
+"""Tests for in-place EPUB processing through EpubArchive."""
+
+import os
+import zipfile
+
+import pytest
+
+from epub_sage import EpubArchive, EpubExtractor, SimpleEpubProcessor
+from epub_sage.extractors.content_extractor import extract_book_content
+
+
+class TestEpubArchive:
+    """Virtual filesystem behaviour."""
+
+    def test_member_paths_map_to_virtual_root(self, sample_epub):
+        with EpubArchive(str(sample_epub)) as archive:
+            opf = os.path.join(archive.root, 'OEBPS', 'content.opf')
+            assert archive.exists(opf)
+            assert archive.exists('OEBPS/content.opf')
+            assert not archive.exists(os.path.join(archive.root, 'missing.opf'))
+            assert archive.member_name(opf) == 'OEBPS/content.opf'
+            assert archive.read_bytes(opf).startswith(b'<?xml')
+
+    def test_paths_outside_root_are_not_members(self, sample_epub):
+        with EpubArchive(str(sample_epub)) as archive:
+            assert archive.member_name('/elsewhere/OEBPS/content.opf') is None
+
+    def test_dot_dot_prefixed_names_are_members(self, sample_epub):
+        with EpubArchive(str(sample_epub)) as archive:
+            assert archive.member_name(os.path.join(archive.root, '..foo.xhtml')) == '..foo.xhtml'
+            assert archive.member_name(os.path.join(archive.root, '..', 'x.xhtml')) is None
+
+    def test_invalid_zip_raises_value_error(self, tmp_path):
+        bogus = tmp_path / 'bogus.epub'
+        bogus.write_bytes(b'not a zip')
+        with pytest.raises(ValueError):
+            EpubArchive(str(bogus))
+
+    def test_find_content_opf_in_archive(self, sample_epub):
+        extractor = EpubExtractor(base_dir=str(sample_epub.parent / 'work'))
+        with extractor.open_archive(str(sample_epub)) as archive:
+            opf = extractor.find_content_opf(archive.root, archive)
+            assert opf == os.path.join(archive.root, 'OEBPS', 'content.opf')
+
+
+class TestZeroExtraction:
+    """process_epub reads members in place and matches directory processing."""
+
+    def test_process_epub_writes_nothing(self, sample_epub, tmp_path):
+        work = tmp_path / 'work'
+        processor = SimpleEpubProcessor(temp_dir=str(work))
+        result = processor.process_epub(str(sample_epub))
+
+        assert result.success
+        assert result.title == 'Sample Book'
+        assert list(work.iterdir()) == []
+
+    def test_archive_matches_extracted_directory(self, sample_epub, tmp_path):
+        processor = SimpleEpubProcessor(temp_dir=str(tmp_path / 'work'))
+        in_place = processor.process_epub(str(sample_epub))
+        extracted = processor.process_epub(str(sample_epub), cleanup=False)
+
+        assert extracted.success and in_place.success
+        assert in_place.total_words == extracted.total_words
+        assert in_place.total_sections == extracted.total_sections
+        assert ([c['href'] for c in in_place.chapters] ==
+                [c['href'] for c in extracted.chapters])
+        assert in_place.chapters[0]['sections'] == extracted.chapters[0]['sections']
+
+    def test_book_under_skipped_looking_folder(self, epub_factory, tmp_path):
+        (tmp_path / 'me.github.io').mkdir()
+        epub = str(epub_factory('me.github.io/book.epub'))
+        processor = SimpleEpubProcessor(temp_dir=str(tmp_path / 'work'))
+
+        result = processor.process_epub(epub)
+        assert result.total_chapters == 3
+        assert result.total_words > 0
+        assert len(list(processor.iter_chapters(epub))) == 3
+
+    def test_process_in_memory_bytes(self, sample_epub, tmp_path):
+        processor = SimpleEpubProcessor(temp_dir=str(tmp_path / 'work'))
+        with EpubArchive(sample_epub.read_bytes()) as archive:
+            result = processor.process_archive(archive)
+
+        assert result.success
+        assert result.total_chapters == 3
+        assert result.total_files == 13
+
+    def test_open_zipfile_is_left_open(self, sample_epub):
+        with zipfile.ZipFile(sample_epub) as zf:
+            with EpubArchive(zf) as archive:
+                content = extract_book_content(archive.root, archive)
+            assert 'OEBPS/text/ch1.xhtml' in content
+            assert zf.read('mimetype') == b'application/epub+zip'
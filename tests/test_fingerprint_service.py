@@ -0,0 +1,108 @@
+"""Tests for cached book fingerprints."""
+
+import hashlib
+import os
+
+import pytest
+
+from epub_sage import EpubExtractor, SimpleEpubProcessor
+from epub_sage.services import fingerprint_service
+from epub_sage.services.fingerprint_service import (
+    FingerprintService, hash_central_directory, hash_file
+)
+
+
+class TestFingerprintService:
+    """Hashing, memoisation and the SQLite sidecar."""
+
+    def test_book_id_matches_sha256_prefix(self, sample_epub, tmp_path):
+        service = FingerprintService(cache_path=str(tmp_path / 'fp.sqlite3'))
+        expected = hashlib.sha256(sample_epub.read_bytes()).hexdigest()
+        assert service.fingerprint(str(sample_epub)) == expected
+        assert service.book_id(str(sample_epub)) == expected[:16]
+
+    def test_mmap_path_matches_buffered_path(self, sample_epub, monkeypatch):
+        buffered = hash_file(str(sample_epub))
+        monkeypatch.setattr(fingerprint_service, 'MMAP_THRESHOLD', 1)
+        assert hash_file(str(sample_epub)) == buffered
+
+    def test_file_is_hashed_once(self, sample_epub, tmp_path, monkeypatch):
+        calls = []
+        real_hash = fingerprint_service.hash_file
+        monkeypatch.setattr(fingerprint_service, 'hash_file',
+                            lambda path: calls.append(path) or real_hash(path))
+
+        service = FingerprintService(cache_path=str(tmp_path / 'fp.sqlite3'))
+        first = service.book_id(str(sample_epub))
+        assert service.book_id(str(sample_epub)) == first
+        service.close()
+
+        # A new service instance is served from the sidecar file
+        reopened = FingerprintService(cache_path=str(tmp_path / 'fp.sqlite3'))
+        assert reopened.book_id(str(sample_epub)) == first
+        reopened.close()
+        assert len(calls) == 1
+
+    def test_changed_file_is_rehashed(self, epub_factory, tmp_path):
+        path = epub_factory(chapters=1)
+        service = FingerprintService(cache_path=str(tmp_path / 'fp.sqlite3'))
+        before = service.book_id(str(path))
+
+        epub_factory(chapters=2)
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert service.book_id(str(path)) != before
+
+    def test_unwritable_cache_falls_back_to_memory(self, sample_epub, tmp_path):
+        blocker = tmp_path / 'not-a-dir'
+        blocker.write_text('x')
+        service = FingerprintService(cache_path=str(blocker / 'fp.sqlite3'))
+        assert service.book_id(str(sample_epub))
+        assert service.persistent is False
+
+
+class TestExtractorIntegration:
+    """EpubExtractor reuses the shared fingerprint."""
+
+    def test_extract_epub_uses_given_book_id(self, sample_epub, tmp_path):
+        service = FingerprintService(persistent=False)
+        extractor = EpubExtractor(base_dir=str(tmp_path), fingerprints=service)
+        extracted = extractor.extract_epub(str(sample_epub), book_id='given-id')
+        assert extracted == str(tmp_path / 'given-id' / 'raw')
+        assert service._memo == {}
+
+    def test_get_epub_info_book_id(self, sample_epub, tmp_path):
+        service = FingerprintService(persistent=False)
+        extractor = EpubExtractor(base_dir=str(tmp_path), fingerprints=service)
+        info = extractor.get_epub_info(str(sample_epub))
+        assert info['book_id'] == service.book_id(str(sample_epub))
+
+
+class TestCentralDirectoryMode:
+    """Book identity from the ZIP central directory."""
+
+    def test_id_depends_on_member_table(self, epub_factory, tmp_path):
+        one = epub_factory('one.epub', chapters=1)
+        same = epub_factory('same.epub', chapters=1)
+        other = epub_factory('other.epub', chapters=2)
+        extractor = EpubExtractor(base_dir=str(tmp_path), id_mode='central-directory')
+
+        book_id = extractor.generate_book_id(str(one))
+        assert len(book_id) == 16
+        assert extractor.generate_book_id(str(same)) == book_id
+        assert extractor.generate_book_id(str(other)) != book_id
+
+    def test_processor_reports_central_directory_id(self, sample_epub, tmp_path):
+        processor = SimpleEpubProcessor(temp_dir=str(tmp_path), id_mode='central-directory')
+        result = processor.process_epub(str(sample_epub))
+        assert result.book_id == hash_central_directory(str(sample_epub))[:16]
+
+    def test_unknown_mode_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            EpubExtractor(base_dir=str(tmp_path), id_mode='bogus')
+
+    def test_invalid_zip_raises_value_error(self, tmp_path):
+        bogus = tmp_path / 'bogus.epub'
+        bogus.write_bytes(b'not a zip')
+        with pytest.raises(ValueError):
+            hash_central_directory(str(bogus))
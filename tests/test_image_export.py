@@ -0,0 +1,53 @@
+"""Tests for bulk image export."""
+
+import zipfile
+
+import pytest
+
+from epub_sage import EpubExtractor, ImageExporter
+
+
+@pytest.fixture
+def image_epub(tmp_path):
+    """Images with a name clash and a byte-identical copy."""
+    path = tmp_path / 'images.epub'
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('OEBPS/images/a.png', b'A' * 5000)
+        zf.writestr('OEBPS/other/a.png', b'B' * 5000)
+        zf.writestr('OEBPS/images/copy.png', b'A' * 5000)
+        zf.writestr('OEBPS/images/big.jpg', bytes(range(256)) * 8192)
+    return path
+
+
+MEMBERS = ['OEBPS/images/a.png', 'OEBPS/other/a.png', 'OEBPS/images/copy.png',
+           'OEBPS/images/big.jpg']
+
+
+class TestImageExporter:
+    @pytest.mark.parametrize('workers', [1, 3])
+    def test_export_all(self, image_epub, tmp_path, workers):
+        out = tmp_path / 'out'
+        with ImageExporter(str(image_epub), workers=workers) as exporter:
+            report = exporter.export_all(MEMBERS + ['missing.png'], str(out))
+
+        assert sorted(p.name for p in out.iterdir()) == ['a.png', 'a_1.png', 'big.jpg']
+        assert (out / 'a_1.png').read_bytes() == b'B' * 5000
+        assert (out / 'big.jpg').read_bytes() == bytes(range(256)) * 8192
+        assert report.duplicates == {'OEBPS/images/copy.png': str(out / 'a.png')}
+        assert report.failed == ['missing.png']
+        assert report.bytes_written == 10000 + 256 * 8192
+        assert report.to_dict()['bytes_per_second'] >= 0
+
+    def test_keeps_existing_files_and_duplicates_on_request(self, image_epub, tmp_path):
+        out = tmp_path / 'out'
+        out.mkdir()
+        (out / 'a.png').write_bytes(b'mine')
+        report = EpubExtractor(base_dir=str(tmp_path)).export_files(
+            str(image_epub), MEMBERS, str(out), dedupe=False)
+        assert (out / 'a.png').read_bytes() == b'mine'
+        assert len(report.exported) == 4 and not report.duplicates
+
+    def test_single_export(self, image_epub, tmp_path):
+        with ImageExporter(str(image_epub)) as exporter:
+            assert exporter.export('OEBPS/other/a.png', str(tmp_path / 'cover.png')) == 5000
+        assert (tmp_path / 'cover.png').read_bytes() == b'B' * 5000
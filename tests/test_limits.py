@@ -0,0 +1,113 @@
+"""Tests for resource limits."""
+
+import pickle
+import zipfile
+
+import pytest
+
+from epub_sage import (
+    EpubExtractor, ResourceLimitExceeded, ResourceLimits, SimpleEpubProcessor, process_many,
+)
+from epub_sage.extractors import html_parser, lxml_extractors
+
+
+@pytest.fixture
+def bomb_epub(epub_factory):
+    """A valid EPUB with one highly compressed 4 MB member."""
+    path = epub_factory('bomb.epub')
+    with zipfile.ZipFile(path, 'a', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('OEBPS/padding.bin', b'\0' * (4 * 1024 * 1024))
+    return path
+
+
+def limit_of(result):
+    assert not result.success
+    return result.limit_exceeded['limit']
+
+
+class TestResourceLimits:
+    def test_rejects_non_positive(self):
+        with pytest.raises(ValueError):
+            ResourceLimits(max_members=0)
+
+    def test_error_pickles(self):
+        error = ResourceLimitExceeded('max_members', 12, 10)
+        copy = pickle.loads(pickle.dumps(error))
+        assert copy.to_dict() == error.to_dict() and str(copy) == str(error)
+
+    def test_extract_checks_central_directory(self, bomb_epub, tmp_path):
+        extractor = EpubExtractor(base_dir=str(tmp_path), limits=ResourceLimits())
+        with pytest.raises(ResourceLimitExceeded) as info:
+            extractor.extract_epub(str(bomb_epub), str(tmp_path / 'out'))
+        assert info.value.member == 'OEBPS/padding.bin'
+        assert not any((tmp_path / 'out').iterdir())
+
+
+class TestElementPrePass:
+    """max_elements fails before a document tree is built."""
+
+    @pytest.fixture
+    def big_page(self, tmp_path):
+        path = tmp_path / 'big.xhtml'
+        path.write_text('<html><body>' + '<p>x</p>' * 100 + '</body></html>')
+        return str(path)
+
+    def test_soup_is_not_built(self, big_page, monkeypatch):
+        monkeypatch.setattr(html_parser, 'BeautifulSoup', None)
+        with ResourceLimits(max_elements=10).activate():
+            with pytest.raises(ResourceLimitExceeded) as error:
+                html_parser.parse_html_file(big_page)
+        assert error.value.value == 11 and error.value.member == big_page
+
+    def test_lxml_tree_is_not_built(self, big_page, monkeypatch):
+        monkeypatch.setattr(lxml_extractors.etree, 'fromstring', None)
+        with ResourceLimits(max_elements=10).activate():
+            with pytest.raises(ResourceLimitExceeded):
+                lxml_extractors.parse_html_file(big_page)
+
+    def test_within_limit(self, big_page):
+        with ResourceLimits(max_elements=102).activate():
+            assert html_parser.parse_html_file(big_page) is not None
+            assert lxml_extractors.parse_html_file(big_page) is not None
+
+
+class TestLimitedProcessing:
+    def test_default_limits_keep_output(self, sample_epub):
+        plain = SimpleEpubProcessor().process_epub(str(sample_epub))
+        limited = SimpleEpubProcessor(limits=ResourceLimits()).process_epub(str(sample_epub))
+        assert limited.model_dump() == plain.model_dump()
+
+    def test_archive_limits(self, sample_epub, bomb_epub):
+        assert limit_of(SimpleEpubProcessor(limits=ResourceLimits()).process_epub(
+            str(bomb_epub))) == 'max_compression_ratio'
+        assert limit_of(SimpleEpubProcessor(limits=ResourceLimits(max_members=2)).process_epub(
+            str(sample_epub))) == 'max_members'
+        result = SimpleEpubProcessor(
+            limits=ResourceLimits(max_uncompressed_bytes=100)).process_epub(str(sample_epub))
+        assert result.limit_exceeded['value'] > result.limit_exceeded['maximum'] == 100
+
+    @pytest.mark.parametrize('options', [
+        {}, {'backend': 'lxml'}, {'backend': 'lxml', 'stream_threshold': 1},
+        {'spill_chapters': True},
+    ])
+    def test_element_limit(self, sample_epub, options):
+        processor = SimpleEpubProcessor(limits=ResourceLimits(max_elements=5), **options)
+        result = processor.process_epub(str(sample_epub))
+        assert limit_of(result) == 'max_elements'
+        assert result.limit_exceeded['member'].endswith('.xhtml')
+
+    def test_timeout(self, sample_epub):
+        processor = SimpleEpubProcessor(limits=ResourceLimits(timeout=1e-9))
+        assert limit_of(processor.process_epub(str(sample_epub))) == 'timeout'
+
+    def test_chapter_stream(self, sample_epub):
+        processor = SimpleEpubProcessor(limits=ResourceLimits(max_elements=5))
+        stream = processor.iter_chapters(str(sample_epub))
+        assert list(stream) == []
+        assert stream.summary.limit_exceeded['limit'] == 'max_elements'
+
+    def test_batch_keeps_going(self, sample_epub, bomb_epub):
+        results = dict(process_many([str(bomb_epub), str(sample_epub)], workers=1,
+                                    limits=ResourceLimits()))
+        assert limit_of(results[str(bomb_epub)]) == 'max_compression_ratio'
+        assert results[str(sample_epub)].success
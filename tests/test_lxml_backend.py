@@ -0,0 +1,117 @@
+"""Parity tests: the lxml backend must produce the same dicts as bs4."""
+
+import pytest
+
+from epub_sage import SimpleEpubProcessor
+from epub_sage.extractors.backends import Bs4Backend, LxmlBackend, get_backend
+
+DOCUMENT = '''<?xml version="1.0" encoding="utf-8"?>
+<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops"
+      xmlns:xlink="http://www.w3.org/1999/xlink">
+<head><title>Parity</title></head>
+<body>
+<nav epub:type="toc"><a href="#s1">Skip to content</a></nav>
+<section id="ch" epub:type="chapter">
+  <h1 class="chapter-title">Chapter One</h1>
+  <p>Intro with <a data-type="indexterm" data-primary="alpha" data-secondary="beta"/>
+     a term and a <a data-type="xref" href="#s2">cross reference</a>.</p>
+  <script>var x = 1;</script>
+  <section id="s1">
+    <h2>First&#160;Section</h2>
+    <p>Text &amp; more <em>emphasis</em><!-- comment --> tail&#x2009;text.</p>
+    <pre data-code-language="python">print("hi")
+    x = 1</pre>
+    <table><caption>Caption</caption>
+      <tr><th>Head A</th><th>Head B</th></tr>
+      <tr><td>1</td><td>two <b>bold</b></td></tr>
+    </table>
+    <dl class="calloutlist"><dt>Term</dt><dd>Definition <i>here</i></dd></dl>
+    <ul><li>One</li><li>Two <b>bold</b><ol><li>Nested A</li><li>Nested B</li></ol></li></ul>
+    <div data-type="note"><h6>Note</h6><p>Remember this.</p></div>
+    <aside data-type="sidebar"><h3>Side</h3><p>Sidebar body</p></aside>
+    <blockquote data-type="epigraph"><p>Quote line</p><p data-type="attribution">Someone</p></blockquote>
+    <div data-type="equation">E = mc<sup>2</sup></div>
+    <figure><img src="../images/a.png" alt="An&#160;image"/><h6>Figure caption</h6></figure>
+    <p><img src="../images/inline.png" alt="inline"/> inline image</p>
+    <div class="image"><svg xmlns="http://www.w3.org/2000/svg"><image xlink:href="../images/b.svg"/></svg></div>
+    <p title='say "hi"' data-x="a&lt;b">Quoted attrs</p>
+    <p></p>
+  </section>
+  <section id="s2">
+    <h2>Second Section</h2>
+    <div class="wrapper"><p>Wrapped paragraph</p><p>Another <span class="label">x</span></p></div>
+    <a name="named-anchor"/>
+    <p>After named anchor</p>
+    <footer>Footer junk</footer>
+  </section>
+</section>
+</body></html>'''
+
+ANCHORS = {'ch', 's1', 's2', 'named-anchor'}
+
+
+@pytest.fixture
+def documents(tmp_path):
+    path = tmp_path / 'doc.xhtml'
+    path.write_text(DOCUMENT, encoding='utf-8')
+    bs4, lxml = Bs4Backend(), LxmlBackend()
+    return (bs4, bs4.parse_file(str(path))), (lxml, lxml.parse_file(str(path)))
+
+
+class TestBackendParity:
+    """Same input, same output."""
+
+    def test_content_sections(self, documents):
+        (bs4, soup), (lxml, root) = documents
+        assert lxml.content_sections(root) == bs4.content_sections(soup)
+
+    def test_content_sections_leave_tree_reusable(self, documents):
+        (bs4, soup), (lxml, root) = documents
+        first = bs4.content_sections(soup)
+        assert bs4.content_sections(soup) == first
+        assert lxml.content_sections(root) == first
+
+    @pytest.mark.parametrize('include_html', [False, True])
+    @pytest.mark.parametrize('start,end', [
+        ('ch', 's1'), ('s1', 's2'), ('s2', None), (None, 'ch'),
+        ('named-anchor', None), ('missing', None),
+    ])
+    def test_section_blocks(self, documents, start, end, include_html):
+        (bs4, soup), (lxml, root) = documents
+        expected = bs4.section_blocks(soup, start, end, ANCHORS, include_html)
+        assert lxml.section_blocks(root, start, end, ANCHORS, include_html) == expected
+
+    def test_section_blocks_without_anchor_set(self, documents):
+        (bs4, soup), (lxml, root) = documents
+        for start in ('s1', 's2'):
+            assert (lxml.section_blocks(root, start, None, None, True)
+                    == bs4.section_blocks(soup, start, None, None, True))
+
+    def test_anchor_terms(self, documents):
+        (bs4, soup), (lxml, root) = documents
+        keywords, references = lxml.anchor_terms(root, 'ch')
+        assert (keywords, references) == bs4.anchor_terms(soup, 'ch')
+        assert keywords == [{'primary': 'alpha', 'secondary': 'beta'}]
+        assert references == [{'text': 'cross reference', 'href': '#s2'}]
+
+    def test_missing_file(self, tmp_path):
+        assert LxmlBackend().parse_file(str(tmp_path / 'missing.xhtml')) is None
+
+
+class TestProcessorBackend:
+    """Backend selection on the processor."""
+
+    @pytest.mark.parametrize('include_html', [False, True])
+    def test_process_epub_matches_bs4(self, epub_factory, tmp_path, include_html):
+        epub = epub_factory(chapters=2, sections=3)
+        results = [
+            SimpleEpubProcessor(temp_dir=str(tmp_path), backend=name).process_epub(
+                str(epub), include_html=include_html).model_dump()
+            for name in ('bs4', 'lxml')
+        ]
+        assert results[0]['total_sections'] > 0
+        assert results[0] == results[1]
+
+    def test_unknown_backend_rejected(self):
+        with pytest.raises(ValueError):
+            get_backend('html5lib')
@@ -0,0 +1,55 @@
+"""Tests for selective extraction."""
+
+import os
+
+from epub_sage import EpubExtractor, SimpleEpubProcessor
+
+PACKAGE = {'mimetype', 'META-INF/container.xml', 'OEBPS/content.opf', 'OEBPS/toc.ncx'}
+
+
+def _files(root):
+    return {os.path.relpath(os.path.join(dirpath, name), root).replace(os.sep, '/')
+            for dirpath, _, names in os.walk(root) for name in names}
+
+
+class TestExtractFilters:
+    def test_spine(self, sample_epub, tmp_path):
+        out = EpubExtractor(base_dir=str(tmp_path)).extract_epub(
+            str(sample_epub), str(tmp_path / 'out'), spine=True)
+        assert _files(out) == PACKAGE | {f'OEBPS/text/ch{n}.xhtml' for n in (1, 2, 3)}
+
+    def test_media_type_glob(self, sample_epub, tmp_path):
+        out = EpubExtractor(base_dir=str(tmp_path)).extract_epub(
+            str(sample_epub), str(tmp_path / 'out'), media_types=['image/*'])
+        assert _files(out) - PACKAGE == {f'OEBPS/images/fig{n}_{s}.png'
+                                         for n in (1, 2, 3) for s in (1, 2)}
+
+    def test_name_patterns(self, sample_epub, tmp_path):
+        out = EpubExtractor(base_dir=str(tmp_path)).extract_epub(
+            str(sample_epub), str(tmp_path / 'out'), patterns=['*/CH1.XHTML'])
+        assert _files(out) == PACKAGE | {'OEBPS/text/ch1.xhtml'}
+
+    def test_no_filter_extracts_everything(self, sample_epub, tmp_path):
+        out = EpubExtractor(base_dir=str(tmp_path)).extract_epub(
+            str(sample_epub), str(tmp_path / 'out'))
+        assert len(_files(out)) == 13
+
+
+class TestSelectiveProcessing:
+    def test_structure_only_skips_images(self, sample_epub, tmp_path):
+        stages = {'metadata', 'structure'}
+        full = SimpleEpubProcessor(temp_dir=str(tmp_path / 'full'), stages=stages
+                                   ).process_epub(str(sample_epub), cleanup=False)
+        processor = SimpleEpubProcessor(temp_dir=str(tmp_path / 'partial'), stages=stages,
+                                        selective_extraction=True)
+        result = processor.process_epub(str(sample_epub), cleanup=False)
+        assert not any(name.endswith('.png') for name in _files(result.extracted_dir))
+        paths = {'extracted_dir', 'content_opf_path'}
+        assert result.model_dump(exclude=paths) == full.model_dump(exclude=paths)
+
+    def test_all_stages_same_result(self, sample_epub, tmp_path):
+        expected = SimpleEpubProcessor().process_epub(str(sample_epub))
+        result = SimpleEpubProcessor(temp_dir=str(tmp_path), selective_extraction=True
+                                     ).process_epub(str(sample_epub), cleanup=False)
+        paths = {'extracted_dir', 'content_opf_path'}
+        assert result.model_dump(exclude=paths) == expected.model_dump(exclude=paths)
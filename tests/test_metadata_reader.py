@@ -0,0 +1,45 @@
+"""Tests for the metadata-only fast path."""
+
+import os
+
+from epub_sage import DublinCoreService, SimpleEpubProcessor, read_content_opf, read_metadata
+from epub_sage.extractors.container import parse_container
+
+
+def _container(*rootfiles: str) -> bytes:
+    return ('<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">'
+            f'<rootfiles>{"".join(rootfiles)}</rootfiles></container>').encode()
+
+
+class TestParseContainer:
+    def test_opf_rootfiles_in_order(self):
+        data = _container(
+            '<rootfile full-path="a/book.opf" media-type="application/oebps-package+xml"/>',
+            '<rootfile full-path="b.pdf" media-type="application/pdf"/>',
+            '<rootfile full-path="/c/alt.opf"/>')
+        assert parse_container(data) == ['a/book.opf', 'c/alt.opf']
+
+    def test_malformed(self):
+        assert parse_container(b'<container') == []
+
+
+class TestReadMetadata:
+    def test_matches_service(self, sample_epub):
+        expected = DublinCoreService().parse_content_opf(str(sample_epub)).metadata
+        assert read_metadata(str(sample_epub)) == expected
+
+    def test_nothing_written_to_disk(self, sample_epub, tmp_path, monkeypatch):
+        workdir = tmp_path / 'work'
+        workdir.mkdir()
+        monkeypatch.chdir(workdir)
+        read_metadata(str(sample_epub))
+        DublinCoreService().extract_basic_metadata(str(sample_epub))
+        assert os.listdir(workdir) == []
+
+    def test_bytes_input(self, sample_epub):
+        parsed = read_content_opf(sample_epub.read_bytes())
+        assert parsed.metadata.title and parsed.file_path.endswith('OEBPS/content.opf')
+
+    def test_quick_info(self, sample_epub):
+        info = SimpleEpubProcessor().quick_info(str(sample_epub))
+        assert info['title'] == read_metadata(str(sample_epub)).title
@@ -0,0 +1,91 @@
+"""Tests for process-pool extraction."""
+
+import io
+import zipfile
+from concurrent.futures import Future
+
+import pytest
+
+from epub_sage import SimpleEpubProcessor
+from epub_sage.extractors import parallel
+from epub_sage.extractors.epub_archive import EpubArchive
+from epub_sage.extractors.parallel import ExtractionPool, can_parallelize, process_context
+
+
+def _dump(result):
+    data = result.model_dump()
+    data.pop('processing_time', None)
+    return data
+
+
+class TestProcessorWorkers:
+    """workers=N gives the same result as a serial run."""
+
+    @pytest.mark.parametrize('backend', ['bs4', 'lxml'])
+    def test_archive_matches_serial(self, epub_factory, tmp_path, backend):
+        epub = str(epub_factory(chapters=4, sections=3))
+        serial = SimpleEpubProcessor(temp_dir=str(tmp_path), backend=backend).process_epub(epub)
+        pooled = SimpleEpubProcessor(temp_dir=str(tmp_path), backend=backend,
+                                     workers=2).process_epub(epub)
+        assert pooled.success
+        assert _dump(pooled) == _dump(serial)
+
+    def test_directory_matches_serial(self, epub_factory, tmp_path):
+        epub = epub_factory(chapters=3, sections=2)
+        target = tmp_path / 'book'
+        with zipfile.ZipFile(epub) as zf:
+            zf.extractall(target)
+        serial = SimpleEpubProcessor().process_directory(str(target), book_id='b')
+        pooled = SimpleEpubProcessor(workers=2).process_directory(str(target), book_id='b')
+        assert _dump(pooled) == _dump(serial)
+
+    def test_in_memory_archive_stays_serial(self, epub_factory, monkeypatch):
+        data = epub_factory().read_bytes()
+        archive = EpubArchive(io.BytesIO(data))
+        assert not can_parallelize(archive)
+        monkeypatch.setattr(parallel, 'ProcessPoolExecutor', None)
+        result = SimpleEpubProcessor(workers=4).process_archive(archive)
+        assert result.success and result.chapters
+
+
+class _InlineExecutor:
+    """Runs jobs immediately, recording submission order."""
+
+    def __init__(self, max_workers, mp_context=None):
+        self.submitted = []
+
+    def submit(self, job, *args):
+        self.submitted.append(args[-1])
+        future = Future()
+        future.set_result(job(*args))
+        return future
+
+    def shutdown(self, cancel_futures=False):
+        pass
+
+
+class TestExtractionPool:
+    """Scheduling and ordering."""
+
+    def test_largest_first_results_in_order(self, tmp_path, monkeypatch):
+        sizes = {'small.xhtml': 10, 'large.xhtml': 300, 'medium.xhtml': 100}
+        for name, size in sizes.items():
+            (tmp_path / name).write_text(
+                f'<html><body><h1>{name}</h1><p>{"x" * size}</p></body></html>')
+        monkeypatch.setattr(parallel, 'ProcessPoolExecutor', _InlineExecutor)
+        paths = [str(tmp_path / name) for name in sizes]
+
+        with ExtractionPool(2, str(tmp_path)) as pool:
+            results = pool.content_sections(paths)
+            submitted = pool._executor.submitted
+
+        assert [s[0]['header'] for s in results] == list(sizes)
+        assert submitted == [str(tmp_path / n) for n in ('large.xhtml', 'medium.xhtml', 'small.xhtml')]
+
+    def test_workers_are_not_forked(self):
+        assert process_context().get_start_method() in ('forkserver', 'spawn')
+
+    def test_rejects_in_memory_archive(self, epub_factory):
+        archive = EpubArchive(io.BytesIO(epub_factory().read_bytes()))
+        with pytest.raises(ValueError):
+            ExtractionPool(2, archive.root, archive)
@@ -0,0 +1,104 @@
+"""Tests for opt-in profiling (profile=True)."""
+
+import os
+import zipfile
+
+import pytest
+
+from epub_sage import SimpleEpubProcessor
+from epub_sage.utils.profiling import Profiler, active_profiler, count
+
+
+def _member_bytes(epub):
+    with zipfile.ZipFile(epub) as zf:
+        return {info.filename: info.file_size for info in zf.infolist()}
+
+
+class TestProfiler:
+    def test_helpers_are_no_ops_without_profiler(self):
+        assert active_profiler() is None
+        count('documents_parsed')
+
+    def test_stage_accumulates(self):
+        profiler = Profiler()
+        with profiler.activate():
+            for _ in range(2):
+                with profiler.stage('metadata'):
+                    count('bytes_read', 10)
+        timings = profiler.to_dict()
+        assert timings['stages']['metadata']['bytes_read'] == 20
+        assert active_profiler() is None
+
+
+class TestProcessorProfiling:
+    def test_off_by_default(self, sample_epub):
+        result = SimpleEpubProcessor().process_epub(str(sample_epub))
+        assert result.timings is None
+
+    def test_output_is_unchanged(self, sample_epub):
+        plain = SimpleEpubProcessor().process_epub(str(sample_epub))
+        profiled = SimpleEpubProcessor(profile=True).process_epub(str(sample_epub))
+        assert profiled.chapters == plain.chapters
+
+    @pytest.mark.parametrize('backend', ['bs4', 'lxml'])
+    def test_stages_and_counters(self, epub_factory, backend):
+        epub = str(epub_factory(chapters=3))
+        result = SimpleEpubProcessor(profile=True, backend=backend).process_epub(epub)
+        timings = result.timings
+
+        assert set(timings['stages']) == {
+            'open', 'metadata', 'content', 'structure', 'chapters', 'sections', 'finalize'}
+        assert {'document_parse', 'toc_parse', 'image_resolution'} <= set(timings['operations'])
+        counters = timings['counters']
+        assert counters['documents_parsed'] >= 3
+        assert counters['elements_visited'] > counters['documents_parsed']
+        assert counters['blocks_emitted'] > 0
+        assert timings['total']['wall_seconds'] >= sum(
+            stage['wall_seconds'] for stage in timings['stages'].values()) * 0.99
+
+    def test_bytes_read_match_archive_members(self, epub_factory):
+        epub = str(epub_factory(chapters=2))
+        sizes = _member_bytes(epub)
+        timings = SimpleEpubProcessor(profile=True).process_epub(epub).timings
+
+        counters = timings['counters']
+        assert counters['files_read'] > 0
+        assert counters['bytes_read'] <= counters['files_read'] * max(sizes.values())
+        assert timings['stages']['metadata']['bytes_read'] == sizes['OEBPS/content.opf']
+        assert sum(stage['bytes_read'] for stage in timings['stages'].values()) \
+            == counters['bytes_read']
+
+    def test_worker_counters_are_included(self, epub_factory):
+        epub = str(epub_factory(chapters=3))
+        serial = SimpleEpubProcessor(profile=True).process_epub(epub).timings
+        pooled = SimpleEpubProcessor(profile=True, workers=2).process_epub(epub).timings
+
+        for name in ('documents_parsed', 'elements_visited', 'files_read', 'bytes_read'):
+            # Workers parse each document for every job they run on it
+            assert pooled['counters'][name] >= serial['counters'][name] > 0
+        assert sum(stage['bytes_read'] for stage in pooled['stages'].values()) \
+            == pooled['counters']['bytes_read']
+
+    def test_extracted_directory(self, sample_epub):
+        processor = SimpleEpubProcessor(profile=True)
+        result = processor.process_epub(str(sample_epub), cleanup=False)
+        try:
+            assert 'extract' in result.timings['stages']
+            assert result.timings['counters']['bytes_read'] > 0
+        finally:
+            processor.extractor.cleanup_extraction(result.extracted_dir)
+        assert not os.path.exists(result.extracted_dir)
+
+    def test_iter_chapters_summary(self, epub_factory):
+        stream = SimpleEpubProcessor(profile=True).iter_chapters(str(epub_factory(chapters=3)))
+        chapters = list(stream)
+
+        assert len(chapters) == 3
+        timings = stream.summary.timings
+        assert timings['counters']['documents_parsed'] >= 3
+        assert 'sections' in timings['stages']
+
+    def test_selection(self, epub_factory):
+        result = SimpleEpubProcessor(profile=True).process_epub(
+            str(epub_factory(chapters=3)), spine_range=(0, 1))
+        assert result.timings['stages']['content']['files_read'] >= 1
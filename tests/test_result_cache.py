@@ -0,0 +1,105 @@
+"""Tests for the persistent result cache."""
+
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import epub_sage
+from epub_sage import ResultCache, SimpleEpubProcessor
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResultCache(str(tmp_path / 'results.sqlite3'))
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def runs(monkeypatch):
+    """Number of times books were actually processed."""
+    calls = []
+    real = SimpleEpubProcessor.process_archive
+
+    def counting(self, *args, **kwargs):
+        calls.append(1)
+        return real(self, *args, **kwargs)
+
+    monkeypatch.setattr(SimpleEpubProcessor, 'process_archive', counting)
+    return calls
+
+
+def _store_in_worker(cache_path, epub):
+    cache = ResultCache(cache_path)
+    return SimpleEpubProcessor(result_cache=cache).process_epub(epub).title
+
+
+class TestResultCache:
+    def test_hit_skips_processing(self, sample_epub, cache, runs):
+        processor = SimpleEpubProcessor(result_cache=cache)
+        first = processor.process_epub(str(sample_epub))
+        second = processor.process_epub(str(sample_epub))
+
+        assert len(runs) == 1
+        assert second.model_dump() == first.model_dump()
+        assert second.model_dump() == SimpleEpubProcessor().process_epub(
+            str(sample_epub)).model_dump()
+
+    def test_copy_hits_with_its_own_paths(self, sample_epub, cache, runs, tmp_path):
+        copy = tmp_path / 'copy.epub'
+        shutil.copy(sample_epub, copy)
+        processor = SimpleEpubProcessor(result_cache=cache)
+        processor.process_epub(str(sample_epub))
+        result = processor.process_epub(str(copy))
+
+        assert len(runs) == 1
+        assert result.model_dump() == SimpleEpubProcessor().process_epub(str(copy)).model_dump()
+
+    def test_options_and_version_change_the_key(self, sample_epub, cache, runs, monkeypatch):
+        SimpleEpubProcessor(result_cache=cache).process_epub(str(sample_epub))
+        SimpleEpubProcessor(result_cache=cache, stages={'metadata'}).process_epub(str(sample_epub))
+        SimpleEpubProcessor(result_cache=cache).process_epub(str(sample_epub), include_html=True)
+        monkeypatch.setattr(epub_sage, '__version__', '99.0.0')
+        SimpleEpubProcessor(result_cache=cache).process_epub(str(sample_epub))
+        assert len(runs) == 4
+
+    def test_failures_and_profiled_runs_are_not_cached(self, sample_epub, cache, runs, tmp_path):
+        broken = tmp_path / 'broken.epub'
+        broken.write_bytes(b'not a zip')
+        processor = SimpleEpubProcessor(result_cache=cache)
+        assert not processor.process_epub(str(broken)).success
+        assert cache.size() == 0
+
+        profiled = SimpleEpubProcessor(result_cache=cache, profile=True)
+        assert profiled.process_epub(str(sample_epub)).timings is not None
+        assert cache.size() == 0
+
+    def test_lru_eviction(self, epub_factory, tmp_path):
+        books = [str(epub_factory(f'book{n}.epub', chapters=n + 1)) for n in range(3)]
+        cache = ResultCache(str(tmp_path / 'small.sqlite3'))
+        processor = SimpleEpubProcessor(result_cache=cache)
+        keys = [cache.key_for(book, processor._cache_options(False, None, None))
+                for book in books]
+
+        processor.process_epub(books[0])
+        processor.process_epub(books[1])
+        cache.max_bytes = cache.size() + 1
+        assert cache.get(keys[0]) is not None  # book0 is now more recent than book1
+        processor.process_epub(books[2])
+
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[2]) is not None
+        assert cache.size() <= cache.max_bytes
+
+    def test_shared_between_processes(self, epub_factory, tmp_path, runs):
+        books = [str(epub_factory(f'book{n}.epub', chapters=2)) for n in range(4)]
+        cache_path = str(tmp_path / 'shared.sqlite3')
+        with ProcessPoolExecutor(2) as pool:
+            titles = list(pool.map(_store_in_worker, [cache_path] * 4, books))
+
+        cache = ResultCache(cache_path)
+        processor = SimpleEpubProcessor(result_cache=cache)
+        assert [processor.process_epub(book).title for book in books] == titles
+        assert runs == []
+        cache.close()
@@ -0,0 +1,110 @@
+"""Tests for the warm processing server."""
+
+import http.client
+import json
+import socket
+
+import pytest
+
+from epub_sage.processors.server import EpubServer
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path):
+        super().__init__('localhost')
+        self.unix_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.unix_path)
+
+
+def request(connection, job, body=None, **headers):
+    headers = {'Content-Type': 'application/json', **headers}
+    connection.request('POST', '/' + job, json.dumps(body or {}), headers)
+    response = connection.getresponse()
+    return response, json.loads(response.read())
+
+
+def test_unix_socket(tmp_path, sample_epub):
+    path = str(tmp_path / 'epub-sage.sock')
+    with EpubServer(socket_path=path, workers=1):
+        connection = UnixHTTPConnection(path)
+        response, info = request(connection, 'info', {'path': str(sample_epub)})
+        connection.close()
+    assert response.status == 200 and info['title']
+
+
+@pytest.fixture(scope='module')
+def server():
+    with EpubServer(port=0, workers=1) as running:
+        yield running
+
+
+@pytest.fixture
+def client(server):
+    connection = http.client.HTTPConnection('127.0.0.1', server.port, timeout=60)
+    yield connection
+    connection.close()
+
+
+class TestEpubServer:
+    def test_info_and_process(self, client, sample_epub):
+        response, info = request(client, 'info', {'path': str(sample_epub)})
+        assert response.status == 200
+        assert response.getheader('Transfer-Encoding') == 'chunked'
+        assert info['words'] > 0 and info['chapters'] > 0
+
+        _, result = request(client, 'process', {'path': str(sample_epub)})
+        assert result['success'] and result['total_words'] == info['words']
+
+    def test_toc_and_search(self, client, sample_epub):
+        _, toc = request(client, 'toc', {'path': str(sample_epub)})
+        assert toc['has_navigation']
+
+        response, found = request(client, 'search',
+                                  {'path': str(sample_epub), 'query': 'chapter', 'limit': 1})
+        assert response.status == 200 and len(found['results']) <= 1
+
+    def test_errors(self, client, tmp_path):
+        response, body = request(client, 'unknown', {'path': 'x'})
+        assert response.status == 404 and 'error' in body
+        response, _ = request(client, 'info', {'path': str(tmp_path / 'missing.epub')})
+        assert response.status == 404
+        response, _ = request(client, 'search', {'path': str(tmp_path)})
+        assert response.status == 400
+
+    def test_rejects_requests_a_web_page_can_send(self, server, sample_epub):
+        def status(method, path, body=None, **headers):
+            connection = http.client.HTTPConnection('127.0.0.1', server.port, timeout=60)
+            connection.request(method, path, body, headers)
+            response = connection.getresponse()
+            response.read()
+            connection.close()
+            return response.status
+
+        json_body = json.dumps({'path': str(sample_epub)})
+        assert status('GET', f'/info?path={sample_epub}') == 405
+        assert status('POST', '/info', json_body, **{'Content-Type': 'text/plain'}) == 415
+        assert status('POST', '/info', json_body, **{'Content-Type': 'application/json',
+                                                     'Host': f'evil.example:{server.port}'}) == 403
+        assert status('POST', '/info', json_body, **{'Content-Type': 'application/json',
+                                                     'Origin': 'http://evil.example'}) == 403
+        assert status('GET', '/health') == 200
+
+    def test_rejection_closes_connection(self, client, sample_epub):
+        response, _ = request(client, 'info', {'path': str(sample_epub)},
+                              **{'Content-Type': 'text/plain'})
+        assert response.status == 415 and response.getheader('Connection') == 'close'
+
+    def test_coalesces_identical_jobs(self, server, sample_epub):
+        params = {'path': str(sample_epub)}
+        first = server.submit('info', params)
+        second = server.submit('info', params)
+        assert first is second
+        assert first.result()['title']
+        assert server.health()['coalesced'] >= 1
+
+    def test_rejects_public_host(self):
+        with pytest.raises(ValueError):
+            EpubServer(host='0.0.0.0')
@@ -0,0 +1,59 @@
+"""Tests for stage-selective processing."""
+
+import pytest
+
+from epub_sage import SimpleEpubProcessor
+from epub_sage.extractors.epub_archive import EpubArchive
+from epub_sage.processors.stages import ALL_STAGES, resolve_stages
+
+
+@pytest.fixture
+def opened(monkeypatch):
+    """Names of archive members opened during the test."""
+    names = []
+    real_open = EpubArchive.open
+
+    def recording(self, path):
+        names.append(path.rsplit('/', 1)[-1])
+        return real_open(self, path)
+
+    monkeypatch.setattr(EpubArchive, 'open', recording)
+    return names
+
+
+class TestResolveStages:
+    def test_default_is_all(self):
+        assert resolve_stages() == frozenset(ALL_STAGES)
+
+    def test_unknown_stage(self):
+        with pytest.raises(ValueError, match='Unknown stages: toc'):
+            SimpleEpubProcessor(stages={'metadata', 'toc'})
+
+    def test_missing_requirement(self):
+        with pytest.raises(ValueError, match="'sections' requires structure"):
+            resolve_stages({'metadata', 'content', 'sections'})
+
+
+class TestStageSelection:
+    def test_metadata_only_reads_opf(self, epub_factory, opened):
+        result = SimpleEpubProcessor(stages={'metadata'}).process_epub(str(epub_factory()))
+        assert result.success and result.title == 'Sample Book'
+        assert result.chapters == []
+        assert opened == ['content.opf']
+
+    def test_flat_text(self, epub_factory, opened):
+        epub = str(epub_factory(chapters=3))
+        full = SimpleEpubProcessor().process_epub(epub)
+        opened.clear()
+        flat = SimpleEpubProcessor(stages={'metadata', 'content'}).process_epub(epub)
+
+        assert 'toc.ncx' not in opened
+        assert flat.total_words == full.total_words
+        assert flat.total_sections == 0
+        assert all(c['sections'] == [] and c['content'] for c in flat.chapters)
+        assert [c['href'] for c in flat.chapters] == [c['href'] for c in full.chapters]
+
+    def test_all_stages_match_default(self, epub_factory):
+        epub = str(epub_factory())
+        assert (SimpleEpubProcessor(stages=ALL_STAGES).process_epub(epub).chapters
+                == SimpleEpubProcessor().process_epub(epub).chapters)
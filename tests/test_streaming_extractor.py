@@ -0,0 +1,136 @@
+"""Tests for the streaming (iterparse) extractor."""
+
+import pytest
+
+from epub_sage import SimpleEpubProcessor
+from epub_sage.extractors import lxml_extractors, streaming_extractor
+from epub_sage.extractors.streaming_extractor import (
+    stream_content_sections,
+    stream_section_between_anchors,
+    stream_sections_by_anchors,
+)
+
+from .test_lxml_backend import ANCHORS, DOCUMENT
+
+FLAT_DOCUMENT = '''<?xml version="1.0" encoding="utf-8"?>
+<html xmlns="http://www.w3.org/1999/xhtml"><head><title>Flat</title></head>
+<body><nav><a href="#x">Skip</a></nav><div class="book">
+<h1>One</h1><p>First <em>para</em>.</p><aside>Junk</aside>
+<div class="text">Text-only div</div><div><span>Inline</span> div</div>
+<header><h2>Kept header</h2></header><p><img src="i.png"/></p>
+<h2 class="title">Two</h2><table><tr><td>1</td></tr></table>
+</div></body></html>'''
+
+NAME_BEFORE_ID_DOCUMENT = '''<?xml version="1.0" encoding="utf-8"?>
+<html xmlns="http://www.w3.org/1999/xhtml"><head><title>Anchors</title></head>
+<body><p><a name="target"/>Named</p><p>Between</p>
+<h2 id="target">Target</h2><p>After</p></body></html>'''
+
+
+def _write(tmp_path, text, name='doc.xhtml'):
+    path = tmp_path / name
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def _big_document(paragraphs):
+    parts = ['<?xml version="1.0"?><html xmlns="http://www.w3.org/1999/xhtml">'
+             '<head><title>Big</title></head><body><div>']
+    for i in range(paragraphs):
+        if i % 50 == 0:
+            parts.append(f'<h2 id="s{i}">Section {i}</h2>')
+        parts.append(f'<p>Paragraph {i} with <em>some</em> text.</p>\n')
+    parts.append('</div></body></html>')
+    return ''.join(parts)
+
+
+class TestStreamContentSections:
+    """Header-grouped sections from a stream."""
+
+    def test_matches_tree_extractor_on_flat_layout(self, tmp_path):
+        path = _write(tmp_path, FLAT_DOCUMENT)
+        expected = lxml_extractors.extract_content_sections(lxml_extractors.parse_html_file(path))
+        assert list(stream_content_sections(path)) == expected
+        assert [s['header'] for s in expected] == ['One', 'Two']
+
+    def test_matches_tree_extractor_on_nested_layout(self, tmp_path):
+        path = _write(tmp_path, DOCUMENT)
+        expected = lxml_extractors.extract_content_sections(lxml_extractors.parse_html_file(path))
+        assert list(stream_content_sections(path)) == expected
+
+    def test_missing_file(self, tmp_path):
+        assert list(stream_content_sections(str(tmp_path / 'missing.xhtml'))) == []
+
+    def test_processed_elements_are_freed(self, tmp_path):
+        path = _write(tmp_path, _big_document(2000))
+        retained = [sum(1 for _ in unit.itersiblings(preceding=True))
+                    for unit in streaming_extractor._stream_units(path)]
+        assert len(retained) == 2040
+        assert max(retained) == 0
+
+
+class TestStreamSectionsByAnchors:
+    """TOC boundaries from a single streaming pass."""
+
+    BOUNDARIES = [('ch', 's1'), ('s1', 's2'), ('s2', None), (None, 'ch'),
+                  ('named-anchor', None), ('missing', None)]
+
+    @pytest.mark.parametrize('include_html', [False, True])
+    def test_matches_tree_extractor(self, tmp_path, include_html):
+        path = _write(tmp_path, DOCUMENT)
+        root = lxml_extractors.parse_html_file(path)
+        results = stream_sections_by_anchors(path, self.BOUNDARIES, ANCHORS, include_html)
+
+        for (start, end), (blocks, keywords, references) in zip(self.BOUNDARIES, results):
+            assert blocks == lxml_extractors.extract_section_between_anchors(
+                root, start, end, ANCHORS, include_html)
+            expected_terms = lxml_extractors.collect_anchor_terms(root, start) if start else ([], [])
+            assert (keywords, references) == expected_terms
+
+    def test_id_anchor_wins_over_earlier_name(self, tmp_path):
+        path = _write(tmp_path, NAME_BEFORE_ID_DOCUMENT)
+        root = lxml_extractors.parse_html_file(path)
+        boundaries = [('target', None), (None, 'target')]
+        results = stream_sections_by_anchors(path, boundaries, {'target'})
+
+        for (start, end), (blocks, _, _) in zip(boundaries, results):
+            assert blocks == lxml_extractors.extract_section_between_anchors(
+                root, start, end, {'target'})
+        assert [b['text'] for b in results[0][0]] == ['Target', 'After']
+
+    def test_single_boundary(self, tmp_path):
+        path = _write(tmp_path, DOCUMENT)
+        blocks = stream_section_between_anchors(path, 's2', None, ANCHORS)
+        assert [b['text'] for b in blocks][:2] == ['Second Section', 'Wrapped paragraph Another x']
+
+    def test_missing_file(self, tmp_path):
+        assert stream_sections_by_anchors(str(tmp_path / 'missing.xhtml'), [('a', None)]) is None
+
+    def test_stops_after_last_boundary(self, tmp_path, monkeypatch):
+        path = _write(tmp_path, _big_document(2000))
+        seen = []
+        real_iterparse = streaming_extractor.iterparse_document
+
+        def counting(*args):
+            for event in real_iterparse(*args):
+                seen.append(event)
+                yield event
+
+        monkeypatch.setattr(streaming_extractor, 'iterparse_document', counting)
+        blocks = stream_section_between_anchors(path, 's0', 's50', {'s0', 's50'})
+        assert len(blocks) == 51
+        assert len(seen) < 400
+
+
+class TestProcessorStreaming:
+    """stream_threshold on the processor."""
+
+    @pytest.mark.parametrize('layout', [{'chapters': 4}, {'chapters': 2, 'sections': 3},
+                                        {'chapters': 1, 'sections': 0}])
+    def test_result_matches_tree_extraction(self, epub_factory, tmp_path, layout):
+        epub = str(epub_factory(**layout))
+        tree = SimpleEpubProcessor(temp_dir=str(tmp_path), backend='lxml').process_epub(epub)
+        streamed = SimpleEpubProcessor(temp_dir=str(tmp_path), backend='lxml',
+                                       stream_threshold=0).process_epub(epub)
+        assert streamed.success
+        assert streamed.model_dump() == tree.model_dump()
@@ -0,0 +1,58 @@
+"""Tests for threaded ZIP extraction."""
+
+import os
+import zipfile
+
+from epub_sage import EpubExtractor, SimpleEpubProcessor
+
+
+def _listing(root):
+    files = {}
+    for dirpath, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(dirpath, name)
+            with open(path, 'rb') as f:
+                files[os.path.relpath(path, root)] = f.read()
+    return files
+
+
+class TestThreadedExtraction:
+    def test_same_files_as_extractall(self, epub_factory, tmp_path):
+        epub = str(epub_factory(chapters=4, sections=3, image_size=20000))
+        extractor = EpubExtractor(base_dir=str(tmp_path))
+        serial = extractor.extract_epub(epub, str(tmp_path / 'serial'))
+        threaded = extractor.extract_epub(epub, str(tmp_path / 'threaded'), workers=3)
+        assert _listing(threaded) == _listing(serial)
+
+    def test_with_member_filter(self, sample_epub, tmp_path):
+        out = EpubExtractor(base_dir=str(tmp_path)).extract_epub(
+            str(sample_epub), str(tmp_path / 'out'), spine=True, workers=2)
+        assert not any(name.endswith('.png') for name in _listing(out))
+
+    def test_filter_matching_nothing(self, tmp_path):
+        epub = tmp_path / 'bare.epub'
+        with zipfile.ZipFile(epub, 'w') as zf:
+            zf.writestr('OEBPS/a.png', b'x')
+            zf.writestr('OEBPS/b.png', b'y')
+        extractor = EpubExtractor(base_dir=str(tmp_path))
+        for workers in (1, 2):
+            out = extractor.extract_epub(str(epub), str(tmp_path / f'out{workers}'),
+                                         patterns=['*.none'], workers=workers)
+            assert _listing(out) == {}
+
+    def test_unsafe_names_stay_inside_target(self, tmp_path):
+        epub = tmp_path / 'evil.epub'
+        with zipfile.ZipFile(epub, 'w') as zf:
+            zf.writestr('../escape.txt', 'x')
+            zf.writestr('/abs/inside.txt', 'y')
+        out = EpubExtractor(base_dir=str(tmp_path)).extract_epub(
+            str(epub), str(tmp_path / 'out'), workers=2)
+        assert set(_listing(out)) == {'escape.txt', os.path.join('abs', 'inside.txt')}
+        assert not (tmp_path / 'escape.txt').exists()
+
+    def test_processor_workers_extract_in_threads(self, sample_epub, tmp_path):
+        expected = SimpleEpubProcessor(temp_dir=str(tmp_path / 'a')).process_epub(
+            str(sample_epub), cleanup=False)
+        result = SimpleEpubProcessor(temp_dir=str(tmp_path / 'b'), workers=2).process_epub(
+            str(sample_epub), cleanup=False)
+        assert _listing(result.extracted_dir) == _listing(expected.extracted_dir)